@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import BloodPressureMeasurement, AliceUser, AccountLinkToken
+from .models import (
+    BloodPressureMeasurement,
+    AliceUser,
+    AccountLinkToken,
+    APIToken,
+    DailyMeasurementRollup,
+    MeasurementArchive,
+    MeasurementChange,
+    UserShard,
+)
 
 
 @admin.register(BloodPressureMeasurement)
@@ -9,6 +18,28 @@ class BloodPressureMeasurementAdmin(admin.ModelAdmin):
     search_fields = ("user__alice_user_id", "systolic", "diastolic")
 
 
+@admin.register(DailyMeasurementRollup)
+class DailyMeasurementRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "day", "count", "systolic_min", "systolic_max")
+    list_filter = ("day",)
+    search_fields = ("user__alice_user_id",)
+
+
+@admin.register(MeasurementChange)
+class MeasurementChangeAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "measurement_id", "action", "changed_at")
+    list_filter = ("action",)
+    search_fields = ("user__alice_user_id",)
+
+
+@admin.register(MeasurementArchive)
+class MeasurementArchiveAdmin(admin.ModelAdmin):
+    list_display = ("user", "month", "count", "archived_at")
+    list_filter = ("month",)
+    search_fields = ("user__alice_user_id",)
+    exclude = ("data",)
+
+
 @admin.register(AliceUser)
 class AliceUserAdmin(admin.ModelAdmin):
     list_display = ("alice_user_id", "telegram_user_id_hash", "timezone", "created_at")
@@ -21,3 +52,21 @@ class AccountLinkTokenAdmin(admin.ModelAdmin):
     list_display = ("telegram_user_id_hash", "used", "created_at", "expires_at")
     list_filter = ("used",)
     search_fields = ("telegram_user_id_hash",)
+
+
+@admin.register(UserShard)
+class UserShardAdmin(admin.ModelAdmin):
+    list_display = ("alice_user_id", "shard", "updated_at")
+    list_filter = ("shard",)
+    search_fields = ("alice_user_id", "telegram_user_id_hash")
+
+
+@admin.register(APIToken)
+class APITokenAdmin(admin.ModelAdmin):
+    list_display = ("prefix", "user", "name", "scopes", "created_at", "expires_at")
+    search_fields = ("prefix", "name", "user__username")
+    readonly_fields = ("prefix", "token_hash", "created_at")
+
+    def has_add_permission(self, request):
+        # The plaintext is shown only once, by the create_api_token command
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AliceSkillConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "alice_skill"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,385 @@
+import heapq
+import logging
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterator
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate, groupby, islice
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from .cache import bump_data_version_on_commit, get_scopes_for_alice_user
+from .db_router import mark_recent_write
+from .helpers import from_micros, to_micros
+from .models import AliceUser, BloodPressureMeasurement, MeasurementArchive
+from .sharding import db_for_user
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_VERSION = 1
+# Format version and row count, followed by the columns below
+ARCHIVE_HEADER = struct.Struct('<BI')
+# Ids and times are sorted by time and stored as deltas, which compress well
+ARCHIVE_COLUMNS = (
+    ('id', 'q'),
+    ('measured_at', 'q'),
+    ('systolic', 'H'),
+    ('diastolic', 'H'),
+    ('pulse', 'H'),
+)
+RECORD_FIELDS = ('id', 'user_id', 'systolic', 'diastolic', 'pulse', 'measured_at')
+DELETE_CHUNK_SIZE = 500
+# Archive rows fetched at a time while merging, about a year of one user's months
+ARCHIVE_CHUNK_SIZE = 12
+
+_archiving: ContextVar[bool] = ContextVar('archiving', default=False)
+
+
+def is_archiving() -> bool:
+    """
+    Tells delete signal receivers that the measurements are being moved into
+    the archive rather than deleted, so they stay part of the user's history.
+    """
+    return _archiving.get()
+
+
+def pack_measurements(rows: list[dict]) -> bytes:
+    """
+    Packs measurement rows, sorted by `measured_at`, into an archive blob.
+    Pulse is stored as 0 when missing.
+    """
+    encoded = {
+        'id': [row['id'] for row in rows],
+        'measured_at': [to_micros(row['measured_at']) for row in rows],
+        'systolic': [row['systolic'] for row in rows],
+        'diastolic': [row['diastolic'] for row in rows],
+        'pulse': [row['pulse'] or 0 for row in rows],
+    }
+    chunks = [ARCHIVE_HEADER.pack(ARCHIVE_FORMAT_VERSION, len(rows))]
+    for name, typecode in ARCHIVE_COLUMNS:
+        values = encoded[name]
+        if typecode == 'q':
+            values = [b - a for a, b in zip([0, *values], values)]
+        column = array(typecode, values)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        chunks.append(column.tobytes())
+    return zlib.compress(b''.join(chunks), 9)
+
+
+def unpack_measurements(data: bytes, user_id: int) -> list[dict]:
+    """
+    Unpacks an archive blob into measurement records, oldest first.
+    """
+    raw = zlib.decompress(data)
+    version, count = ARCHIVE_HEADER.unpack_from(raw)
+    if version != ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f'Unsupported measurement archive format {version}')
+
+    offset = ARCHIVE_HEADER.size
+    columns = {}
+    for name, typecode in ARCHIVE_COLUMNS:
+        column = array(typecode)
+        size = count * column.itemsize
+        column.frombytes(raw[offset : offset + size])
+        offset += size
+        if sys.byteorder == 'big':
+            column.byteswap()
+        columns[name] = list(accumulate(column)) if typecode == 'q' else column
+
+    return [
+        {
+            'id': columns['id'][i],
+            'user_id': user_id,
+            'systolic': columns['systolic'][i],
+            'diastolic': columns['diastolic'][i],
+            'pulse': columns['pulse'][i] or None,
+            'measured_at': from_micros(columns['measured_at'][i]),
+        }
+        for i in range(count)
+    ]
+
+
+def month_start(value: datetime) -> date:
+    return value.astimezone(dt_timezone.utc).date().replace(day=1)
+
+
+def archive_cutoff(older_than_days: int, now: datetime | None = None) -> datetime:
+    """
+    Returns the start of the UTC month holding the moment `older_than_days`
+    ago. Only whole months before it are archived.
+    """
+    moment = (now or timezone.now()) - timedelta(days=older_than_days)
+    return datetime.combine(month_start(moment), datetime.min.time(), tzinfo=dt_timezone.utc)
+
+
+def archive_user_measurements(alice_user, before: datetime) -> int:
+    """
+    Moves one user's measurements taken before `before` into per-month
+    archives, merging them into months archived earlier.
+    Returns the number of measurements moved.
+
+    The rows are deleted with the regular delete signals, which skip the
+    per-row work while `is_archiving()`; the data version, read-your-writes
+    window and hot cache entry are then updated once for the user.
+    """
+    # Imported here since the hot cache reads the archive
+    from .hot_cache import get_hot_cache
+
+    using = db_for_user(alice_user)
+    measurements = BloodPressureMeasurement.objects.using(using).filter(
+        user=alice_user, measured_at__lt=before
+    )
+    with transaction.atomic(using=using):
+        rows = list(
+            measurements.order_by('measured_at', 'id').values(
+                'id', 'systolic', 'diastolic', 'pulse', 'measured_at'
+            )
+        )
+        if not rows:
+            return 0
+
+        for month, month_rows in groupby(rows, key=lambda row: month_start(row['measured_at'])):
+            month_rows = list(month_rows)
+            archive = (
+                MeasurementArchive.objects.using(using)
+                .select_for_update()
+                .filter(user=alice_user, month=month)
+                .first()
+            )
+            if archive is None:
+                archive = MeasurementArchive(user=alice_user, month=month)
+            else:
+                month_rows = sorted(
+                    unpack_measurements(archive.data, alice_user.pk) + month_rows,
+                    key=lambda row: (row['measured_at'], row['id']),
+                )
+            archive.count = len(month_rows)
+            archive.first_measured_at = month_rows[0]['measured_at']
+            archive.last_measured_at = month_rows[-1]['measured_at']
+            archive.data = pack_measurements(month_rows)
+            archive.save()
+
+        ids = [row['id'] for row in rows]
+        token = _archiving.set(True)
+        try:
+            for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+                measurements.filter(pk__in=ids[start : start + DELETE_CHUNK_SIZE]).delete()
+        finally:
+            _archiving.reset(token)
+
+        archived_until = rows[-1]['measured_at']
+        if alice_user.archived_until and alice_user.archived_until > archived_until:
+            archived_until = alice_user.archived_until
+        AliceUser.objects.using(using).filter(pk=alice_user.pk).update(
+            archived_until=archived_until
+        )
+        alice_user.archived_until = archived_until
+
+        scopes = get_scopes_for_alice_user(alice_user)
+        bump_data_version_on_commit(*scopes, using=using)
+        mark_recent_write(*scopes)
+        hot_cache = get_hot_cache()
+        if hot_cache is not None:
+            transaction.on_commit(lambda: hot_cache.invalidate(alice_user.pk), using=using)
+
+    logger.info(
+        'Archived %d measurements for user %s before %s',
+        len(rows),
+        alice_user.alice_user_id,
+        before.strftime('%Y-%m-%d'),
+    )
+    return len(rows)
+
+
+def archived_measurements(archives, start: datetime | None = None, end: datetime | None = None) -> list[dict]:
+    """
+    Returns archived measurement records in `[start, end)`, oldest first.
+    """
+    return list(ArchivedRange(archives, start, end).records(['measured_at']))
+
+
+def latest_archived_measurement(alice_user) -> BloodPressureMeasurement | None:
+    """
+    Returns the newest archived reading as an unsaved measurement.
+    """
+    if alice_user.archived_until is None:
+        return None
+    data = (
+        MeasurementArchive.objects.filter(user=alice_user)
+        .order_by('-month')
+        .values_list('data', flat=True)
+        .first()
+    )
+    if data is None:
+        return None
+    record = unpack_measurements(bytes(data), alice_user.pk)[-1]
+    return BloodPressureMeasurement(**record)
+
+
+def find_archived_measurements(
+    ids_by_user: dict[int, set[int]], using: str | None = None
+) -> dict[int, dict]:
+    """
+    Looks up archived records by id for the given users.
+    """
+    found = {}
+    archives = MeasurementArchive.objects.using(using).filter(user_id__in=ids_by_user)
+    for user_id, data in archives.values_list('user_id', 'data'):
+        wanted = ids_by_user[user_id]
+        for record in unpack_measurements(bytes(data), user_id):
+            if record['id'] in wanted:
+                found[record['id']] = record
+    return found
+
+
+def ordering_key(ordering: list[str]):
+    """
+    Builds a sort key matching `ordering_expressions`, with NULLs sorting as
+    the smallest value.
+    """
+
+    def key(record):
+        parts = []
+        for field in ordering:
+            name = field.lstrip('-')
+            value = record[name]
+            if isinstance(value, datetime):
+                value = to_micros(value)
+            if field.startswith('-'):
+                parts.append((value is None, -(value or 0)))
+            else:
+                parts.append((value is not None, value or 0))
+        parts.append(record['id'])
+        return parts
+
+    return key
+
+
+def ordering_expressions(ordering: list[str]) -> list:
+    return [
+        F(field[1:]).desc(nulls_last=True)
+        if field.startswith('-')
+        else F(field).asc(nulls_first=True)
+        for field in ordering
+    ] + ['id']
+
+
+class ArchivedRange:
+    """
+    The archived measurements of `archives` in `[start, end)`.
+
+    They are counted from the archive rows, unpacking only the months the
+    range cuts, and read a month at a time: in an ordering led by
+    `measured_at` a month is unpacked once the reader gets to its bounds, so
+    a page near either end of a listing does not touch the rest.
+    """
+
+    def __init__(self, archives, start: datetime | None = None, end: datetime | None = None):
+        if start is not None:
+            archives = archives.filter(last_measured_at__gte=start)
+        if end is not None:
+            archives = archives.filter(first_measured_at__lt=end)
+        self.archives = archives
+        self.start = start
+        self.end = end
+        self._count = None
+
+    def unpack(self, user_id: int, data) -> list[dict]:
+        return [
+            record
+            for record in unpack_measurements(bytes(data), user_id)
+            if (self.start is None or record['measured_at'] >= self.start)
+            and (self.end is None or record['measured_at'] < self.end)
+        ]
+
+    def count(self) -> int:
+        if self._count is None:
+            # Months wholly inside the range count as stored
+            inside = Q()
+            if self.start is not None:
+                inside &= Q(first_measured_at__gte=self.start)
+            if self.end is not None:
+                inside &= Q(last_measured_at__lt=self.end)
+            count = self.archives.filter(inside).aggregate(total=Sum('count'))['total'] or 0
+            if inside:
+                for user_id, data in self.archives.exclude(inside).values_list('user_id', 'data'):
+                    count += len(self.unpack(user_id, data))
+            self._count = count
+        return self._count
+
+    def records(self, ordering: list[str]) -> Iterator[dict]:
+        """
+        Yields the records in `ordering`. Other orderings than by
+        `measured_at` unpack and sort the whole range up front.
+        """
+        key = ordering_key(ordering)
+        if ordering[0] not in ('measured_at', '-measured_at'):
+            records = [
+                record
+                for user_id, data in self.archives.values_list('user_id', 'data')
+                for record in self.unpack(user_id, data)
+            ]
+            yield from sorted(records, key=key)
+            return
+
+        descending = ordering[0].startswith('-')
+        archives = self.archives.order_by(
+            *(('-last_measured_at', '-id') if descending else ('first_measured_at', 'id'))
+        ).values_list('user_id', 'first_measured_at', 'last_measured_at', 'data')
+        # Months of different users overlap, so records wait in a heap until
+        # no month still to be unpacked can hold anything before them
+        pending = []
+        for user_id, first, last, data in archives.iterator(chunk_size=ARCHIVE_CHUNK_SIZE):
+            while pending and (
+                pending[0][1]['measured_at'] > last
+                if descending
+                else pending[0][1]['measured_at'] < first
+            ):
+                yield heapq.heappop(pending)[1]
+            for record in self.unpack(user_id, data):
+                heapq.heappush(pending, (key(record), record))
+        while pending:
+            yield heapq.heappop(pending)[1]
+
+
+class ArchiveMergedRows:
+    """
+    Paginator-friendly sequence of the measurement queryset merged with
+    archived records, both in `ordering`. A slice reads only the rows up to
+    its end from each source and yields `values_list` style tuples.
+    """
+
+    def __init__(self, queryset, archived: ArchivedRange, ordering: list[str], value_fields):
+        self.queryset = queryset.order_by(*ordering_expressions(ordering))
+        self.ordering = ordering
+        self.key = ordering_key(ordering)
+        self.archived = archived
+        self.value_fields = value_fields
+        self._count = None
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self.queryset.count() + self.archived.count()
+        return self._count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[0 : self.count()])
+
+    def __getitem__(self, item: slice) -> list[tuple]:
+        start, stop = item.start or 0, item.stop
+        hot = self.queryset.values(*RECORD_FIELDS)[:stop]
+        archived = islice(self.archived.records(self.ordering), stop)
+        merged = heapq.merge(hot, archived, key=self.key)
+        return [
+            tuple(record[field] for field in self.value_fields)
+            for record in islice(merged, start, stop)
+        ]
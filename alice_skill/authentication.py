@@ -0,0 +1,94 @@
+import hashlib
+import hmac
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .messages import APITokenMessages
+from .models import APIToken
+
+API_TOKEN_KEY_PREFIX = 'bp:api_token'
+TOKEN_PREFIX_LENGTH = 8
+
+
+def hash_api_token(token: str) -> str:
+    # Tokens are long and random, so a fast hash is enough (unlike passwords)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def api_token_cache_key(token_hash: str) -> str:
+    return f'{API_TOKEN_KEY_PREFIX}:{token_hash}'
+
+
+def create_api_token(
+    user, name: str = '', scopes: str = '', expires_at=None
+) -> tuple[APIToken, str]:
+    """
+    Creates a token for `user` and returns it with the plaintext, which is
+    not stored and cannot be shown again.
+    """
+    plaintext = secrets.token_urlsafe(32)
+    token = APIToken.objects.create(
+        user=user,
+        name=name,
+        prefix=plaintext[:TOKEN_PREFIX_LENGTH],
+        token_hash=hash_api_token(plaintext),
+        scopes=scopes,
+        expires_at=expires_at,
+    )
+    return token, plaintext
+
+
+def forget_api_tokens(token_hashes) -> None:
+    cache.delete_many([api_token_cache_key(token_hash) for token_hash in token_hashes])
+
+
+class APITokenAuthentication(BaseAuthentication):
+    """
+    Authenticates `Authorization: Bearer <token>` against hashed APITokens:
+    one indexed lookup, then the token and its user are cached for
+    API_TOKEN_CACHE_SECONDS. Deleting a token or changing its user clears
+    the cached entry. Sets `request.auth` to the APIToken, whose scopes
+    `HasTokenScope` checks.
+    """
+
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(APITokenMessages.INVALID_HEADER)
+        try:
+            plaintext = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(APITokenMessages.INVALID_HEADER)
+        if hmac.compare_digest(auth[1], settings.API_TOKEN.encode()):
+            # The bot's shared token, checked by the IsBot permission
+            return None
+        return self.authenticate_credentials(plaintext)
+
+    def authenticate_credentials(self, plaintext: str):
+        token_hash = hash_api_token(plaintext)
+        key = api_token_cache_key(token_hash)
+        token = cache.get(key)
+        if token is None:
+            token = (
+                APIToken.objects.select_related('user').filter(token_hash=token_hash).first()
+            )
+            # Unknown tokens are cached too, so guessing does not hit the database
+            cache.set(key, token or False, getattr(settings, 'API_TOKEN_CACHE_SECONDS', 60))
+        if not token:
+            raise exceptions.AuthenticationFailed(APITokenMessages.INVALID_TOKEN)
+        if token.is_expired:
+            raise exceptions.AuthenticationFailed(APITokenMessages.EXPIRED_TOKEN)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(APITokenMessages.INACTIVE_USER)
+        return token.user, token
+
+    def authenticate_header(self, request):
+        return self.keyword
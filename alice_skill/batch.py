@@ -0,0 +1,154 @@
+import json
+import logging
+import re
+from io import BytesIO
+from urllib.parse import urlencode, urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+
+from .messages import BatchMessages
+from .models import APIToken
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_OPERATIONS = 20
+BATCH_PATH_PREFIX = '/api/v1/'
+BATCH_PATH = '/api/v1/batch/'
+REFERENCE_RE = re.compile(r'\$\{([A-Za-z0-9_\-]+(?:\.[A-Za-z0-9_\-]+)*)\}')
+
+
+class UnresolvedReference(Exception):
+    pass
+
+
+def _lookup(results: dict, reference: str):
+    """
+    Walks a dotted reference such as `user.alice_user_id` or
+    `measurements.results.0.systolic` through earlier results.
+    """
+    name, *keys = reference.split('.')
+    if name not in results or results[name]['status'] >= 400:
+        raise UnresolvedReference(reference)
+    value = results[name]['body']
+    for key in keys:
+        try:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise UnresolvedReference(reference) from None
+    return value
+
+
+def resolve_references(value, results: dict):
+    """
+    Substitutes `${name.path}` references to earlier results in strings,
+    lists and dicts. A string holding only a reference takes the referenced
+    value with its type; references inside longer strings are interpolated.
+    """
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    if not isinstance(value, str) or '${' not in value:
+        return value
+    whole = REFERENCE_RE.fullmatch(value)
+    if whole:
+        return _lookup(results, whole.group(1))
+    return REFERENCE_RE.sub(lambda m: str(_lookup(results, m.group(1))), value)
+
+
+def _build_subrequest(request, method: str, path: str, query: str, body) -> WSGIRequest:
+    """
+    Builds a Django request for one operation, inheriting the batch request's
+    headers, authenticated user and session.
+
+    Requests made with an API token authenticate again from the inherited
+    `Authorization` header instead, so every operation is checked against
+    the token's scopes for its own method.
+    """
+    django_request = request._request
+    payload = b'' if body is None else json.dumps(body).encode('utf-8')
+    inherited = {
+        key: value
+        for key, value in django_request.META.items()
+        if key not in ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MATCH', 'HTTP_ACCEPT')
+    }
+    environ = {
+        **inherited,
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': BytesIO(payload),
+    }
+    subrequest = WSGIRequest(environ)
+    if not isinstance(request.auth, APIToken):
+        for attribute in ('user', 'session'):
+            if hasattr(django_request, attribute):
+                setattr(subrequest, attribute, getattr(django_request, attribute))
+    # CSRF was already checked for the batch request itself
+    subrequest._dont_enforce_csrf_checks = True
+    return subrequest
+
+
+def _response_body(response):
+    if hasattr(response, 'data'):
+        return None if isinstance(response.data, bytes) else response.data
+    content_type = response.get('Content-Type', '')
+    if content_type.startswith('application/json') and response.content:
+        return json.loads(response.content)
+    return None
+
+
+def run_operation(request, operation: dict, results: dict) -> dict:
+    """
+    Runs one batch operation against the matching API view in-process.
+    """
+    try:
+        path = resolve_references(operation['path'], results)
+        params = resolve_references(operation.get('params') or {}, results)
+        body = resolve_references(operation.get('body'), results)
+    except UnresolvedReference as e:
+        return {
+            'status': 424,
+            'body': {'detail': BatchMessages.UNRESOLVED_REFERENCE.format(reference=e)},
+        }
+
+    split = urlsplit(path)
+    query = '&'.join(filter(None, (split.query, urlencode(params, doseq=True))))
+    if not split.path.startswith(BATCH_PATH_PREFIX) or split.path == BATCH_PATH:
+        return {
+            'status': 400,
+            'body': {'detail': BatchMessages.PATH_NOT_ALLOWED.format(path=split.path)},
+        }
+    try:
+        match = resolve(split.path)
+    except Resolver404:
+        return {'status': 404, 'body': {'detail': BatchMessages.NOT_FOUND.format(path=split.path)}}
+
+    subrequest = _build_subrequest(request, operation['method'], split.path, query, body)
+    response = match.func(subrequest, *match.args, **match.kwargs)
+    return {'status': response.status_code, 'body': _response_body(response)}
+
+
+def run_batch(request, operations: list[dict]) -> list[dict]:
+    """
+    Runs operations in order. Each result is stored under the operation `id`
+    (or its index), so later operations can reference it.
+    """
+    results = {}
+    output = []
+    for index, operation in enumerate(operations):
+        name = operation.get('id') or str(index)
+        result = run_operation(request, operation, results)
+        logger.debug(
+            'Batch operation %s: %s %s -> %s',
+            name,
+            operation['method'],
+            operation['path'],
+            result['status'],
+        )
+        results[name] = result
+        output.append({'id': name, **result})
+    return output
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY_PREFIX = 'bp:data_version'
+RESPONSE_KEY_PREFIX = 'bp:response'
+GLOBAL_SCOPE = 'all'
+
+
+def get_measurement_cache():
+    """
+    Returns the cache used for data versions and cached measurement responses.
+    """
+    return caches[getattr(settings, 'MEASUREMENT_CACHE_ALIAS', 'default')]
+
+
+def alice_scope(alice_user_id: str) -> str:
+    return f'alice:{alice_user_id}'
+
+
+def django_user_scope(user_pk) -> str:
+    return f'django:{user_pk}'
+
+
+def telegram_scope(telegram_user_id_hash: str) -> str:
+    return f'telegram:{telegram_user_id_hash}'
+
+
+def alice_user_scope(alice_user) -> str:
+    """
+    Scope of a single AliceUser's measurements. Unlike the Alice and Django
+    scopes it exists for every AliceUser and does not change when accounts
+    are linked, so per-user caches key their data version on it.
+    """
+    return f'alice_user:{alice_user.pk}'
+
+
+def get_scopes_for_alice_user(alice_user) -> list[str]:
+    """
+    Returns every cache scope whose data includes the given AliceUser's measurements.
+    """
+    scopes = [GLOBAL_SCOPE, alice_user_scope(alice_user)]
+    if alice_user.alice_user_id:
+        scopes.append(alice_scope(alice_user.alice_user_id))
+    if alice_user.user_id:
+        scopes.append(django_user_scope(alice_user.user_id))
+    return scopes
+
+
+def get_request_cache_scope(request) -> str | None:
+    """
+    Maps a REST request to the data scope it reads, mirroring
+    `BloodPressureMeasurementQuerySet.for_user`.
+    Returns None when the request reads nothing cacheable.
+    """
+    user = request.user
+    user_id = request.query_params.get('user_id')
+
+    if getattr(request, 'is_bot', False):
+        return alice_scope(user_id) if user_id else None
+
+    if user.is_superuser:
+        return alice_scope(user_id) if user_id else GLOBAL_SCOPE
+
+    if user.is_authenticated:
+        return django_user_scope(user.pk)
+
+    return None
+
+
+def get_data_version(scope: str) -> str:
+    """
+    Returns the current data version for a scope, initializing it if missing.
+    Versions are random tokens, so a flushed cache never revives an old ETag.
+    """
+    cache = get_measurement_cache()
+    key = f'{DATA_VERSION_KEY_PREFIX}:{scope}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, secrets.token_hex(8), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(*scopes: str) -> dict[str, str]:
+    """
+    Invalidates ETags and cached responses for the given scopes.
+    Returns the new version of each scope.
+    """
+    versions = {scope: secrets.token_hex(8) for scope in scopes}
+    get_measurement_cache().set_many(
+        {f'{DATA_VERSION_KEY_PREFIX}:{scope}': version for scope, version in versions.items()},
+        timeout=None,
+    )
+    logger.debug('Bumped data version for scopes %s', scopes)
+    return versions
+
+
+def bump_data_version_on_commit(*scopes: str, using: str | None = None) -> None:
+    """
+    Bumps the data versions once the current transaction commits, or right
+    away in autocommit mode. Bumping earlier would let a concurrent read
+    cache the pre-commit rows under the new version.
+    """
+    transaction.on_commit(lambda: bump_data_version(*scopes), using=using)
+
+
+def build_etag(scope: str, version: str, *parts: str) -> str:
+    """
+    Builds a strong ETag from the data scope, its version and request details.
+    """
+    raw = ':'.join((scope, version, *parts))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def get_cached_response_data(etag: str):
+    return get_measurement_cache().get(f'{RESPONSE_KEY_PREFIX}:{etag}')
+
+
+def set_cached_response_data(etag: str, data) -> None:
+    timeout = getattr(settings, 'MEASUREMENT_CACHE_TIMEOUT', 300)
+    get_measurement_cache().set(f'{RESPONSE_KEY_PREFIX}:{etag}', data, timeout)
@@ -0,0 +1,114 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from .archive import find_archived_measurements
+from .models import BloodPressureMeasurement, MeasurementChange
+
+logger = logging.getLogger(__name__)
+
+
+def record_change(
+    user_id: int, measurement_id: int, action: str, using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """
+    Appends a change feed entry, replacing the previous entry for the same
+    user and measurement so the feed stays proportional to changed rows.
+    `using` is the database holding the measurement.
+    """
+    changes = MeasurementChange.objects.using(using)
+    with transaction.atomic(using=using):
+        changes.filter(
+            user_id=user_id, measurement_id=measurement_id
+        ).delete()
+        changes.create(
+            user_id=user_id, measurement_id=measurement_id, action=action
+        )
+
+
+def change_feed_settle_seconds() -> float:
+    """
+    How old an entry must be before the feed serves it.
+
+    Ids are assigned on insert but become visible on commit, so with
+    concurrent writers (PostgreSQL) a higher id can commit first. A client
+    whose cursor moved past it would never see the lower one. Holding entries
+    back until every transaction that started before them has finished keeps
+    the cursor safe, as long as write transactions are shorter than the
+    window. SQLite commits one writer at a time, so it needs no window.
+    """
+    return getattr(settings, 'CHANGE_FEED_SETTLE_SECONDS', 0)
+
+
+def build_change_feed(changes, since: int, limit: int, serializer) -> dict:
+    """
+    Returns the changes after the `since` cursor, oldest first.
+
+    Created and updated entries carry the current measurement as rendered by
+    `serializer` (a `MeasurementRowSerializer`); deleted entries are tombstones.
+    `cursor` is the sequence to pass as `since` next time. Entries younger
+    than `change_feed_settle_seconds()` are left for a later call.
+    """
+    settle_seconds = change_feed_settle_seconds()
+    if settle_seconds:
+        changes = changes.filter(
+            changed_at__lte=timezone.now() - timedelta(seconds=settle_seconds)
+        )
+    entries = list(
+        changes.filter(id__gt=since)
+        .order_by('id')
+        .values_list('id', 'user_id', 'measurement_id', 'action')[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    live_ids = [
+        measurement_id
+        for _, _, measurement_id, action in entries
+        if action != MeasurementChange.DELETED
+    ]
+    rows = {
+        pk: (user_id, row)
+        for pk, user_id, *row in BloodPressureMeasurement.objects.using(changes.db).filter(
+            pk__in=live_ids
+        ).values_list('pk', 'user_id', *serializer.value_fields)
+    }
+    missing = defaultdict(set)
+    for _, user_id, measurement_id, action in entries:
+        if action != MeasurementChange.DELETED and measurement_id not in rows:
+            missing[user_id].add(measurement_id)
+    if missing:
+        # Moved to the archive rather than deleted
+        for pk, record in find_archived_measurements(missing, using=changes.db).items():
+            rows[pk] = (
+                record['user_id'],
+                tuple(record[field] for field in serializer.value_fields),
+            )
+
+    feed = []
+    for seq, user_id, measurement_id, action in entries:
+        owner, row = rows.get(measurement_id, (None, None))
+        if action != MeasurementChange.DELETED and owner != user_id:
+            # Removed or moved after this entry was read
+            action = MeasurementChange.DELETED
+        feed.append(
+            {
+                'seq': seq,
+                'action': action,
+                'id': measurement_id,
+                'measurement': (
+                    None
+                    if action == MeasurementChange.DELETED
+                    else serializer.to_representation(row)
+                ),
+            }
+        )
+    return {
+        'cursor': entries[-1][0] if entries else since,
+        'has_more': has_more,
+        'changes': feed,
+    }
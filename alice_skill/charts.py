@@ -0,0 +1,243 @@
+import math
+import struct
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+CHART_WIDTH = 640
+CHART_HEIGHT = 320
+CHART_POINTS = 160
+MARGIN_LEFT = 36
+MARGIN_RIGHT = 12
+MARGIN_TOP = 12
+MARGIN_BOTTOM = 24
+GRID_STEP = 20
+X_TICKS = 4
+
+BACKGROUND = (255, 255, 255)
+GRID_COLOR = (225, 225, 225)
+LABEL_COLOR = (110, 110, 110)
+# Chart rows are (systolic, diastolic, pulse, measured_at) tuples
+SERIES = (
+    ('systolic', 0, (214, 39, 40)),
+    ('diastolic', 1, (31, 119, 180)),
+    ('pulse', 2, (44, 160, 44)),
+)
+CHART_ROW_FIELDS = ('systolic', 'diastolic', 'pulse', 'measured_at')
+
+# 3x5 bitmap glyphs for axis labels, one string of bits per row
+GLYPHS = {
+    '0': ('111', '101', '101', '101', '111'),
+    '1': ('010', '110', '010', '010', '111'),
+    '2': ('111', '001', '111', '100', '111'),
+    '3': ('111', '001', '111', '001', '111'),
+    '4': ('101', '101', '111', '001', '001'),
+    '5': ('111', '100', '111', '001', '111'),
+    '6': ('111', '100', '111', '101', '111'),
+    '7': ('111', '001', '010', '010', '010'),
+    '8': ('111', '101', '111', '101', '111'),
+    '9': ('111', '101', '111', '001', '111'),
+    '.': ('000', '000', '000', '000', '010'),
+}
+
+
+@dataclass(frozen=True)
+class ChartFrame:
+    """
+    Maps timestamps and pressure values onto chart pixel coordinates.
+    """
+
+    x_min: float
+    x_max: float
+    y_min: int
+    y_max: int
+    width: int = CHART_WIDTH
+    height: int = CHART_HEIGHT
+
+    def x(self, timestamp: float) -> float:
+        span = self.width - MARGIN_LEFT - MARGIN_RIGHT
+        if self.x_max == self.x_min:
+            return MARGIN_LEFT + span / 2
+        return MARGIN_LEFT + (timestamp - self.x_min) / (self.x_max - self.x_min) * span
+
+    def y(self, value: float) -> float:
+        span = self.height - MARGIN_TOP - MARGIN_BOTTOM
+        return MARGIN_TOP + (self.y_max - value) / (self.y_max - self.y_min) * span
+
+    def y_ticks(self) -> range:
+        return range(self.y_min, self.y_max + 1, GRID_STEP)
+
+    def x_ticks(self) -> list[float]:
+        if self.x_max == self.x_min:
+            return [self.x_min]
+        step = (self.x_max - self.x_min) / (X_TICKS - 1)
+        return [self.x_min + i * step for i in range(X_TICKS)]
+
+
+def build_frame(rows: Sequence[tuple]) -> ChartFrame:
+    """
+    Fits the value axis to the data, rounded out to whole grid steps.
+    """
+    if not rows:
+        return ChartFrame(0, 0, 60, 160)
+    values = [row[i] for _, i, _ in SERIES for row in rows if row[i] is not None]
+    timestamps = [row[3].timestamp() for row in rows]
+    y_min = math.floor(min(values) / GRID_STEP) * GRID_STEP
+    y_max = math.ceil(max(values) / GRID_STEP) * GRID_STEP
+    if y_max == y_min:
+        y_max += GRID_STEP
+    return ChartFrame(min(timestamps), max(timestamps), y_min, y_max)
+
+
+def _date_label(timestamp: float, tz) -> str:
+    return datetime.fromtimestamp(timestamp, tz).strftime('%d.%m')
+
+
+def _hex(color: tuple[int, int, int]) -> str:
+    return '#{:02x}{:02x}{:02x}'.format(*color)
+
+
+def render_svg(rows: Sequence[tuple], tz) -> bytes:
+    """
+    Renders systolic, diastolic and pulse trend lines as an SVG document.
+    """
+    frame = build_frame(rows)
+    right = frame.width - MARGIN_RIGHT
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{frame.width}" '
+        f'height="{frame.height}" viewBox="0 0 {frame.width} {frame.height}" '
+        f'font-family="sans-serif" font-size="10">',
+        f'<rect width="100%" height="100%" fill="{_hex(BACKGROUND)}"/>',
+    ]
+    for value in frame.y_ticks():
+        y = frame.y(value)
+        parts.append(
+            f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{right}" y2="{y:.1f}" '
+            f'stroke="{_hex(GRID_COLOR)}"/>'
+        )
+        parts.append(
+            f'<text x="{MARGIN_LEFT - 4}" y="{y + 3:.1f}" text-anchor="end" '
+            f'fill="{_hex(LABEL_COLOR)}">{value}</text>'
+        )
+    if rows:
+        for timestamp in frame.x_ticks():
+            parts.append(
+                f'<text x="{frame.x(timestamp):.1f}" y="{frame.height - 8}" '
+                f'text-anchor="middle" fill="{_hex(LABEL_COLOR)}">'
+                f'{escape(_date_label(timestamp, tz))}</text>'
+            )
+    for name, index, color in SERIES:
+        points = ' '.join(
+            f'{frame.x(row[3].timestamp()):.1f},{frame.y(row[index]):.1f}'
+            for row in rows
+            if row[index] is not None
+        )
+        if points:
+            parts.append(
+                f'<polyline class="{name}" points="{points}" fill="none" '
+                f'stroke="{_hex(color)}" stroke-width="2" stroke-linejoin="round"/>'
+            )
+    parts.append('</svg>')
+    return ''.join(parts).encode('utf-8')
+
+
+class _Canvas:
+    """
+    Minimal RGB raster with line and bitmap-text drawing, encoded as PNG.
+    """
+
+    def __init__(self, width: int, height: int, background: tuple[int, int, int]):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(background) * (width * height))
+
+    def plot(self, x: int, y: int, color: tuple[int, int, int]) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            offset = (y * self.width + x) * 3
+            self.pixels[offset : offset + 3] = bytes(color)
+
+    def line(self, x0, y0, x1, y1, color, thickness: int = 1) -> None:
+        x0, y0, x1, y1 = round(x0), round(y0), round(x1), round(y1)
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        error = dx + dy
+        while True:
+            for ox in range(thickness):
+                for oy in range(thickness):
+                    self.plot(x0 + ox, y0 + oy, color)
+            if x0 == x1 and y0 == y1:
+                return
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x0 += sx
+            if doubled <= dx:
+                error += dx
+                y0 += sy
+
+    def text(self, x: int, y: int, value: str, color, scale: int = 2) -> None:
+        for char in value:
+            for row, bits in enumerate(GLYPHS.get(char, ())):
+                for column, bit in enumerate(bits):
+                    if bit == '1':
+                        for ox in range(scale):
+                            for oy in range(scale):
+                                self.plot(x + column * scale + ox, y + row * scale + oy, color)
+            x += 4 * scale
+
+    @staticmethod
+    def text_width(value: str, scale: int = 2) -> int:
+        return len(value) * 4 * scale - scale
+
+    def to_png(self) -> bytes:
+        stride = self.width * 3
+        raw = b''.join(
+            b'\x00' + self.pixels[y * stride : (y + 1) * stride] for y in range(self.height)
+        )
+        header = struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)
+        return b''.join(
+            (
+                b'\x89PNG\r\n\x1a\n',
+                _png_chunk(b'IHDR', header),
+                _png_chunk(b'IDAT', zlib.compress(raw, 6)),
+                _png_chunk(b'IEND', b''),
+            )
+        )
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def render_png(rows: Sequence[tuple], tz) -> bytes:
+    """
+    Renders the same chart as `render_svg` as a PNG, which Telegram accepts as a photo.
+    """
+    frame = build_frame(rows)
+    canvas = _Canvas(frame.width, frame.height, BACKGROUND)
+    right = frame.width - MARGIN_RIGHT
+    for value in frame.y_ticks():
+        y = round(frame.y(value))
+        canvas.line(MARGIN_LEFT, y, right, y, GRID_COLOR)
+        label = str(value)
+        canvas.text(MARGIN_LEFT - 4 - canvas.text_width(label), y - 5, label, LABEL_COLOR)
+    if rows:
+        for timestamp in frame.x_ticks():
+            label = _date_label(timestamp, tz)
+            x = round(frame.x(timestamp)) - canvas.text_width(label) // 2
+            x = min(max(x, 0), frame.width - canvas.text_width(label))
+            canvas.text(x, frame.height - MARGIN_BOTTOM + 8, label, LABEL_COLOR)
+    for _, index, color in SERIES:
+        points = [
+            (frame.x(row[3].timestamp()), frame.y(row[index]))
+            for row in rows
+            if row[index] is not None
+        ]
+        if len(points) == 1:
+            canvas.line(*points[0], *points[0], color, thickness=3)
+        for start, end in zip(points, points[1:]):
+            canvas.line(*start, *end, color, thickness=2)
+    return canvas.to_png()
@@ -0,0 +1,147 @@
+import functools
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Opens older than this no longer count towards the open rate
+OPEN_RATE_WINDOW_SECONDS = 60
+
+
+class ConnectionMetrics:
+    """
+    Per-process counters of database connections opened (or borrowed from
+    the pool) and the time spent waiting for them, per database alias.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._aliases = {}
+
+    def record_open(self, alias: str, wait: float | None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stats = self._aliases.setdefault(
+                alias,
+                {'opened': 0, 'waits': 0, 'wait_total': 0.0, 'wait_max': 0.0, 'recent': deque()},
+            )
+            stats['opened'] += 1
+            stats['recent'].append(now)
+            if wait is not None:
+                stats['waits'] += 1
+                stats['wait_total'] += wait
+                stats['wait_max'] = max(stats['wait_max'], wait)
+
+    def stats(self) -> dict:
+        cutoff = time.monotonic() - OPEN_RATE_WINDOW_SECONDS
+        result = {}
+        with self._lock:
+            for alias, stats in self._aliases.items():
+                recent = stats['recent']
+                while recent and recent[0] < cutoff:
+                    recent.popleft()
+                result[alias] = {
+                    'opened': stats['opened'],
+                    'opened_last_minute': len(recent),
+                    'wait_ms_avg': round(stats['wait_total'] / stats['waits'] * 1000, 3)
+                    if stats['waits']
+                    else None,
+                    'wait_ms_max': round(stats['wait_max'] * 1000, 3),
+                }
+        for alias, stats in result.items():
+            pool = getattr(connections[alias], 'pool', None)
+            if pool is not None:
+                stats['pool'] = pool.get_stats()
+        return result
+
+
+connection_metrics = ConnectionMetrics()
+
+
+def connection_metrics_enabled() -> bool:
+    return getattr(settings, 'DATABASE_CONNECTION_METRICS', False)
+
+
+def connect_duration(connection) -> float | None:
+    """
+    Seconds since `connection.connect()` started, read from the expiry time
+    it sets before connecting (`close_at`). That covers the TCP/TLS handshake
+    or the pool wait as well as the session setup. None for connections
+    without an expiry (CONN_MAX_AGE=None).
+    """
+    max_age = connection.settings_dict['CONN_MAX_AGE']
+    if max_age is None or connection.close_at is None:
+        return None
+    return max(time.monotonic() - (connection.close_at - max_age), 0.0)
+
+
+def apply_sqlite_pragmas(connection) -> None:
+    """
+    Applies `SQLITE_PRAGMAS` to a new SQLite connection. In-memory test
+    databases keep their own journal mode, which SQLite reports as 'memory'.
+    Skipped inside a transaction, where SQLite refuses some of the pragmas.
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas or connection.in_atomic_block:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if not name.isidentifier():
+                raise ValueError(f'Invalid SQLite pragma: {name}')
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def is_database_locked(error: Exception) -> bool:
+    """True for SQLite's 'database is locked' and 'database table is locked'."""
+    message = str(error)
+    return isinstance(error, OperationalError) and (
+        'is locked' in message or 'database is busy' in message
+    )
+
+
+def retry_on_locked(func=None, *, using: str = DEFAULT_DB_ALIAS):
+    """
+    Runs `func` in a transaction and retries it, up to
+    `DATABASE_WRITE_RETRIES` times, while SQLite reports the database
+    locked. Waits grow exponentially from `DATABASE_WRITE_RETRY_DELAY` with
+    full jitter, so writers that collided do not retry in lockstep.
+    Inside an outer transaction the error is raised as is, since only the
+    outermost transaction can be retried.
+    """
+    if func is None:
+        return functools.partial(retry_on_locked, using=using)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = getattr(settings, 'DATABASE_WRITE_RETRIES', 0)
+        base_delay = getattr(settings, 'DATABASE_WRITE_RETRY_DELAY', 0.05)
+        nested = connections[using].in_atomic_block
+        for attempt in range(retries + 1):
+            try:
+                with transaction.atomic(using=using):
+                    return func(*args, **kwargs)
+            except OperationalError as e:
+                if nested or attempt == retries or not is_database_locked(e):
+                    raise
+                delay = random.uniform(0, base_delay * 2**attempt)
+                logger.warning(
+                    '%s: %s, retry %d of %d in %.3fs',
+                    func.__qualname__,
+                    e,
+                    attempt + 1,
+                    retries,
+                    delay,
+                )
+                time.sleep(delay)
+
+    return wrapper
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .cache import get_measurement_cache
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = 'replica'
+RECENT_WRITE_KEY_PREFIX = 'bp:recent_write'
+# Apps whose reads may go to the replica; auth and sessions stay on the primary
+REPLICA_APP_LABELS = {'alice_skill'}
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def use_replica_reads(enabled: bool = True):
+    """
+    Allows (or forbids) replica reads in the current context.
+    Returns a token for `reset_replica_reads`.
+    """
+    return _replica_reads.set(enabled)
+
+
+def reset_replica_reads(token) -> None:
+    _replica_reads.reset(token)
+
+
+def mark_recent_write(*keys: str) -> None:
+    """
+    Opens the read-your-writes window for the given data scopes: their reads
+    stay on the primary for REPLICA_STICKY_SECONDS, covering replication lag.
+    """
+    if not replica_configured() or not keys:
+        return
+    timeout = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+    get_measurement_cache().set_many(
+        {f'{RECENT_WRITE_KEY_PREFIX}:{key}': 1 for key in keys}, timeout
+    )
+
+
+def has_recent_write(*keys: str) -> bool:
+    if not keys:
+        return False
+    return bool(
+        get_measurement_cache().get_many([f'{RECENT_WRITE_KEY_PREFIX}:{key}' for key in keys])
+    )
+
+
+class ReplicaHealth:
+    """
+    Per-process replica health, re-checked at most every
+    REPLICA_HEALTH_CHECK_INTERVAL seconds. The replica is unhealthy when it
+    cannot be reached or, on PostgreSQL, lags by more than
+    REPLICA_MAX_LAG_SECONDS.
+    """
+
+    def __init__(self, alias: str):
+        self.alias = alias
+        self._healthy = False
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def is_healthy(self) -> bool:
+        interval = getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 30)
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= interval:
+            with self._lock:
+                if self._checked_at is None or now - self._checked_at >= interval:
+                    self._healthy = self.check()
+                    self._checked_at = now
+        return self._healthy
+
+    def check(self) -> bool:
+        try:
+            connection = connections[self.alias]
+            connection.ensure_connection()
+            lag = self.replication_lag(connection)
+        except Exception as e:
+            logger.warning('Replica %s is unavailable, reading from primary: %s', self.alias, e)
+            return False
+        max_lag = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5)
+        if lag is not None and lag > max_lag:
+            logger.warning('Replica %s lags by %.1fs, reading from primary', self.alias, lag)
+            return False
+        return True
+
+    def replication_lag(self, connection) -> float | None:
+        """
+        Seconds the replica is behind the primary, None when unknown.
+        """
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() '
+                'THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+            )
+            lag = cursor.fetchone()[0]
+        return None if lag is None else float(lag)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checked_at = None
+
+
+replica_health = ReplicaHealth(REPLICA_ALIAS)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the replica while the current request allows it (see
+    `ReplicaReadMixin`) and the replica is healthy. Writes always go to the
+    primary, including saves of objects that were read from the replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICA_APP_LABELS or not _replica_reads.get():
+            return None
+        if not replica_health.is_healthy():
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -0,0 +1,91 @@
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+
+
+def _bucket_sizes(total: int, threshold: int) -> Iterator[int]:
+    """
+    Yields the sizes of the LTTB buckets between the first and the last point.
+    """
+    every = (total - 2) / (threshold - 2)
+    start = 1
+    for i in range(threshold - 2):
+        end = total - 1 if i == threshold - 3 else int((i + 1) * every) + 1
+        yield end - start
+        start = end
+
+
+def lttb(
+    rows: Iterable[tuple],
+    total: int,
+    threshold: int,
+    x: Callable[[tuple], float],
+    y: Callable[[tuple], float],
+) -> Iterator[tuple]:
+    """
+    Largest-Triangle-Three-Buckets downsampling over a stream of rows.
+
+    `rows` must yield exactly `total` rows ordered by `x`. At most `threshold`
+    rows are yielded, always including the first and the last one. Only two
+    buckets are held in memory, so the input can be a streamed queryset.
+    """
+    rows = iter(rows)
+    if threshold >= total:
+        yield from rows
+        return
+    if threshold < 3:
+        yield from _first_and_last(rows, threshold)
+        return
+
+    selected = next(rows, None)
+    if selected is None:
+        return
+    yield selected
+    buckets = (list(islice(rows, size)) for size in _bucket_sizes(total, threshold))
+    current = next(buckets)
+
+    for following in buckets:
+        if not following:
+            break
+        selected = _pick(current, selected, _average(following, x, y), x, y)
+        yield selected
+        current = following
+
+    # The stream may hold fewer rows than counted if data changed meanwhile
+    last = next(rows, None)
+    if last is None:
+        if current:
+            yield current[-1]
+        return
+    yield _pick(current, selected, (x(last), y(last)), x, y)
+    yield last
+
+
+def _first_and_last(rows: Iterator[tuple], threshold: int) -> Iterator[tuple]:
+    first = last = next(rows, None)
+    if first is None:
+        return
+    yield first
+    for last in rows:
+        pass
+    if threshold > 1 and last is not first:
+        yield last
+
+
+def _average(bucket: list[tuple], x, y) -> tuple[float, float]:
+    return (
+        sum(x(row) for row in bucket) / len(bucket),
+        sum(y(row) for row in bucket) / len(bucket),
+    )
+
+
+def _pick(bucket: list[tuple], previous: tuple, following: tuple[float, float], x, y) -> tuple:
+    """
+    Returns the row of `bucket` forming the largest triangle with the
+    previously selected row and the average of the following bucket.
+    """
+    ax, ay = x(previous), y(previous)
+    cx, cy = following
+    return max(
+        bucket,
+        key=lambda row: abs((ax - cx) * (y(row) - ay) - (ax - x(row)) * (cy - ay)),
+    )
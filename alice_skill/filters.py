@@ -1,19 +1,62 @@
+from datetime import datetime, time, timedelta
+
 import django_filters
-from .models import BloodPressureMeasurement
+from .helpers import get_request_zoneinfo
+from .models import BloodPressureMeasurement, DailyMeasurementRollup
 
 
 class BloodPressureMeasurementFilter(django_filters.FilterSet):
     """
     FilterSet for filtering BloodPressureMeasurement by date range.
+
+    Dates are local days in the timezone of the requested user and are
+    translated into a plain `measured_at` range, so the
+    `(user, -measured_at)` index can serve the lookup.
     """
 
     created_at__gte = django_filters.DateFilter(
-        field_name='measured_at', lookup_expr='date__gte'
+        field_name='measured_at', method='filter_local_date_gte'
     )
     created_at__lte = django_filters.DateFilter(
-        field_name='measured_at', lookup_expr='date__lte'
+        field_name='measured_at', method='filter_local_date_lte'
     )
 
     class Meta:
         model = BloodPressureMeasurement
         fields = ['created_at__gte', 'created_at__lte']
+
+    def _local_day_start(self, value):
+        return datetime.combine(value, time.min, tzinfo=get_request_zoneinfo(self.request))
+
+    def get_measured_at_range(self):
+        """
+        Returns the `[start, end)` bounds of the validated date parameters,
+        None for a missing side.
+        """
+        data = self.form.cleaned_data
+        start, end = data.get('created_at__gte'), data.get('created_at__lte')
+        return (
+            self._local_day_start(start) if start else None,
+            self._local_day_start(end + timedelta(days=1)) if end else None,
+        )
+
+    def filter_local_date_gte(self, queryset, name, value):
+        return queryset.filter(**{f'{name}__gte': self._local_day_start(value)})
+
+    def filter_local_date_lte(self, queryset, name, value):
+        next_day_start = self._local_day_start(value + timedelta(days=1))
+        return queryset.filter(**{f'{name}__lt': next_day_start})
+
+
+class DailyMeasurementRollupFilter(django_filters.FilterSet):
+    """
+    FilterSet for daily rollups, using the same local-day parameters as
+    BloodPressureMeasurementFilter.
+    """
+
+    created_at__gte = django_filters.DateFilter(field_name='day', lookup_expr='gte')
+    created_at__lte = django_filters.DateFilter(field_name='day', lookup_expr='lte')
+
+    class Meta:
+        model = DailyMeasurementRollup
+        fields = ['created_at__gte', 'created_at__lte']
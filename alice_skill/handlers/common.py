@@ -1,5 +1,6 @@
 import logging
 
+from ..log_queue import PAYLOAD
 from ..messages import HandlerMessages
 
 
@@ -11,7 +12,7 @@ logger = logging.getLogger(__name__)
 class StartDialogHandler(BaseAliceHandler):
     def handle(self, validated_request_data: dict) -> str | None:
         original_utterance = self.get_original_utterance(validated_request_data).lower()
-        logger.debug(f"StartDialogHandler: Processing request: '{original_utterance}'")
+        logger.debug("StartDialogHandler: Processing request: '%s'", original_utterance)
 
         if not original_utterance and self.is_new_session(validated_request_data):
             logger.info(
@@ -23,5 +24,7 @@ class StartDialogHandler(BaseAliceHandler):
 class UnparsedHandler(BaseAliceHandler):
     def handle(self, validated_request_data: dict) -> str | None:
         logger.info("UnparsedHandler: Processing unparsed request")
-        logger.debug(f"UnparsedHandler: Request data: {validated_request_data}")
+        logger.debug(
+            "UnparsedHandler: Request data: %s", validated_request_data, extra=PAYLOAD
+        )
         return HandlerMessages.ERROR_UNPARSED
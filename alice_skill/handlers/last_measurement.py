@@ -2,6 +2,8 @@ import logging
 
 from ..messages import LastMeasurementMessages
 from .base import BaseAliceHandler
+from ..archive import latest_archived_measurement
+from ..hot_cache import get_hot_cache
 from ..models import BloodPressureMeasurement, AliceUser
 from ..serializers import BloodPressureMeasurementSerializer
 from ..helpers import format_measured_at
@@ -19,12 +21,13 @@ class LastMeasurementHandler(BaseAliceHandler):
     def handle(self, validated_request_data: dict) -> str | None:
         original_utterance = self.get_original_utterance(validated_request_data).lower()
         logger.debug(
-            f"LastMeasurementHandler: Processing request: '{original_utterance}'"
+            "LastMeasurementHandler: Processing request: '%s'", original_utterance
         )
 
         if not any(k in original_utterance for k in self.KEYWORDS):
             logger.debug(
-                f"LastMeasurementHandler: No keywords matched in request: '{original_utterance}'"
+                "LastMeasurementHandler: No keywords matched in request: '%s'",
+                original_utterance,
             )
             return
 
@@ -39,11 +42,15 @@ class LastMeasurementHandler(BaseAliceHandler):
         except AliceUser.DoesNotExist:
             return LastMeasurementMessages.NO_RECORDS
 
-        last = (
-            BloodPressureMeasurement.objects.filter(user=user)
-            .order_by("-measured_at")
-            .first()
-        )
+        hot_cache = get_hot_cache()
+        if hot_cache is not None:
+            last = hot_cache.get(user).latest_measurement()
+        else:
+            last = (
+                BloodPressureMeasurement.objects.filter(user=user)
+                .order_by("-measured_at")
+                .first()
+            ) or latest_archived_measurement(user)
         if not last:
             logger.info("LastMeasurementHandler: No measurements found in database")
             return LastMeasurementMessages.NO_RECORDS
@@ -61,6 +68,8 @@ class LastMeasurementHandler(BaseAliceHandler):
         reply += f"({format_measured_at(data['measured_at'], user_timezone_str, timezone.now())})"
 
         logger.info(
-            f"LastMeasurementHandler: Returning measurement: {data['systolic']}/{data['diastolic']}"
+            "LastMeasurementHandler: Returning measurement: %s/%s",
+            data["systolic"],
+            data["diastolic"],
         )
         return reply
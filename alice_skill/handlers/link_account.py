@@ -19,7 +19,7 @@ class LinkAccountHandler(BaseAliceHandler):
             return LinkAccountMessages.NO_ID
 
         utterance = self.get_original_utterance(validated_request_data).lower()
-        logger.debug(f"LinkAccountHandler: Processing request: '{utterance}'")
+        logger.debug("LinkAccountHandler: Processing request: '%s'", utterance)
 
         nlu_tokens = validated_request_data.get("request", {}).get("nlu", {}).get("tokens", [])
         normalized_tokens = _normalize_nlu_tokens(nlu_tokens)
@@ -15,23 +15,21 @@ class RecordPressureHandler(BaseAliceHandler):
     def handle(self, validated_request_data: dict) -> str | None:
         tokens = self.get_nlu_tokens(validated_request_data)
         if tokens:
-            logger.debug(f"RecordPressureHandler: Processing request tokens: {tokens}")
+            logger.debug("RecordPressureHandler: Processing request tokens: %s", tokens)
             # Join tokens into a string and normalize known separators
             text = " ".join(tokens).lower().replace(" x ", " на ")
-            logger.debug(
-                f"RecordPressureHandler: Normalized text from tokens: '{text}'"
-            )
+            logger.debug("RecordPressureHandler: Normalized text from tokens: '%s'", text)
         else:
             original_utterance = self.get_original_utterance(validated_request_data)
             logger.debug(
-                f"RecordPressureHandler: Processing request: '{original_utterance}'"
+                "RecordPressureHandler: Processing request: '%s'", original_utterance
             )
 
             # Normalize: lowercase, replace common separators with a standard form, strip extra spaces
             text = original_utterance.lower().strip()
             text = text.replace(",", " ").replace("/", " на ").replace("-", " ")
             text = re.sub(r"\s+", " ", text)
-            logger.debug(f"RecordPressureHandler: Normalized text: '{text}'")
+            logger.debug("RecordPressureHandler: Normalized text: '%s'", text)
 
         # Support multiple phrasings: "120 на 80", "давление 120 80", "120/80", "АД 120 на 80"
         # Optionally capture pulse with words like "пульс" or standalone third number
@@ -40,12 +38,10 @@ class RecordPressureHandler(BaseAliceHandler):
 
         match = re.search(pattern, text)
         if match:
-            logger.debug(f"RecordPressureHandler: Pattern matched: {pattern}")
+            logger.debug("RecordPressureHandler: Pattern matched: %s", pattern)
 
         if not match:
-            logger.debug(
-                f"RecordPressureHandler: No pattern matched for text: '{text}'"
-            )
+            logger.debug("RecordPressureHandler: No pattern matched for text: '%s'", text)
             return
 
         systolic = int(match.group(1))
@@ -54,7 +50,10 @@ class RecordPressureHandler(BaseAliceHandler):
         pulse = int(pulse_str) if pulse_str else None
 
         logger.info(
-            f"RecordPressureHandler: Extracted values - systolic: {systolic}, diastolic: {diastolic}, pulse: {pulse}"
+            "RecordPressureHandler: Extracted values - systolic: %s, diastolic: %s, pulse: %s",
+            systolic,
+            diastolic,
+            pulse,
         )
 
         session = validated_request_data.get("session", {})
@@ -68,11 +67,11 @@ class RecordPressureHandler(BaseAliceHandler):
         )
         user, created = AliceUser.objects.get_or_create(alice_user_id=user_id)
         if created:
-            logger.info(f"New user created with alice_user_id: {user_id}")
+            logger.info("New user created with alice_user_id: %s", user_id)
         if user.timezone != user_timezone_str:
             user.timezone = user_timezone_str
             user.save(update_fields=["timezone"])
-            logger.info(f"Updated timezone for user {user_id} to {user_timezone_str}")
+            logger.info("Updated timezone for user %s to %s", user_id, user_timezone_str)
 
         payload = {"user": user.pk, "systolic": systolic, "diastolic": diastolic}
         if pulse is not None:
@@ -83,8 +82,10 @@ class RecordPressureHandler(BaseAliceHandler):
         if serializer.is_valid():
             instance = serializer.save()
             logger.info(
-                f"RecordPressureHandler: Successfully saved measurement: {systolic}/{diastolic}"
-                + (f", pulse: {instance.pulse}" if instance.pulse else "")
+                "RecordPressureHandler: Successfully saved measurement: %s/%s%s",
+                systolic,
+                diastolic,
+                f", pulse: {instance.pulse}" if instance.pulse else "",
             )
             if instance.pulse is not None:
                 return RecordPressureMessages.SUCCESS_WITH_PULSE.format(
@@ -94,7 +95,5 @@ class RecordPressureHandler(BaseAliceHandler):
                 systolic=systolic, diastolic=diastolic
             )
 
-        logger.debug(
-            f"RecordPressureHandler: Invalid measurement data: {serializer.errors}"
-        )
+        logger.debug("RecordPressureHandler: Invalid measurement data: %s", serializer.errors)
         return RecordPressureMessages.INVALID
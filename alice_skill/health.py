@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from .db_router import replica_configured, replica_health
+
+logger = logging.getLogger(__name__)
+
+CACHE_PROBE_KEY = 'bp:health:probe'
+STARTED_AT = time.monotonic()
+
+
+def liveness() -> dict:
+    """
+    Process liveness, without touching the database or the cache.
+    """
+    return {'status': 'alive', 'uptime_seconds': round(time.monotonic() - STARTED_AT, 1)}
+
+
+def _timed(check) -> dict:
+    """Runs one check and returns its status and latency."""
+    started = time.perf_counter()
+    try:
+        result = {'status': 'ok', **(check() or {})}
+    except Exception as e:
+        logger.warning('Readiness check %s failed: %s', check.__name__, e)
+        result = {'status': 'error', 'error': str(e)}
+    result['latency_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def check_database(alias: str) -> None:
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def check_cache() -> None:
+    cache = caches[getattr(settings, 'MEASUREMENT_CACHE_ALIAS', 'default')]
+    token = str(time.monotonic_ns())
+    cache.set(CACHE_PROBE_KEY, token, 30)
+    if cache.get(CACHE_PROBE_KEY) != token:
+        raise RuntimeError('cache did not return the probe value')
+
+
+def check_migrations() -> dict:
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if pending:
+        raise RuntimeError(f'{len(pending)} unapplied migration(s)')
+    return {'pending': 0}
+
+
+def run_readiness_checks() -> dict:
+    started = time.perf_counter()
+    aliases = getattr(settings, 'DATABASE_SHARDS', [DEFAULT_DB_ALIAS])
+    checks = {
+        'databases': {
+            alias: _timed(lambda alias=alias: check_database(alias)) for alias in aliases
+        },
+        'cache': _timed(check_cache),
+        'migrations': _timed(check_migrations),
+    }
+    ready = checks['cache']['status'] == checks['migrations']['status'] == 'ok' and all(
+        result['status'] == 'ok' for result in checks['databases'].values()
+    )
+    if replica_configured():
+        # A failing replica only degrades reads to the primary
+        checks['replica'] = {'status': 'ok' if replica_health.is_healthy() else 'error'}
+    return {
+        'status': 'ready' if ready else 'not_ready',
+        'checks': checks,
+        'checked_at': timezone.now().isoformat(),
+        'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+class Readiness:
+    """
+    Per-process cache of the readiness checks. A result younger than
+    READINESS_CACHE_SECONDS is served as is; an older one is still served
+    while a background thread refreshes it, unless it is older than
+    READINESS_MAX_AGE_SECONDS, which makes the probe wait for a fresh run.
+    """
+
+    def __init__(self):
+        self._result = None
+        self._checked_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        ttl = getattr(settings, 'READINESS_CACHE_SECONDS', 10)
+        max_age = getattr(settings, 'READINESS_MAX_AGE_SECONDS', 60)
+        with self._lock:
+            result, checked_at = self._result, self._checked_at
+        age = None if checked_at is None else time.monotonic() - checked_at
+        if age is None or age >= max_age:
+            result = self.refresh()
+            age = 0.0
+        elif age >= ttl:
+            self.refresh_in_background()
+        return {**result, 'age_seconds': round(age, 3)}
+
+    def refresh(self) -> dict:
+        result = run_readiness_checks()
+        with self._lock:
+            self._result, self._checked_at = result, time.monotonic()
+        return result
+
+    def refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        finally:
+            # The thread's own database connections
+            connections.close_all()
+            with self._lock:
+                self._refreshing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._result = self._checked_at = None
+
+
+readiness = Readiness()
@@ -1,7 +1,7 @@
 import logging
 import re
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import hmac
 import hashlib
 
@@ -11,6 +11,19 @@ from .models import AliceUser
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def to_micros(value: datetime) -> int:
+    """
+    Converts an aware datetime to integer epoch microseconds.
+    """
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
 
 def get_hashed_telegram_id(telegram_id: str) -> str:
     """
@@ -24,42 +37,59 @@ def get_hashed_telegram_id(telegram_id: str) -> str:
     ).hexdigest()
 
 
+def get_hashed_telegram_ids(telegram_ids) -> dict[str, str]:
+    """
+    Hashes many telegram_ids at once, reusing one keyed HMAC state.
+    Returns a mapping of hash to telegram_id.
+    """
+    keyed = hmac.new(settings.TELEGRAM_ID_HMAC_KEY.encode("utf-8"), digestmod=hashlib.sha256)
+    hashed = {}
+    for telegram_id in telegram_ids:
+        mac = keyed.copy()
+        mac.update(str(telegram_id).encode("utf-8"))
+        hashed[mac.hexdigest()] = str(telegram_id)
+    return hashed
+
+
 def get_user_context(request):
     """
     Adds user and timezone information to the serializer context.
     """
     context = {}
-    user = request.user
-    is_bot_request = getattr(request, 'is_bot', False)
+    alice_user = AliceUser.objects.for_request(request)
 
-    # For authenticated users, add their AliceUser and timezone to the context
-    if user.is_authenticated:
-        try:
-            alice_user = AliceUser.objects.select_related('user').get(user=user)
-            context['alice_user'] = alice_user
-            context['timezone'] = alice_user.timezone or 'UTC'
-        except AliceUser.DoesNotExist:
-            pass  # No linked AliceUser, so no user-specific context is added
-
-    # For bot requests, find the user by user_id and add their info to the context
-    elif is_bot_request:
-        user_id = request.query_params.get('user_id')
-        if user_id:
-            try:
-                alice_user = AliceUser.objects.get(alice_user_id=user_id)
-                context['alice_user'] = alice_user
-                context['timezone'] = alice_user.timezone or 'UTC'
-                logger.debug(
-                    f"Bot request: Found user {user_id} with timezone '{alice_user.timezone}'"
-                )
-            except AliceUser.DoesNotExist:
-                logger.warning(
-                    f"Bot request: User with alice_user_id '{user_id}' not found"
-                )
+    if alice_user is not None:
+        context['alice_user'] = alice_user
+        context['timezone'] = alice_user.timezone or 'UTC'
+    elif getattr(request, 'is_bot', False) and request.query_params.get('user_id'):
+        logger.warning(
+            "Bot request: User with alice_user_id '%s' not found",
+            request.query_params['user_id'],
+        )
 
     return context
 
 
+def get_zoneinfo(tz_str: str | None) -> ZoneInfo:
+    """
+    Returns the ZoneInfo for a timezone name, UTC for empty or invalid names.
+    """
+    tz_str = (tz_str or '').strip()
+    if tz_str:
+        try:
+            return ZoneInfo(tz_str)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning("Invalid timezone '%s', falling back to UTC", tz_str)
+    return ZoneInfo('UTC')
+
+
+def get_request_zoneinfo(request) -> ZoneInfo:
+    """
+    Returns the timezone of the AliceUser a request is scoped to, UTC by default.
+    """
+    alice_user = AliceUser.objects.for_request(request) if request else None
+    return get_zoneinfo(alice_user.timezone if alice_user else None)
+
 
 def replace_latin_homoglyphs(text: str) -> str:
     """
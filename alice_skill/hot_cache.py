@@ -0,0 +1,310 @@
+import logging
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .archive import latest_archived_measurement
+from .cache import alice_user_scope, get_data_version
+from .helpers import from_micros, to_micros
+from .models import BloodPressureMeasurement
+from .sharding import sharding_enabled
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('systolic', 'diastolic', 'pulse')
+# Fixed per-user cost on top of the arrays, used for the memory cap
+ENTRY_OVERHEAD_BYTES = 512
+
+
+class UserSeries:
+    """
+    One user's recent readings as parallel arrays ordered by time.
+
+    Times are epoch microseconds in `array('q')`, values are `array('H')`
+    with 0 standing for a missing pulse. Readings from `window_start` on are
+    complete; nothing older is held.
+    """
+
+    __slots__ = ('user_id', 'version', 'window_start', 'times', *METRICS)
+
+    def __init__(self, user_id: int, version: str, window_start: int):
+        self.user_id = user_id
+        self.version = version
+        self.window_start = window_start
+        self.times = array('q')
+        self.systolic = array('H')
+        self.diastolic = array('H')
+        self.pulse = array('H')
+
+    def add(self, measured_at: int, systolic: int, diastolic: int, pulse: int | None) -> bool:
+        """
+        Inserts a reading in time order. Readings before the window are not
+        held; returns False for them.
+        """
+        if measured_at < self.window_start:
+            return False
+        if not self.times or measured_at >= self.times[-1]:
+            index = len(self.times)
+        else:
+            index = bisect_left(self.times, measured_at)
+        self.times.insert(index, measured_at)
+        self.systolic.insert(index, systolic)
+        self.diastolic.insert(index, diastolic)
+        self.pulse.insert(index, pulse or 0)
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        return ENTRY_OVERHEAD_BYTES + sum(
+            len(values) * values.itemsize
+            for values in (self.times, self.systolic, self.diastolic, self.pulse)
+        )
+
+    def covers(self, start: datetime) -> bool:
+        return to_micros(start) >= self.window_start
+
+    def span(self, start: datetime, end: datetime | None = None) -> range:
+        """
+        Returns the indexes of readings in `[start, end)`.
+        """
+        first = bisect_left(self.times, to_micros(start))
+        last = len(self.times) if end is None else bisect_left(self.times, to_micros(end))
+        return range(first, last)
+
+    def row(self, index: int, value_fields) -> tuple:
+        """
+        Builds a `values_list` style tuple for `MeasurementRowSerializer`.
+        """
+        pulse = self.pulse[index] or None
+        values = {
+            'user_id': self.user_id,
+            'systolic': self.systolic[index],
+            'diastolic': self.diastolic[index],
+            'pulse': pulse,
+            'measured_at': from_micros(self.times[index]),
+        }
+        return tuple(values[field] for field in value_fields)
+
+    def rows(self, indexes: range, value_fields, descending: bool = False) -> list[tuple]:
+        if descending:
+            indexes = reversed(indexes)
+        return [self.row(index, value_fields) for index in indexes]
+
+    def latest(self, value_fields) -> tuple | None:
+        if not self.times:
+            return None
+        return self.row(len(self.times) - 1, value_fields)
+
+    def latest_measurement(self) -> BloodPressureMeasurement | None:
+        """
+        Returns the newest reading as an unsaved measurement for serializers.
+        """
+        row = self.latest(('user_id', *METRICS, 'measured_at'))
+        if row is None:
+            return None
+        user_id, systolic, diastolic, pulse, measured_at = row
+        return BloodPressureMeasurement(
+            user_id=user_id,
+            systolic=systolic,
+            diastolic=diastolic,
+            pulse=pulse,
+            measured_at=measured_at,
+        )
+
+    def summarize(self, indexes: range, tz) -> dict:
+        """
+        Same summary as `rollups.summarize_rollups`, computed from the arrays.
+        """
+        count = len(indexes)
+        days = len(
+            {from_micros(self.times[i]).astimezone(tz).date() for i in indexes}
+        )
+        summary = {'count': count, 'days': days}
+        for metric in METRICS:
+            values = getattr(self, metric)[indexes.start : indexes.stop]
+            if metric == 'pulse':
+                values = [value for value in values if value]
+            n = len(values)
+            if not n:
+                summary[metric] = None
+                continue
+            avg = sum(values) / n
+            variance = max(sum(value * value for value in values) / n - avg * avg, 0)
+            summary[metric] = {
+                'avg': round(avg, 1),
+                'stddev': round(math.sqrt(variance), 1),
+                'min': min(values),
+                'max': max(values),
+            }
+        return summary
+
+
+class MeasurementHotCache:
+    """
+    Process-local LRU of `UserSeries` capped by memory.
+
+    Entries are filled on first access and appended to when measurements are
+    created in this process. Each entry remembers the user's data version, so
+    writes from other processes (which bump the version in the shared
+    measurement cache) cause a refill instead of stale reads.
+    """
+
+    def __init__(self, max_bytes: int, window_days: int):
+        self.max_bytes = max_bytes
+        self.window_days = window_days
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, UserSeries] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, alice_user) -> UserSeries:
+        version = get_data_version(alice_user_scope(alice_user))
+        with self._lock:
+            entry = self._entries.get(alice_user.pk)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(alice_user.pk)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._load(alice_user, version)
+        with self._lock:
+            self._store(entry)
+        return entry
+
+    def _load(self, alice_user, version: str) -> UserSeries:
+        """
+        Loads the window. A user with nothing recent keeps their latest reading,
+        archived or not, so `latest` can always be answered from the entry.
+        """
+        window_start = timezone.now() - timedelta(days=self.window_days)
+        measurements = BloodPressureMeasurement.objects.filter(user=alice_user)
+        rows = list(
+            measurements.filter(measured_at__gte=window_start)
+            .order_by('measured_at')
+            .values_list('measured_at', *METRICS)
+        )
+        if not rows:
+            rows = list(
+                measurements.order_by('-measured_at').values_list('measured_at', *METRICS)[:1]
+            )
+            archived = None if rows else latest_archived_measurement(alice_user)
+            if archived is not None:
+                rows = [(archived.measured_at, *(getattr(archived, m) for m in METRICS))]
+            if rows:
+                window_start = rows[0][0]
+
+        entry = UserSeries(alice_user.pk, version, to_micros(window_start))
+        for measured_at, systolic, diastolic, pulse in rows:
+            entry.times.append(to_micros(measured_at))
+            entry.systolic.append(systolic)
+            entry.diastolic.append(diastolic)
+            entry.pulse.append(pulse or 0)
+        return entry
+
+    def _store(self, entry: UserSeries) -> None:
+        previous = self._entries.pop(entry.user_id, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[entry.user_id] = entry
+        self._bytes += entry.nbytes
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def record_created(self, measurement, expected_version: str, version: str) -> None:
+        """
+        Appends a new measurement to its user's entry, if cached, and moves
+        the entry to `version`, the data version the write bumped the user to.
+        An entry not at `expected_version`, the version right before that
+        bump, is missing writes of other processes and is dropped instead.
+        """
+        with self._lock:
+            entry = self._entries.get(measurement.user_id)
+            if entry is None:
+                return
+            if entry.version != expected_version:
+                del self._entries[entry.user_id]
+                self._bytes -= entry.nbytes
+                return
+            before = entry.nbytes
+            added = entry.add(
+                to_micros(measurement.measured_at),
+                measurement.systolic,
+                measurement.diastolic,
+                measurement.pulse,
+            )
+            if not added and not entry.times:
+                # An empty entry must still answer `latest` correctly
+                del self._entries[entry.user_id]
+                self._bytes -= before
+                return
+            entry.version = version
+            self._bytes += entry.nbytes - before
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.pop(user_id, None)
+                if entry is not None:
+                    self._bytes -= entry.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'users': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_hot_cache: MeasurementHotCache | None = None
+_hot_cache_lock = threading.Lock()
+
+
+def get_hot_cache() -> MeasurementHotCache | None:
+    """
+    Returns the process-wide hot cache, or None unless MEASUREMENT_HOT_CACHE is enabled.
+    Entries are keyed by primary key, which is only unique within a shard,
+    so the cache is off while sharding is enabled.
+    """
+    global _hot_cache
+    if not getattr(settings, 'MEASUREMENT_HOT_CACHE', False) or sharding_enabled():
+        return None
+    if _hot_cache is None:
+        with _hot_cache_lock:
+            if _hot_cache is None:
+                _hot_cache = MeasurementHotCache(
+                    max_bytes=getattr(settings, 'MEASUREMENT_HOT_CACHE_MAX_BYTES', 4 * 1024 * 1024),
+                    window_days=getattr(settings, 'MEASUREMENT_HOT_CACHE_DAYS', 31),
+                )
+    return _hot_cache
+
+
+def reset_hot_cache() -> None:
+    """
+    Drops the process-wide hot cache, so it is rebuilt from current settings.
+    """
+    global _hot_cache
+    with _hot_cache_lock:
+        _hot_cache = None
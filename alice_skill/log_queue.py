@@ -0,0 +1,82 @@
+"""
+Non-blocking logging.
+
+Request threads only put records on an in-process queue. A listener thread
+formats them and writes them to the file and console handlers, so neither
+log I/O nor message formatting adds latency to a request. Configured in
+`config/components/logging.py`:
+
+    'queue': {
+        'class': 'alice_skill.log_queue.DeferredQueueHandler',
+        'handlers': ['file', 'console'],
+        'listener': 'alice_skill.log_queue.BackgroundQueueListener',
+        'filters': ['payload_sample'],
+    }
+
+Debug records that dump whole requests or responses pass `extra=PAYLOAD`,
+and `PayloadSampleFilter` keeps only a share of them.
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+# `extra` for records that dump a full request or response payload
+PAYLOAD = {'payload': True}
+
+
+class PayloadSampleFilter(logging.Filter):
+    """
+    Passes every record but only a `rate` share (0 to 1) of payload dumps.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record) -> bool:
+        if not getattr(record, 'payload', False):
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queues records without formatting them.
+
+    `QueueHandler` renders the message in the calling thread so the record
+    can be pickled. The queue never leaves the process here, so the message
+    and traceback are rendered by the listener instead. Arguments are kept
+    by reference, so values mutated right after logging show their new state.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+    def prepare(self, record):
+        # Other handlers of the same logger may format the record concurrently
+        return copy.copy(record)
+
+    def _restart_listener(self):
+        # Threads do not survive a fork and the queue's lock may be held,
+        # e.g. by uWSGI or gunicorn forking workers from a preloaded app
+        if self.listener is None or self.listener._thread is None:
+            return
+        self.queue = self.listener.queue = queue.Queue()
+        self.listener._thread = None
+        self.listener.start()
+
+
+class BackgroundQueueListener(QueueListener):
+    """
+    Starts once logging is configured and drains the queue at exit.
+    """
+
+    def __init__(self, queue, *handlers, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.start()
+        atexit.register(self.stop)
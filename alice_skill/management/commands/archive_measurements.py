@@ -0,0 +1,78 @@
+"""
+Management command to move old measurements into the compressed archive.
+
+Whole UTC months older than the configured age are packed into one
+MeasurementArchive row per user and month and removed from the measurement
+table. Reads whose date range reaches that far back merge the archive in,
+and daily rollups are kept, so stats are unaffected.
+
+Usage:
+    python manage.py archive_measurements [--older-than-days N] [--alice-user-id ID] [--dry-run]
+
+Or with uv:
+    uv run manage.py archive_measurements
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from alice_skill.archive import archive_cutoff, archive_user_measurements
+from alice_skill.models import AliceUser, BloodPressureMeasurement
+from alice_skill.sharding import on_each_shard
+
+
+class Command(BaseCommand):
+    help = 'Move measurements older than the archive age into per-month archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=getattr(settings, 'MEASUREMENT_ARCHIVE_AFTER_DAYS', 365),
+            help='Archive whole months older than this many days',
+        )
+        parser.add_argument(
+            '--alice-user-id',
+            type=str,
+            help='Only archive measurements of this Alice user ID',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be archived without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0:
+            raise CommandError('--older-than-days must not be negative')
+        before = archive_cutoff(options['older_than_days'])
+
+        users = AliceUser.objects.order_by('pk')
+        if options.get('alice_user_id'):
+            users = users.filter(alice_user_id=options['alice_user_id'])
+            if not users.exists():
+                raise CommandError('User not found')
+        users = users.filter(measurements__measured_at__lt=before).distinct()
+        shards = on_each_shard(users)
+
+        if options['dry_run']:
+            count = sum(
+                BloodPressureMeasurement.objects.using(users.db)
+                .filter(user__in=users, measured_at__lt=before)
+                .count()
+                for users in shards
+            )
+            self.stdout.write(
+                f'Would archive {count} measurement(s) taken before {before:%Y-%m-%d}'
+            )
+            return
+
+        archived = sum(
+            archive_user_measurements(user, before)
+            for users in shards
+            for user in users.iterator()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully archived {archived} measurement(s) taken before {before:%Y-%m-%d}'
+            )
+        )
@@ -0,0 +1,71 @@
+"""
+Management command to checkpoint the SQLite write-ahead log.
+
+In WAL mode SQLite checkpoints automatically, but only when no reader holds
+the log, so under steady traffic the -wal file can keep growing. Run this
+periodically (e.g. as a scheduled task) to copy the log back into the
+database file and, with the default TRUNCATE mode, shrink it to zero. It
+also runs `PRAGMA optimize` to refresh the query planner statistics.
+
+Usage:
+    python manage.py checkpoint_sqlite [--database ALIAS] [--mode TRUNCATE]
+
+Or with uv:
+    uv run manage.py checkpoint_sqlite
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+
+class Command(BaseCommand):
+    help = 'Checkpoint the SQLite write-ahead log of each SQLite database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            type=str,
+            help='Only checkpoint this database alias',
+        )
+        parser.add_argument(
+            '--mode',
+            type=str.upper,
+            choices=CHECKPOINT_MODES,
+            default='TRUNCATE',
+            help='SQLite checkpoint mode (default: TRUNCATE)',
+        )
+
+    def handle(self, *args, **options):
+        aliases = [options['database']] if options.get('database') else list(connections)
+        if options.get('database') and options['database'] not in connections:
+            raise CommandError(f'Unknown database: {options["database"]}')
+
+        checkpointed = 0
+        for alias in aliases:
+            connection = connections[alias]
+            if connection.vendor != 'sqlite':
+                if options.get('database'):
+                    raise CommandError(f'Database {alias} is not SQLite')
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA wal_checkpoint({options["mode"]})')
+                busy, log_pages, checkpointed_pages = cursor.fetchone()
+                cursor.execute('PRAGMA optimize')
+            if busy:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'{alias}: checkpoint blocked by a reader or writer, '
+                        f'{checkpointed_pages} of {log_pages} page(s) copied'
+                    )
+                )
+            else:
+                self.stdout.write(
+                    f'{alias}: {checkpointed_pages} of {log_pages} page(s) checkpointed'
+                )
+            checkpointed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully checkpointed {checkpointed} database(s)')
+        )
@@ -0,0 +1,70 @@
+"""
+Management command to create an API token for a Django user.
+
+The token is printed once and only its hash is stored. Clients send it as
+`Authorization: Bearer <token>`. Revoke a token by deleting it in the admin.
+
+Usage:
+    python manage.py create_api_token USERNAME [--name NAME] [--scopes "read write"] [--expires-days N]
+
+Or with uv:
+    uv run manage.py create_api_token alice --scopes read
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from alice_skill.authentication import create_api_token
+
+SCOPES = ('read', 'write')
+
+
+class Command(BaseCommand):
+    help = 'Create an API token for a user and print it once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', type=str, help='Django username')
+        parser.add_argument(
+            '--name',
+            type=str,
+            default='',
+            help='Label to tell the token apart in the admin',
+        )
+        parser.add_argument(
+            '--scopes',
+            type=str,
+            default='',
+            help='Space-separated scopes out of "read write" (default: all)',
+        )
+        parser.add_argument(
+            '--expires-days',
+            type=int,
+            help='Expire the token after this many days (default: never)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError('User not found')
+        scopes = options['scopes'].split()
+        unknown = set(scopes) - set(SCOPES)
+        if unknown:
+            raise CommandError(f'Unknown scope(s): {", ".join(sorted(unknown))}')
+        expires_at = None
+        if options.get('expires_days') is not None:
+            if options['expires_days'] < 1:
+                raise CommandError('--expires-days must be at least 1')
+            expires_at = timezone.now() + timedelta(days=options['expires_days'])
+
+        token, plaintext = create_api_token(
+            user, name=options['name'], scopes=' '.join(scopes), expires_at=expires_at
+        )
+        self.stdout.write(plaintext)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully created token {token.prefix}... for {user.username}'
+            )
+        )
@@ -0,0 +1,78 @@
+"""
+Management command to move users to the shard their ID hashes to and
+rebuild the shard directory.
+
+Run it after enabling sharding on an existing database or after adding a
+shard to DATABASE_SHARD_URLS. Consistent hashing keeps the number of moved
+users small: adding a shard only moves users onto the new one. A moved
+user's measurements get new IDs, so their change feed starts over.
+
+Usage:
+    python manage.py rebalance_shards [--alice-user-id ID] [--dry-run]
+
+Or with uv:
+    uv run manage.py rebalance_shards
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from alice_skill.models import AliceUser
+from alice_skill.sharding import (
+    move_user,
+    placement_shard,
+    shard_aliases,
+    sharding_enabled,
+    update_directory,
+)
+
+
+class Command(BaseCommand):
+    help = 'Move users to their hashed shard and rebuild the shard directory'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alice-user-id',
+            type=str,
+            help='Only rebalance this Alice user ID',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report which users would move without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        if not sharding_enabled():
+            raise CommandError('Sharding is not enabled, set DATABASE_SHARD_URLS')
+        dry_run = options['dry_run']
+
+        checked = 0
+        moved = set()
+        for alias in shard_aliases():
+            users = (
+                AliceUser.objects.using(alias)
+                .exclude(alice_user_id=None)
+                .exclude(alice_user_id__in=moved)
+                .order_by('pk')
+            )
+            if options.get('alice_user_id'):
+                users = users.filter(alice_user_id=options['alice_user_id'])
+            # Moving deletes from this shard, so the IDs are read up front
+            for pk in list(users.values_list('pk', flat=True)):
+                user = AliceUser.objects.using(alias).get(pk=pk)
+                checked += 1
+                target = placement_shard(user.alice_user_id)
+                if target == alias:
+                    if not dry_run:
+                        update_directory(user, alias)
+                    continue
+                moved.add(user.alice_user_id)
+                if dry_run:
+                    self.stdout.write(f'Would move {user.alice_user_id} from {alias} to {target}')
+                else:
+                    move_user(user, target)
+                    self.stdout.write(f'Moved {user.alice_user_id} from {alias} to {target}')
+
+        if options.get('alice_user_id') and not checked:
+            raise CommandError('User not found')
+        verb = 'Would move' if dry_run else 'Successfully moved'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(moved)} of {checked} user(s)'))
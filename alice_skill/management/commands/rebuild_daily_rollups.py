@@ -0,0 +1,60 @@
+"""
+Management command to rebuild daily measurement rollups from raw measurements.
+
+Run it after bulk imports or direct SQL changes, which bypass the signals
+that keep rollups current.
+
+Usage:
+    python manage.py rebuild_daily_rollups [--alice-user-id ID] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+
+Or with uv:
+    uv run manage.py rebuild_daily_rollups
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from alice_skill.models import AliceUser
+from alice_skill.rollups import rebuild_daily_rollups
+from alice_skill.sharding import on_each_shard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily measurement rollups for a user and local day range'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alice-user-id',
+            type=str,
+            help='Only rebuild rollups for this Alice user ID',
+        )
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='First local day to rebuild (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Last local day to rebuild (YYYY-MM-DD)',
+        )
+
+    def handle(self, *args, **options):
+        start = options.get('start')
+        end = options.get('end')
+        if start and end and start > end:
+            raise CommandError('--start must not be after --end')
+
+        users = AliceUser.objects.order_by('pk')
+        if options.get('alice_user_id'):
+            users = users.filter(alice_user_id=options['alice_user_id'])
+            if not users.exists():
+                raise CommandError('User not found')
+
+        written = sum(
+            rebuild_daily_rollups(users.iterator(), start=start, end=end)
+            for users in on_each_shard(users)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt {written} daily rollup(s)')
+        )
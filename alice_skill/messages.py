@@ -44,9 +44,27 @@ class SerializerMessages(StrEnum):
 
 class ViewMessages(StrEnum):
     USER_NOT_FOUND = "User not found"
+    INVALID_FIELDS = "Unknown fields: {fields}. Allowed fields: {allowed}."
+    INVALID_INTEGER_RANGE = "Must be an integer between {min} and {max}."
+    INVALID_INTEGER_MIN = "Must be an integer of at least {min}."
     UNABLE_TO_IDENTIFY_USER = "Не удалось определить пользователя."
 
 
+class BatchMessages(StrEnum):
+    UNRESOLVED_REFERENCE = "Cannot resolve reference {reference}."
+    PATH_NOT_ALLOWED = "Path {path} cannot be used in a batch."
+    NOT_FOUND = "No API endpoint matches {path}."
+    DUPLICATE_IDS = "Operation ids must be unique."
+
+
+class APITokenMessages(StrEnum):
+    INVALID_HEADER = "Invalid Bearer header. Send a single token without spaces."
+    INVALID_TOKEN = "Invalid token."
+    EXPIRED_TOKEN = "Token has expired."
+    INACTIVE_USER = "User inactive or deleted."
+    MISSING_SCOPE = "Token lacks the {scope} scope."
+
+
 class LinkStatusViewMessages(StrEnum):
     LINKED = "Аккаунты успешно связаны."
     NOT_LINKED = "Аккаунты не связаны."
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+def is_machine_request(request) -> bool:
+    """
+    True for machine-to-machine requests: paths in MACHINE_ENDPOINT_PATHS
+    (the Alice and Telegram webhooks, health probes) and API calls that
+    authenticate with a bot token instead of a session.
+    """
+    path = request.path_info
+    if path.startswith(tuple(getattr(settings, 'MACHINE_ENDPOINT_PATHS', ()))):
+        return True
+    scheme = request.headers.get('Authorization', '').partition(' ')[0]
+    return scheme in getattr(settings, 'MACHINE_AUTH_SCHEMES', ()) and path.startswith(
+        tuple(getattr(settings, 'MACHINE_API_PATHS', ()))
+    )
+
+
+class PathDispatchMiddleware:
+    """
+    Runs BROWSER_MIDDLEWARE (sessions, CSRF, authentication, messages) for
+    browser requests such as the admin and the browsable API, and skips it
+    for machine requests, which go straight to the rest of the stack without
+    loading a session or touching message storage.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.middleware = []
+        handler = get_response
+        for path in reversed(settings.BROWSER_MIDDLEWARE):
+            middleware = import_string(path)(handler)
+            self.middleware.insert(0, middleware)
+            handler = convert_exception_to_response(middleware)
+        self.browser_handler = handler
+
+    def __call__(self, request):
+        request.is_machine_request = is_machine_request(request)
+        if request.is_machine_request:
+            return self.get_response(request)
+        return self.browser_handler(request)
+
+    # The handler only calls these hooks on middleware listed in MIDDLEWARE,
+    # so they are forwarded to the wrapped ones (CSRF checks in process_view)
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.is_machine_request:
+            return None
+        for middleware in self.middleware:
+            if hasattr(middleware, 'process_view'):
+                response = middleware.process_view(request, view_func, view_args, view_kwargs)
+                if response is not None:
+                    return response
+        return None
+
+    def process_exception(self, request, exception):
+        if request.is_machine_request:
+            return None
+        for middleware in reversed(self.middleware):
+            if hasattr(middleware, 'process_exception'):
+                response = middleware.process_exception(request, exception)
+                if response is not None:
+                    return response
+        return None
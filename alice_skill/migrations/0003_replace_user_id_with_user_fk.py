@@ -6,11 +6,12 @@ import django.db.models.deletion
 def populate_user_fk(apps, schema_editor):
     BloodPressureMeasurement = apps.get_model('alice_skill', 'BloodPressureMeasurement')
     AliceUser = apps.get_model('alice_skill', 'AliceUser')
-    first_user = AliceUser.objects.first()
+    db_alias = schema_editor.connection.alias
+    first_user = AliceUser.objects.using(db_alias).first()
 
-    for measurement in BloodPressureMeasurement.objects.all():
+    for measurement in BloodPressureMeasurement.objects.using(db_alias).all():
         try:
-            user = AliceUser.objects.get(alice_user_id=measurement.user_id)
+            user = AliceUser.objects.using(db_alias).get(alice_user_id=measurement.user_id)
             measurement.user_fk = user
             measurement.save()
         except AliceUser.DoesNotExist:
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alice_skill', '0006_alter_accountlinktoken_telegram_user_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMeasurementRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('systolic_sum', models.BigIntegerField(default=0)),
+                ('systolic_sum_sq', models.BigIntegerField(default=0)),
+                ('systolic_min', models.IntegerField(null=True)),
+                ('systolic_max', models.IntegerField(null=True)),
+                ('diastolic_sum', models.BigIntegerField(default=0)),
+                ('diastolic_sum_sq', models.BigIntegerField(default=0)),
+                ('diastolic_min', models.IntegerField(null=True)),
+                ('diastolic_max', models.IntegerField(null=True)),
+                ('pulse_count', models.PositiveIntegerField(default=0)),
+                ('pulse_sum', models.BigIntegerField(default=0)),
+                ('pulse_sum_sq', models.BigIntegerField(default=0)),
+                ('pulse_min', models.IntegerField(null=True)),
+                ('pulse_max', models.IntegerField(null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='alice_skill.aliceuser')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='bp_rollup_user_day_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alice_skill', '0007_dailymeasurementrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeasurementChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('measurement_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=7)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='measurement_changes', to='alice_skill.aliceuser')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['user', 'id'], name='bp_change_user_seq_idx'), models.Index(fields=['measurement_id'], name='bp_change_measurement_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alice_skill', '0008_measurementchange'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bloodpressuremeasurement',
+            name='systolic',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='bloodpressuremeasurement',
+            name='diastolic',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='bloodpressuremeasurement',
+            name='pulse',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bloodpressuremeasurement',
+            index=models.Index(fields=['user', '-measured_at'], include=('systolic', 'diastolic', 'pulse'), name='bp_user_time_cover_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='bloodpressuremeasurement',
+            name='bp_user_time_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='bloodpressuremeasurement',
+            constraint=models.CheckConstraint(condition=models.Q(('systolic__range', (50, 300))), name='bp_systolic_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='bloodpressuremeasurement',
+            constraint=models.CheckConstraint(condition=models.Q(('diastolic__range', (30, 200))), name='bp_diastolic_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='bloodpressuremeasurement',
+            constraint=models.CheckConstraint(condition=models.Q(('pulse__isnull', True), ('pulse__range', (20, 300)), _connector='OR'), name='bp_pulse_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='bloodpressuremeasurement',
+            constraint=models.CheckConstraint(condition=models.Q(('systolic__gt', models.F('diastolic'))), name='bp_systolic_gt_diastolic'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alice_skill', '0009_compact_measurement_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aliceuser',
+            name='archived_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='MeasurementArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('count', models.PositiveIntegerField()),
+                ('first_measured_at', models.DateTimeField()),
+                ('last_measured_at', models.DateTimeField()),
+                ('data', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='measurement_archives', to='alice_skill.aliceuser')),
+            ],
+            options={
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month'), name='bp_archive_user_month_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 15:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alice_skill', '0010_measurementarchive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alice_user_id', models.CharField(max_length=255, unique=True)),
+                ('telegram_user_id_hash', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('django_user_id', models.IntegerField(blank=True, db_index=True, null=True)),
+                ('shard', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Shard',
+                'verbose_name_plural': 'User Shards',
+            },
+        ),
+        migrations.AlterField(
+            model_name='aliceuser',
+            name='user',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,305 @@
+"""
+Django cache backend on a memory-mapped file, shared by every worker
+process on a host without running a cache server.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'alice_skill.mmap_cache.MmapCache',
+            'LOCATION': '/home/user/cache.mmap',
+            'OPTIONS': {'SLOT_COUNT': 4096, 'SLOT_SIZE': 2048},
+        }
+    }
+
+The file is a header followed by SLOT_COUNT fixed-size slots, grouped in
+buckets of BUCKET_SIZE. A key's hash picks its bucket (the hash index) and
+the entry lives in any slot of that bucket; a full bucket evicts its
+expired or least recently used entry. Values that do not fit in a slot
+are not cached. Writers lock their bucket with a POSIX record lock (and a
+process-local lock, since record locks do not exclude threads). Readers
+take no lock: every slot has a sequence counter that writers make odd
+while they change the slot, and a read is retried until it saw the same
+even counter before and after copying the slot.
+"""
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC = b'BPMC'
+VERSION = 1
+HEADER = struct.Struct('<4sIIII')  # magic, version, slot count, slot size, bucket size
+HEADER_SIZE = 64
+# Sequence counter, key hash, expiry (inf = never), key length, value length
+SLOT_HEADER = struct.Struct('<IQdHI')
+SEQ = struct.Struct('<I')
+HASH = struct.Struct('<Q')
+# Last access time, written by readers outside the sequence counter
+ACCESS = struct.Struct('<d')
+ACCESS_OFFSET = 32
+DATA_OFFSET = 40
+READ_RETRIES = 100
+
+# One descriptor, mapping and writer lock per file and process, shared by the
+# per-thread cache instances: closing any descriptor of a file would drop
+# the process's record locks on it, and record locks do not exclude threads.
+_mappings = {}
+_mappings_lock = threading.Lock()
+
+
+def key_hash(key: str) -> int:
+    # 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+
+class MmapCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = location
+        self.slot_size = int(options.get('SLOT_SIZE', 2048))
+        self.bucket_size = int(options.get('BUCKET_SIZE', 8))
+        buckets = math.ceil(int(options.get('SLOT_COUNT', 4096)) / self.bucket_size)
+        self.slot_count = buckets * self.bucket_size
+        self.buckets = buckets
+        self.max_value_size = self.slot_size - DATA_OFFSET
+
+    # Mapping
+
+    def _open(self):
+        layout = (self.path, self.slot_count, self.slot_size, self.bucket_size)
+        mapping = _mappings.get(layout)
+        # A forked worker keeps the parent's mapping but needs its own locks
+        if mapping is None or mapping[0] != os.getpid():
+            with _mappings_lock:
+                mapping = _mappings.get(layout)
+                if mapping is None or mapping[0] != os.getpid():
+                    mapping = _mappings[layout] = self._map_file()
+        _, self._fd, self._map, self._lock = mapping
+
+    def _map_file(self) -> tuple:
+        size = HEADER_SIZE + self.slot_count * self.slot_size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+        try:
+            if os.fstat(fd).st_size == 0:
+                os.ftruncate(fd, size)
+                os.pwrite(
+                    fd,
+                    HEADER.pack(
+                        MAGIC, VERSION, self.slot_count, self.slot_size, self.bucket_size
+                    ),
+                    0,
+                )
+            header = HEADER.unpack(os.pread(fd, HEADER.size, 0))
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+        if header != (MAGIC, VERSION, self.slot_count, self.slot_size, self.bucket_size):
+            os.close(fd)
+            raise ValueError(
+                f'{self.path} has a different cache layout {header[1:]}; remove it '
+                f'or match SLOT_COUNT, SLOT_SIZE and BUCKET_SIZE'
+            )
+        return os.getpid(), fd, mmap.mmap(fd, size), threading.Lock()
+
+    def _slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self.slot_size
+
+    def _bucket_slots(self, hashed: int) -> range:
+        first = (hashed % self.buckets) * self.bucket_size
+        return range(first, first + self.bucket_size)
+
+    # Lock-free reads
+
+    def _read(self, slot: int):
+        """
+        Consistent copy of a slot as (hash, expires, key, value), or None if
+        writers kept changing it.
+        """
+        mapped = self._map
+        offset = self._slot_offset(slot)
+        for _ in range(READ_RETRIES):
+            seq, hashed, expires, key_length, value_length = SLOT_HEADER.unpack_from(
+                mapped, offset
+            )
+            if seq & 1:
+                continue
+            start = offset + DATA_OFFSET
+            data = mapped[start:start + key_length + value_length]
+            if SEQ.unpack_from(mapped, offset)[0] == seq:
+                return hashed, expires, data[:key_length], data[key_length:]
+        return None
+
+    def _find(self, key: str, hashed: int):
+        """Returns (slot, expires, value) of a live entry for `key`, or None."""
+        encoded = key.encode()
+        for slot in self._bucket_slots(hashed):
+            if HASH.unpack_from(self._map, self._slot_offset(slot) + SEQ.size)[0] != hashed:
+                continue
+            entry = self._read(slot)
+            if entry is None or entry[0] != hashed or entry[2] != encoded:
+                continue
+            if entry[1] <= time.time():
+                return None
+            return slot, entry[1], entry[3]
+        return None
+
+    def _touch_access(self, slot: int) -> None:
+        ACCESS.pack_into(self._map, self._slot_offset(slot) + ACCESS_OFFSET, time.time())
+
+    # Locked writes
+
+    def _locked_bucket(self, hashed: int):
+        return _BucketLock(self, (hashed % self.buckets) * self.bucket_size)
+
+    def _write(self, slot: int, hashed: int, expires: float, key: bytes, value: bytes) -> None:
+        mapped = self._map
+        offset = self._slot_offset(slot)
+        writing = (SEQ.unpack_from(mapped, offset)[0] + 1) & 0xFFFFFFFF
+        SEQ.pack_into(mapped, offset, writing)
+        start = offset + DATA_OFFSET
+        mapped[start:start + len(key) + len(value)] = key + value
+        ACCESS.pack_into(mapped, offset + ACCESS_OFFSET, time.time())
+        SLOT_HEADER.pack_into(mapped, offset, writing, hashed, expires, len(key), len(value))
+        SEQ.pack_into(mapped, offset, (writing + 1) & 0xFFFFFFFF)
+
+    def _erase(self, slot: int) -> None:
+        self._write(slot, 0, 0.0, b'', b'')
+
+    def _choose_slot(self, hashed: int) -> int:
+        """Slot for a new entry: an empty or expired one, else the least recently used."""
+        now = time.time()
+        victim, oldest = None, math.inf
+        for slot in self._bucket_slots(hashed):
+            offset = self._slot_offset(slot)
+            _, slot_hash, expires, _, _ = SLOT_HEADER.unpack_from(self._map, offset)
+            if slot_hash == 0 or expires <= now:
+                return slot
+            accessed = ACCESS.unpack_from(self._map, offset + ACCESS_OFFSET)[0]
+            if accessed < oldest:
+                victim, oldest = slot, accessed
+        return victim
+
+    def _store(self, key: str, hashed: int, pickled: bytes, expires: float, found) -> bool:
+        encoded = key.encode()
+        if len(encoded) + len(pickled) > self.max_value_size:
+            if found:
+                self._erase(found[0])
+            return False
+        slot = found[0] if found else self._choose_slot(hashed)
+        self._write(slot, hashed, expires, encoded, pickled)
+        return True
+
+    @staticmethod
+    def _expiry(timeout) -> float:
+        return math.inf if timeout is None else timeout
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        found = self._find(key, key_hash(key))
+        if found is None:
+            return default
+        self._touch_access(found[0])
+        return pickle.loads(found[2])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        hashed = key_hash(key)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        expires = self._expiry(self.get_backend_timeout(timeout))
+        with self._locked_bucket(hashed):
+            self._store(key, hashed, pickled, expires, self._find(key, hashed))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        hashed = key_hash(key)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        expires = self._expiry(self.get_backend_timeout(timeout))
+        with self._locked_bucket(hashed):
+            if self._find(key, hashed) is not None:
+                return False
+            return self._store(key, hashed, pickled, expires, None)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        hashed = key_hash(key)
+        with self._locked_bucket(hashed):
+            found = self._find(key, hashed)
+            if found is None:
+                return False
+            expires = self._expiry(self.get_backend_timeout(timeout))
+            return self._store(key, hashed, found[2], expires, found)
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        hashed = key_hash(key)
+        with self._locked_bucket(hashed):
+            found = self._find(key, hashed)
+            if found is None:
+                raise ValueError("Key '%s' not found" % key)
+            new_value = pickle.loads(found[2]) + delta
+            self._store(
+                key, hashed, pickle.dumps(new_value, self.pickle_protocol), found[1], found
+            )
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        return self._find(key, key_hash(key)) is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._open()
+        hashed = key_hash(key)
+        with self._locked_bucket(hashed):
+            found = self._find(key, hashed)
+            if found is None:
+                return False
+            self._erase(found[0])
+            return True
+
+    def clear(self):
+        self._open()
+        for bucket in range(self.buckets):
+            first = bucket * self.bucket_size
+            with _BucketLock(self, first):
+                for slot in range(first, first + self.bucket_size):
+                    if HASH.unpack_from(self._map, self._slot_offset(slot) + SEQ.size)[0]:
+                        self._erase(slot)
+
+
+class _BucketLock:
+    """Process-local lock plus a POSIX record lock on the bucket's bytes."""
+
+    def __init__(self, cache: MmapCache, first_slot: int):
+        self.cache = cache
+        self.start = cache._slot_offset(first_slot)
+        self.length = cache.bucket_size * cache.slot_size
+
+    def __enter__(self):
+        self.cache._lock.acquire()
+        try:
+            fcntl.lockf(self.cache._fd, fcntl.LOCK_EX, self.length, self.start)
+        except BaseException:
+            self.cache._lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        fcntl.lockf(self.cache._fd, fcntl.LOCK_UN, self.length, self.start)
+        self.cache._lock.release()
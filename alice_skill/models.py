@@ -1,11 +1,121 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.utils import timezone
 
 
+_UNRESOLVED = object()
+
+
+class ShardedQuerySet(models.QuerySet):
+    """
+    Queryset for per-user data that picks the user's shard on its own when
+    sharding is enabled (see `alice_skill.sharding`), so callers filtering
+    by user need no `using()`. The shard comes from the first filter or
+    create that names the user: a user instance, `alice_user_id` or the
+    Telegram hash. Other queries use the default database.
+    """
+
+    def _shard_for(self, lookups):
+        if self._db is not None:
+            return None
+        from .sharding import shard_for_lookups
+
+        return shard_for_lookups(lookups)
+
+    def _filter_or_exclude(self, negate, args, kwargs):
+        clone = super()._filter_or_exclude(negate, args, kwargs)
+        shard = None if negate else self._shard_for(kwargs)
+        if shard is not None:
+            clone._db = shard
+        return clone
+
+    def create(self, **kwargs):
+        shard = self._shard_for(kwargs)
+        if shard is not None:
+            return self.using(shard).create(**kwargs)
+        return super().create(**kwargs)
+
+    def get_or_create(self, defaults=None, **kwargs):
+        shard = self._shard_for(kwargs)
+        if shard is not None:
+            return self.using(shard).get_or_create(defaults, **kwargs)
+        return super().get_or_create(defaults, **kwargs)
+
+    def update_or_create(self, defaults=None, create_defaults=None, **kwargs):
+        shard = self._shard_for(kwargs)
+        if shard is not None:
+            return self.using(shard).update_or_create(defaults, create_defaults, **kwargs)
+        return super().update_or_create(defaults, create_defaults, **kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        if objs and self._db is None:
+            from .sharding import sharding_enabled, shard_for_instance
+
+            if sharding_enabled():
+                return self.using(shard_for_instance(objs[0])).bulk_create(objs, *args, **kwargs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class AliceUserQuerySet(ShardedQuerySet):
+    def for_request(self, request):
+        """
+        Resolves the AliceUser a REST request is scoped to, once per request.
+
+        - Bot requests and superusers: the user given by the `user_id` query parameter.
+        - Other authenticated users: their own linked AliceUser.
+
+        Superusers without `user_id` resolve to their own AliceUser, which only
+        supplies the timezone; their queryset stays unscoped.
+        The result (including None) is memoized on the request, so the queryset,
+        the serializer context and the filters share a single lookup.
+        """
+        alice_user = getattr(request, '_alice_user', _UNRESOLVED)
+        if alice_user is _UNRESOLVED:
+            alice_user = self._resolve_for_request(request)
+            request._alice_user = alice_user
+        return alice_user
+
+    def _resolve_for_request(self, request):
+        user = request.user
+        user_id = request.query_params.get('user_id')
+
+        if getattr(request, 'is_bot', False) or (user.is_superuser and user_id):
+            if not user_id:
+                return None
+            return self.filter(alice_user_id=user_id).first()
+
+        if user.is_authenticated:
+            try:
+                return self.get(user=user)
+            except self.model.DoesNotExist:
+                return None
+
+        return None
+
+    def with_latest_measurement_id(self):
+        """
+        Annotates each user with the primary key of their latest measurement,
+        read through the (user, -measured_at) index.
+        """
+        latest = (
+            BloodPressureMeasurement.objects.filter(user=OuterRef('pk'))
+            .order_by('-measured_at')
+            .values('pk')[:1]
+        )
+        return self.annotate(latest_measurement_id=Subquery(latest))
+
+
 class AliceUser(models.Model):
+    # No database constraint: with sharding the Django user lives on the
+    # default database while the AliceUser may live on another shard
     user = models.ForeignKey(
-        get_user_model(), on_delete=models.CASCADE, null=True, blank=True
+        get_user_model(),
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_constraint=False,
     )
     alice_user_id = models.CharField(
         max_length=255, unique=True, null=True, blank=True, db_index=True
@@ -14,14 +124,23 @@ class AliceUser(models.Model):
         max_length=255, unique=True, null=True, blank=True
     )
     timezone = models.CharField(max_length=50, default='UTC')
+    # Newest measurement moved to MeasurementArchive; reads reaching back this
+    # far merge the archive in
+    archived_until = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AliceUserQuerySet.as_manager()
+
     def __str__(self):
         return f'AliceUser(user={self.user}, alice_user_id={self.alice_user_id}, telegram_user_id_hash={self.telegram_user_id_hash})'
 
 
-class BloodPressureMeasurementQuerySet(models.QuerySet):
+class UserScopedQuerySet(ShardedQuerySet):
+    """
+    Base queryset for per-user data linked to AliceUser through a `user` FK.
+    """
+
     def for_user(self, request):
         """
         Filters the queryset based on the user type and query parameters from the request.
@@ -29,39 +148,39 @@ class BloodPressureMeasurementQuerySet(models.QuerySet):
         user = request.user
         is_bot_request = getattr(request, 'is_bot', False)
 
-        # Case 1: Request is from the bot
-        if is_bot_request:
-            user_id = request.query_params.get('user_id')
-            if user_id:
-                return self.filter(user__alice_user_id=user_id)
-            return self.none()
+        # Case 1: Superuser without a user_id sees everything
+        if user.is_superuser and not is_bot_request:
+            if not request.query_params.get('user_id'):
+                return self
 
-        # Case 2: User is a superuser
-        if user.is_superuser:
-            user_id = request.query_params.get('user_id')
-            if user_id:
-                return self.filter(user__alice_user_id=user_id)
-            return self
-
-        # Case 3: Regular authenticated user
-        if user.is_authenticated:
-            try:
-                alice_user = AliceUser.objects.select_related('user').get(user=user)
+        # Case 2: Bot, superuser with a user_id or regular authenticated user
+        if is_bot_request or user.is_authenticated:
+            alice_user = AliceUser.objects.for_request(request)
+            if alice_user is not None:
                 return self.filter(user=alice_user)
-            except AliceUser.DoesNotExist:
-                return self.none()
+            return self.none()
 
-        # Case 4: Unauthenticated user (and not a bot)
+        # Case 3: Unauthenticated user (and not a bot)
         return self.none()
 
 
+class BloodPressureMeasurementQuerySet(UserScopedQuerySet):
+    pass
+
+
+# Accepted measurement values, enforced by the serializer and check constraints
+SYSTOLIC_RANGE = (50, 300)
+DIASTOLIC_RANGE = (30, 200)
+PULSE_RANGE = (20, 300)
+
+
 class BloodPressureMeasurement(models.Model):
     user = models.ForeignKey(
         AliceUser, on_delete=models.CASCADE, related_name='measurements'
     )
-    systolic = models.IntegerField()
-    diastolic = models.IntegerField()
-    pulse = models.IntegerField(null=True, blank=True)
+    systolic = models.PositiveSmallIntegerField()
+    diastolic = models.PositiveSmallIntegerField()
+    pulse = models.PositiveSmallIntegerField(null=True, blank=True)
     measured_at = models.DateTimeField(default=timezone.now)
 
     objects = BloodPressureMeasurementQuerySet.as_manager()
@@ -69,14 +188,110 @@ class BloodPressureMeasurement(models.Model):
     class Meta:
         ordering = ['-measured_at']
         indexes = [
-            # Composite index for filtering by user and ordering by measured_at
-            models.Index(fields=['user', '-measured_at'], name='bp_user_time_idx'),
+            # Filtering by user and ordering by measured_at. On backends with
+            # covering indexes (PostgreSQL) the values are included, so latest
+            # and list queries are index-only scans.
+            models.Index(
+                fields=['user', '-measured_at'],
+                include=['systolic', 'diastolic', 'pulse'],
+                name='bp_user_time_cover_idx',
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(systolic__range=SYSTOLIC_RANGE),
+                name='bp_systolic_range',
+            ),
+            models.CheckConstraint(
+                condition=models.Q(diastolic__range=DIASTOLIC_RANGE),
+                name='bp_diastolic_range',
+            ),
+            models.CheckConstraint(
+                condition=models.Q(pulse__isnull=True)
+                | models.Q(pulse__range=PULSE_RANGE),
+                name='bp_pulse_range',
+            ),
+            models.CheckConstraint(
+                condition=models.Q(systolic__gt=models.F('diastolic')),
+                name='bp_systolic_gt_diastolic',
+            ),
         ]
 
     def __str__(self):
         return f'BP: {self.systolic}/{self.diastolic} at {self.measured_at.strftime("%Y-%m-%d %H:%M")}'
 
 
+class DailyMeasurementRollup(models.Model):
+    """
+    Per-user daily aggregates of measurements, keyed by the local day in the
+    user's timezone. Kept current by signals and rebuilt with the
+    `rebuild_daily_rollups` command.
+    """
+
+    user = models.ForeignKey(
+        AliceUser, on_delete=models.CASCADE, related_name='daily_rollups'
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    systolic_sum = models.BigIntegerField(default=0)
+    systolic_sum_sq = models.BigIntegerField(default=0)
+    systolic_min = models.IntegerField(null=True)
+    systolic_max = models.IntegerField(null=True)
+    diastolic_sum = models.BigIntegerField(default=0)
+    diastolic_sum_sq = models.BigIntegerField(default=0)
+    diastolic_min = models.IntegerField(null=True)
+    diastolic_max = models.IntegerField(null=True)
+    pulse_count = models.PositiveIntegerField(default=0)
+    pulse_sum = models.BigIntegerField(default=0)
+    pulse_sum_sq = models.BigIntegerField(default=0)
+    pulse_min = models.IntegerField(null=True)
+    pulse_max = models.IntegerField(null=True)
+
+    objects = UserScopedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='bp_rollup_user_day_uniq'),
+        ]
+
+    def __str__(self):
+        return f'Rollup: {self.user_id} {self.day} ({self.count})'
+
+
+class MeasurementChange(models.Model):
+    """
+    Change feed entry for a measurement. The auto-incrementing `id` is the
+    sequence clients sync from; deletes are kept as tombstones. Only the
+    latest entry per user and measurement is kept, so a sync costs one row
+    per changed measurement.
+    """
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = [(CREATED, 'Created'), (UPDATED, 'Updated'), (DELETED, 'Deleted')]
+
+    user = models.ForeignKey(
+        AliceUser, on_delete=models.CASCADE, related_name='measurement_changes'
+    )
+    measurement_id = models.BigIntegerField()
+    action = models.CharField(max_length=7, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    objects = UserScopedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['user', 'id'], name='bp_change_user_seq_idx'),
+            models.Index(fields=['measurement_id'], name='bp_change_measurement_idx'),
+        ]
+
+    def __str__(self):
+        return f'Change #{self.pk}: {self.action} {self.measurement_id}'
+
+
 class AccountLinkToken(models.Model):
     token_hash = models.CharField(max_length=64, unique=True, db_index=True)
     telegram_user_id_hash = models.CharField(max_length=64, db_index=True)
@@ -92,3 +307,88 @@ class AccountLinkToken(models.Model):
         return (
             f'Token for Telegram User {self.telegram_user_id_hash} (Used: {self.used})'
         )
+
+
+class MeasurementArchive(models.Model):
+    """
+    One user's measurements for one UTC month, moved out of the measurement
+    table by the `archive_measurements` command. `data` holds the rows as
+    zlib-compressed parallel arrays (see `alice_skill.archive`).
+    """
+
+    user = models.ForeignKey(
+        AliceUser, on_delete=models.CASCADE, related_name='measurement_archives'
+    )
+    month = models.DateField()
+    count = models.PositiveIntegerField()
+    first_measured_at = models.DateTimeField()
+    last_measured_at = models.DateTimeField()
+    data = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now=True)
+
+    objects = UserScopedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='bp_archive_user_month_uniq'),
+        ]
+
+    def __str__(self):
+        return f'Archive: {self.user_id} {self.month:%Y-%m} ({self.count})'
+
+
+class UserShard(models.Model):
+    """
+    Global directory entry recording which shard holds an AliceUser, so users
+    can be found by Telegram hash or Django user as well as by
+    `alice_user_id`. Kept on the default database and maintained by signals
+    while sharding is enabled; `rebalance_shards` rebuilds it.
+    """
+
+    alice_user_id = models.CharField(max_length=255, unique=True)
+    telegram_user_id_hash = models.CharField(
+        max_length=255, unique=True, null=True, blank=True
+    )
+    django_user_id = models.IntegerField(null=True, blank=True, db_index=True)
+    shard = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'User Shard'
+        verbose_name_plural = 'User Shards'
+
+    def __str__(self):
+        return f'{self.alice_user_id} -> {self.shard}'
+
+
+class APIToken(models.Model):
+    """
+    Personal API token of a Django user, sent as `Authorization: Bearer <token>`.
+    Only the SHA-256 hash of the token is stored; `prefix` identifies it in
+    the admin. Empty `scopes` grants every scope.
+    """
+
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name='api_tokens'
+    )
+    name = models.CharField(max_length=100, blank=True)
+    prefix = models.CharField(max_length=8)
+    token_hash = models.CharField(max_length=64, unique=True)
+    scopes = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'API Token'
+        verbose_name_plural = 'API Tokens'
+
+    def __str__(self):
+        return f'{self.prefix}... for {self.user} ({self.name or "unnamed"})'
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    def has_scope(self, scope: str) -> bool:
+        return not self.scopes or scope in self.scopes.split()
@@ -1,6 +1,9 @@
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import SAFE_METHODS, BasePermission
 from django.conf import settings
 
+from .messages import APITokenMessages
+from .models import APIToken
+
 
 class IsBot(BasePermission):
     """
@@ -36,3 +39,19 @@ class IsAliceWebhook(BasePermission):
             return False
 
         return True
+
+
+class HasTokenScope(BasePermission):
+    """
+    For requests authenticated with an APIToken, requires the `read` scope
+    for safe methods and `write` for the rest. Other requests pass.
+    """
+
+    def has_permission(self, request, view):
+        if not isinstance(request.auth, APIToken):
+            return True
+        scope = "read" if request.method in SAFE_METHODS else "write"
+        if request.auth.has_scope(scope):
+            return True
+        self.message = APITokenMessages.MISSING_SCOPE.format(scope=scope)
+        return False
@@ -0,0 +1,130 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    # Datetimes as DRF writes them (`Z` for UTC); int keys as strings like json
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    LINE_SEPARATORS = (b'\xe2\x80\xa8', b'\xe2\x80\xa9')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer on `orjson` when it is installed, with the same output as
+    DRF's renderer for finite values.
+
+    Datetimes, dates, times, UUIDs, enums (e.g. our `StrEnum` messages) and
+    dict/list subclasses such as `ReturnDict` are encoded natively; other
+    types go through DRF's encoder, so decimals are floats and lazy strings
+    are translated. Indented output (the browsable API, `; indent=4`) and
+    anything orjson rejects, such as integers wider than 64 bits, fall back
+    to the stdlib encoder. Unlike DRF's strict renderer, which fails the
+    response, NaN and infinity are written as null: rejecting them would mean
+    walking every payload, as orjson cannot be told to.
+    """
+
+    def uses_orjson(self, accepted_media_type, renderer_context) -> bool:
+        # orjson only writes compact UTF-8
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.uses_orjson(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep the output a strict javascript subset, as DRF does
+        if LINE_SEPARATORS[0] in ret or LINE_SEPARATORS[1] in ret:
+            ret = ret.replace(LINE_SEPARATORS[0], b'\\u2028').replace(
+                LINE_SEPARATORS[1], b'\\u2029'
+            )
+        return ret
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """
+    Compact JSON for columnar measurement series.
+
+    Selected with `Accept: application/vnd.alicebp.columnar+json` or `?format=columnar`.
+    Views check the `columnar` flag to build column arrays instead of row objects.
+    """
+
+    media_type = 'application/vnd.alicebp.columnar+json'
+    format = 'columnar'
+    compact = True
+    columnar = True
+
+
+class ColumnarMessagePackRenderer(BaseRenderer):
+    """
+    MessagePack encoding of the columnar representation.
+
+    Selected with `Accept: application/vnd.alicebp.columnar+msgpack` or `?format=msgpack`.
+    Requires the optional `msgpack` package.
+    """
+
+    media_type = 'application/vnd.alicebp.columnar+msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    columnar = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=str)
+
+
+def get_columnar_renderers() -> list[type[BaseRenderer]]:
+    """
+    Returns the columnar renderers available in this environment.
+    """
+    renderers = [ColumnarJSONRenderer]
+    if msgpack is not None:
+        renderers.append(ColumnarMessagePackRenderer)
+    return renderers
+
+
+class ChartRenderer(BaseRenderer):
+    """
+    Passes a rendered chart image through unchanged.
+
+    Error payloads are not images, so they are sent as JSON instead.
+    """
+
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, bytes):
+            return data
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = JSONRenderer.media_type
+        return JSONRenderer().render(data)
+
+
+class PNGChartRenderer(ChartRenderer):
+    media_type = 'image/png'
+    format = 'png'
+
+
+class SVGChartRenderer(ChartRenderer):
+    media_type = 'image/svg+xml'
+    format = 'svg'
@@ -0,0 +1,235 @@
+import logging
+import math
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Coalesce, Greatest, Least, TruncDate
+
+from .archive import archived_measurements
+from .cache import bump_data_version_on_commit, get_scopes_for_alice_user
+from .helpers import get_zoneinfo
+from .models import BloodPressureMeasurement, DailyMeasurementRollup, MeasurementArchive
+from .sharding import db_for_user
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('systolic', 'diastolic', 'pulse')
+
+
+def local_day_start(day: date, tz) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=tz)
+
+
+def local_day(measured_at: datetime, tz) -> date:
+    return measured_at.astimezone(tz).date()
+
+
+def _aggregate_expressions() -> dict:
+    expressions = {'count': Count('id'), 'pulse_count': Count('pulse')}
+    for metric in METRICS:
+        expressions[f'{metric}_sum'] = Sum(metric)
+        expressions[f'{metric}_sum_sq'] = Sum(F(metric) * F(metric))
+        expressions[f'{metric}_min'] = Min(metric)
+        expressions[f'{metric}_max'] = Max(metric)
+    return expressions
+
+
+def _empty_aggregates() -> dict:
+    aggregates = {'count': 0, 'pulse_count': 0}
+    for metric in METRICS:
+        for suffix in ('sum', 'sum_sq', 'min', 'max'):
+            aggregates[f'{metric}_{suffix}'] = None
+    return aggregates
+
+
+def _add_records(aggregates: dict, records) -> dict:
+    """
+    Adds measurement records, such as archived ones, to aggregate results.
+    """
+    aggregates = dict(aggregates)
+    for record in records:
+        aggregates['count'] += 1
+        for metric in METRICS:
+            value = record[metric]
+            if value is None:
+                continue
+            if metric == 'pulse':
+                aggregates['pulse_count'] += 1
+            aggregates[f'{metric}_sum'] = (aggregates[f'{metric}_sum'] or 0) + value
+            aggregates[f'{metric}_sum_sq'] = (aggregates[f'{metric}_sum_sq'] or 0) + value * value
+            current_min = aggregates[f'{metric}_min']
+            current_max = aggregates[f'{metric}_max']
+            aggregates[f'{metric}_min'] = value if current_min is None else min(current_min, value)
+            aggregates[f'{metric}_max'] = value if current_max is None else max(current_max, value)
+    return aggregates
+
+
+def _reaches_archive(alice_user, start: datetime | None) -> bool:
+    return alice_user.archived_until is not None and (
+        start is None or start <= alice_user.archived_until
+    )
+
+
+def _rollup_values(aggregates: dict) -> dict:
+    """
+    Maps aggregate results onto rollup fields, turning empty sums into zeros.
+    """
+    values = {'count': aggregates['count'], 'pulse_count': aggregates['pulse_count']}
+    for metric in METRICS:
+        values[f'{metric}_sum'] = aggregates[f'{metric}_sum'] or 0
+        values[f'{metric}_sum_sq'] = aggregates[f'{metric}_sum_sq'] or 0
+        values[f'{metric}_min'] = aggregates[f'{metric}_min']
+        values[f'{metric}_max'] = aggregates[f'{metric}_max']
+    return values
+
+
+def add_measurement(measurement: BloodPressureMeasurement) -> None:
+    """
+    Adds a newly created measurement to its day's rollup.
+    """
+    day = local_day(measurement.measured_at, get_zoneinfo(measurement.user.timezone))
+    values = {
+        'count': 1,
+        'pulse_count': int(measurement.pulse is not None),
+    }
+    for metric in METRICS:
+        value = getattr(measurement, metric)
+        values[f'{metric}_sum'] = value or 0
+        values[f'{metric}_sum_sq'] = (value or 0) ** 2
+        values[f'{metric}_min'] = value
+        values[f'{metric}_max'] = value
+
+    rollup, created = DailyMeasurementRollup.objects.get_or_create(
+        user=measurement.user, day=day, defaults=values
+    )
+    if created:
+        return
+
+    updates = {'count': F('count') + 1}
+    for metric in METRICS:
+        value = getattr(measurement, metric)
+        if value is None:
+            continue
+        updates[f'{metric}_sum'] = F(f'{metric}_sum') + value
+        updates[f'{metric}_sum_sq'] = F(f'{metric}_sum_sq') + value * value
+        updates[f'{metric}_min'] = Least(Coalesce(f'{metric}_min', value), value)
+        updates[f'{metric}_max'] = Greatest(Coalesce(f'{metric}_max', value), value)
+    if measurement.pulse is not None:
+        updates['pulse_count'] = F('pulse_count') + 1
+    DailyMeasurementRollup.objects.using(rollup._state.db).filter(pk=rollup.pk).update(
+        **updates
+    )
+
+
+def recompute_day(alice_user, day: date) -> None:
+    """
+    Recomputes one user's rollup for a local day from the raw and archived
+    measurements. Used for updates and deletes, where minimum and maximum
+    cannot be adjusted in place.
+    """
+    tz = get_zoneinfo(alice_user.timezone)
+    day_start = local_day_start(day, tz)
+    day_end = local_day_start(day + timedelta(days=1), tz)
+    aggregates = BloodPressureMeasurement.objects.filter(
+        user=alice_user, measured_at__gte=day_start, measured_at__lt=day_end
+    ).aggregate(**_aggregate_expressions())
+    if _reaches_archive(alice_user, day_start):
+        archives = MeasurementArchive.objects.filter(user=alice_user)
+        aggregates = _add_records(
+            aggregates, archived_measurements(archives, day_start, day_end)
+        )
+
+    if not aggregates['count']:
+        DailyMeasurementRollup.objects.filter(user=alice_user, day=day).delete()
+        return
+    DailyMeasurementRollup.objects.update_or_create(
+        user=alice_user, day=day, defaults=_rollup_values(aggregates)
+    )
+
+
+def recompute_measurement_day(alice_user, measured_at: datetime) -> None:
+    recompute_day(alice_user, local_day(measured_at, get_zoneinfo(alice_user.timezone)))
+
+
+def rebuild_daily_rollups(users, start: date | None = None, end: date | None = None) -> int:
+    """
+    Rebuilds rollups for the given AliceUsers, optionally limited to a local day range.
+    Each user's data version is bumped once their rebuild commits, so cached
+    stats built from the old rollups are not served.
+    Returns the number of rollup rows written.
+    """
+    written = 0
+    for alice_user in users:
+        tz = get_zoneinfo(alice_user.timezone)
+        range_start = local_day_start(start, tz) if start else None
+        range_end = local_day_start(end + timedelta(days=1), tz) if end else None
+        measurements = BloodPressureMeasurement.objects.filter(user=alice_user)
+        rollups = DailyMeasurementRollup.objects.filter(user=alice_user)
+        if start:
+            measurements = measurements.filter(measured_at__gte=range_start)
+            rollups = rollups.filter(day__gte=start)
+        if end:
+            measurements = measurements.filter(measured_at__lt=range_end)
+            rollups = rollups.filter(day__lte=end)
+
+        daily = (
+            measurements.annotate(day=TruncDate('measured_at', tzinfo=tz))
+            .values('day')
+            .annotate(**_aggregate_expressions())
+            .order_by('day')
+        )
+        by_day = {row.pop('day'): row for row in daily}
+        if _reaches_archive(alice_user, range_start):
+            archives = MeasurementArchive.objects.filter(user=alice_user)
+            records = archived_measurements(archives, range_start, range_end)
+            for day, day_records in groupby(
+                records, key=lambda record: local_day(record['measured_at'], tz)
+            ):
+                by_day[day] = _add_records(by_day.get(day, _empty_aggregates()), day_records)
+        new_rollups = [
+            DailyMeasurementRollup(user=alice_user, day=day, **_rollup_values(row))
+            for day, row in sorted(by_day.items())
+        ]
+        using = db_for_user(alice_user)
+        with transaction.atomic(using=using):
+            rollups.using(using).delete()
+            DailyMeasurementRollup.objects.using(using).bulk_create(new_rollups)
+            bump_data_version_on_commit(*get_scopes_for_alice_user(alice_user), using=using)
+        written += len(new_rollups)
+        logger.debug(
+            'Rebuilt %d daily rollups for user %s', len(new_rollups), alice_user.alice_user_id
+        )
+    return written
+
+
+def summarize_rollups(rollups) -> dict:
+    """
+    Aggregates daily rollups into count, average, standard deviation, minimum
+    and maximum for each metric.
+    """
+    expressions = {'count': Sum('count'), 'days': Count('id'), 'pulse_count': Sum('pulse_count')}
+    for metric in METRICS:
+        expressions[f'{metric}_sum'] = Sum(f'{metric}_sum')
+        expressions[f'{metric}_sum_sq'] = Sum(f'{metric}_sum_sq')
+        expressions[f'{metric}_min'] = Min(f'{metric}_min')
+        expressions[f'{metric}_max'] = Max(f'{metric}_max')
+    totals = rollups.order_by().aggregate(**expressions)
+
+    count = totals['count'] or 0
+    summary = {'count': count, 'days': totals['days']}
+    for metric in METRICS:
+        n = totals['pulse_count'] if metric == 'pulse' else count
+        if not n:
+            summary[metric] = None
+            continue
+        avg = totals[f'{metric}_sum'] / n
+        variance = max(totals[f'{metric}_sum_sq'] / n - avg * avg, 0)
+        summary[metric] = {
+            'avg': round(avg, 1),
+            'stddev': round(math.sqrt(variance), 1),
+            'min': totals[f'{metric}_min'],
+            'max': totals[f'{metric}_max'],
+        }
+    return summary
@@ -1,10 +1,19 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from rest_framework import serializers
 
-from .messages import SerializerMessages
+from .batch import MAX_BATCH_OPERATIONS
+from .messages import BatchMessages, SerializerMessages
 
-from .models import BloodPressureMeasurement, AliceUser
+from .models import (
+    DIASTOLIC_RANGE,
+    PULSE_RANGE,
+    SYSTOLIC_RANGE,
+    AliceUser,
+    BloodPressureMeasurement,
+)
+from .sharding import sharding_enabled
 
 
 class AliceUserSerializer(serializers.ModelSerializer):
@@ -20,15 +29,59 @@ class GenerateLinkTokenRequestSerializer(serializers.Serializer):
     telegram_user_id = serializers.CharField(max_length=64)
 
 
+class BulkUserLookupRequestSerializer(serializers.Serializer):
+    MAX_TELEGRAM_USER_IDS = 1000
+
+    telegram_user_ids = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        allow_empty=False,
+        max_length=MAX_TELEGRAM_USER_IDS,
+    )
+    include_latest = serializers.BooleanField(default=False)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    id = serializers.RegexField(r"^[A-Za-z0-9_\-]+$", max_length=64, required=False)
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.CharField(max_length=2048)
+    params = serializers.DictField(required=False)
+    body = serializers.JSONField(required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    operations = serializers.ListField(
+        child=BatchOperationSerializer(), allow_empty=False, max_length=MAX_BATCH_OPERATIONS
+    )
+
+    def validate_operations(self, operations):
+        ids = [operation["id"] for operation in operations if "id" in operation]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(BatchMessages.DUPLICATE_IDS)
+        return operations
+
+
+class AliceUserField(serializers.PrimaryKeyRelatedField):
+    """
+    With sharding, primary keys are only unique within a shard, so the user
+    is looked up on the shard of the user the request is scoped to.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get("request")
+        if sharding_enabled() and request is not None:
+            alice_user = AliceUser.objects.for_request(request)
+            if alice_user is not None:
+                queryset = queryset.using(alice_user._state.db)
+        return queryset
+
+
 class BloodPressureMeasurementSerializer(serializers.ModelSerializer):
-    user = serializers.PrimaryKeyRelatedField(queryset=AliceUser.objects.all())
+    user = AliceUserField(queryset=AliceUser.objects.all())
     measured_at = serializers.DateTimeField(format="%Y-%m-%dT%H:%M:%S%z", required=False, allow_null=True)
-    MIN_SYSTOLIC = 50
-    MAX_SYSTOLIC = 300
-    MIN_DIASTOLIC = 30
-    MAX_DIASTOLIC = 200
-    MIN_PULSE = 20
-    MAX_PULSE = 300
+    MIN_SYSTOLIC, MAX_SYSTOLIC = SYSTOLIC_RANGE
+    MIN_DIASTOLIC, MAX_DIASTOLIC = DIASTOLIC_RANGE
+    MIN_PULSE, MAX_PULSE = PULSE_RANGE
 
     def validate_systolic(self, value):
         if not (self.MIN_SYSTOLIC <= value <= self.MAX_SYSTOLIC):
@@ -58,6 +111,16 @@ class BloodPressureMeasurementSerializer(serializers.ModelSerializer):
             )
         return attrs
 
+    def get_fields(self):
+        """
+        Restricts the output to the sparse fieldset requested in context, if any.
+        """
+        fields = super().get_fields()
+        requested = self.context.get("fields")
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields
+
     def to_representation(self, instance):
         """
         Convert `measured_at` to user's timezone if available in context.
@@ -66,7 +129,7 @@ class BloodPressureMeasurementSerializer(serializers.ModelSerializer):
         tz_str = self.context.get("timezone")
 
         # Handle timezone conversion - tz_str should be a non-empty string
-        if tz_str and tz_str.strip():
+        if tz_str and tz_str.strip() and "measured_at" in representation:
             try:
                 tz = ZoneInfo(tz_str.strip())
                 measured_at_dt = instance.measured_at
@@ -83,6 +146,109 @@ class BloodPressureMeasurementSerializer(serializers.ModelSerializer):
         fields = ["user", "systolic", "diastolic", "pulse", "measured_at"]
 
 
+class MeasurementRowSerializer:
+    """
+    Read-only fast path for measurement lists.
+
+    Builds the same rows as `BloodPressureMeasurementSerializer` from
+    `values_list` tuples, skipping DRF field machinery. The timezone is
+    resolved once per instance and UTC offsets are cached per hour.
+    """
+
+    FIELD_SOURCES = {
+        "user": "user_id",
+        "systolic": "systolic",
+        "diastolic": "diastolic",
+        "pulse": "pulse",
+        "measured_at": "measured_at",
+    }
+    fields = tuple(FIELD_SOURCES)
+    value_fields = tuple(FIELD_SOURCES.values())
+
+    def __init__(self, tz_str: str | None = None, fields=None):
+        if fields:
+            self.fields = tuple(name for name in self.FIELD_SOURCES if name in fields)
+            self.value_fields = tuple(self.FIELD_SOURCES[name] for name in self.fields)
+        self._has_measured_at = "measured_at" in self.fields
+        self.tz = None
+        if tz_str and tz_str.strip():
+            try:
+                self.tz = ZoneInfo(tz_str.strip())
+            except ZoneInfoNotFoundError:
+                # Invalid timezone, use default serialization (UTC)
+                pass
+        self._default_field = BloodPressureMeasurementSerializer().fields["measured_at"]
+        self._offsets: dict[datetime, tuple[timedelta, str] | None] = {}
+
+    def _hour_offset(self, hour: datetime) -> tuple[timedelta, str] | None:
+        """
+        Returns the UTC offset and its ISO suffix for a whole UTC hour, or
+        None if a DST transition falls inside that hour.
+        """
+        if hour not in self._offsets:
+            offset = hour.astimezone(self.tz).utcoffset()
+            last_offset = (hour + timedelta(hours=1, microseconds=-1)).astimezone(
+                self.tz
+            ).utcoffset()
+            if offset == last_offset:
+                suffix = datetime(2000, 1, 1, tzinfo=dt_timezone(offset)).isoformat()[19:]
+                self._offsets[hour] = (offset, suffix)
+            else:
+                self._offsets[hour] = None
+        return self._offsets[hour]
+
+    def format_measured_at(self, value: datetime | None) -> str | None:
+        if value is None or self.tz is None:
+            return self._default_field.to_representation(value)
+
+        if value.tzinfo is not dt_timezone.utc:
+            value = value.astimezone(dt_timezone.utc)
+        cached = self._hour_offset(value.replace(minute=0, second=0, microsecond=0))
+        if cached is None:
+            return value.astimezone(self.tz).isoformat()
+        offset, suffix = cached
+        return (value + offset).replace(tzinfo=None).isoformat() + suffix
+
+    def to_representation(self, row: tuple) -> dict:
+        item = dict(zip(self.fields, row))
+        if self._has_measured_at:
+            item["measured_at"] = self.format_measured_at(item["measured_at"])
+        return item
+
+    def many(self, rows) -> list[dict]:
+        return [self.to_representation(row) for row in rows]
+
+
+class MeasurementColumnSerializer(MeasurementRowSerializer):
+    """
+    Compact columnar representation of a measurement series.
+
+    Values are returned as parallel column arrays with `measured_at` in epoch
+    seconds. The timezone and a `user` shared by every row are moved to the
+    top level instead of being repeated per row.
+    """
+
+    def to_columns(self, rows) -> dict:
+        columns = dict(zip(self.fields, map(list, zip(*rows)))) if rows else {
+            name: [] for name in self.fields
+        }
+        data = {"timezone": self.tz.key if self.tz else "UTC"}
+
+        users = columns.get("user")
+        if users and users.count(users[0]) == len(users):
+            data["user"] = users[0]
+            del columns["user"]
+
+        if "measured_at" in columns:
+            columns["measured_at"] = [
+                int(value.timestamp()) for value in columns["measured_at"]
+            ]
+
+        data["fields"] = list(columns)
+        data["columns"] = columns
+        return data
+
+
 class NLUObjectSerializer(serializers.Serializer):
     tokens = serializers.ListField(child=serializers.CharField(), required=False, default=list())
 
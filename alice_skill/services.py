@@ -3,8 +3,13 @@ import re
 import secrets
 import hmac
 from . import messages
-from .helpers import get_hashed_telegram_id, replace_latin_homoglyphs
-from .models import AliceUser, AccountLinkToken
+from .db_connections import connection_metrics, connection_metrics_enabled, is_database_locked
+from .db_router import replica_configured, replica_health
+from .helpers import get_hashed_telegram_id, get_hashed_telegram_ids, replace_latin_homoglyphs
+from .hot_cache import get_hot_cache
+from .models import AliceUser, AccountLinkToken, BloodPressureMeasurement
+from .serializers import MeasurementRowSerializer
+from .sharding import shards_for_telegram_hashes
 from .wordlist import WORDLIST
 from django.conf import settings
 from django.utils import timezone
@@ -145,7 +150,8 @@ def match_webhook_to_telegram_user(webhook_json: dict) -> str | None:
     telegram_user_id_hash = account_link_token.telegram_user_id_hash
 
     user, _ = AliceUser.objects.get_or_create(alice_user_id=alice_user_id)
-    AliceUser.objects.filter(telegram_user_id_hash=telegram_user_id_hash).exclude(pk=user.pk).update(telegram_user_id_hash=None)
+    # The previous holder may be on another shard, where the primary key means nothing
+    AliceUser.objects.filter(telegram_user_id_hash=telegram_user_id_hash).exclude(alice_user_id=alice_user_id).update(telegram_user_id_hash=None)
     user.telegram_user_id_hash = telegram_user_id_hash
     user.save()
 
@@ -168,6 +174,66 @@ def get_alice_user(alice_user_id: str = None, telegram_user_id: str = None) -> A
     return user
 
 
+def bulk_lookup_users(telegram_user_ids: list[str], include_latest: bool = False) -> dict:
+    """
+    Resolves many Telegram users with one query instead of one request per user.
+    Optionally attaches each user's latest measurement, fetched with one more query.
+    Results keep the order of `telegram_user_ids`; unknown IDs are listed in `not_found`.
+    With sharding, the queries run once per shard holding any of the users.
+    """
+    hashed_ids = get_hashed_telegram_ids(dict.fromkeys(telegram_user_ids))
+    users_by_telegram_id = {}
+    latest = {}
+    for using, hashes in shards_for_telegram_hashes(hashed_ids).items():
+        users = AliceUser.objects.using(using).filter(telegram_user_id_hash__in=hashes)
+        if include_latest:
+            users = users.with_latest_measurement_id()
+        shard_users = {hashed_ids[user.telegram_user_id_hash]: user for user in users}
+        users_by_telegram_id.update(shard_users)
+
+        if include_latest:
+            latest_ids = [u.latest_measurement_id for u in shard_users.values()]
+            shard_latest = BloodPressureMeasurement.objects.using(using).in_bulk(
+                [pk for pk in latest_ids if pk is not None]
+            )
+            # Primary keys are only unique within a shard
+            latest.update(
+                (user.telegram_user_id_hash, shard_latest.get(user.latest_measurement_id))
+                for user in shard_users.values()
+            )
+    serializers_by_timezone = {}
+
+    results = []
+    not_found = []
+    for telegram_user_id in hashed_ids.values():
+        user = users_by_telegram_id.get(telegram_user_id)
+        if user is None:
+            not_found.append(telegram_user_id)
+            continue
+        item = {
+            "telegram_user_id": telegram_user_id,
+            "id": user.pk,
+            "alice_user_id": user.alice_user_id,
+            "telegram_user_id_hash": user.telegram_user_id_hash,
+            "timezone": user.timezone,
+        }
+        if include_latest:
+            measurement = latest.get(user.telegram_user_id_hash)
+            if measurement is None:
+                item["latest_measurement"] = None
+            else:
+                if user.timezone not in serializers_by_timezone:
+                    serializers_by_timezone[user.timezone] = MeasurementRowSerializer(
+                        user.timezone, fields=("systolic", "diastolic", "pulse", "measured_at")
+                    )
+                serializer = serializers_by_timezone[user.timezone]
+                item["latest_measurement"] = serializer.to_representation(
+                    tuple(getattr(measurement, field) for field in serializer.value_fields)
+                )
+        results.append(item)
+    return {"results": results, "not_found": not_found}
+
+
 def process_alice_request(handlers: list, validated_request: dict) -> str | None:
     """
     Iterates through handlers to process an Alice request and returns a response text.
@@ -177,8 +243,11 @@ def process_alice_request(handlers: list, validated_request: dict) -> str | None
         try:
             response_text = handler.handle(validated_request)
         except Exception as e:
+            if is_database_locked(e):
+                # Transient, the caller retries the whole request
+                raise
             logger.exception(
-                f'Handler raised an exception:\n {e};\n...continuing to next handler'
+                'Handler raised an exception:\n %s;\n...continuing to next handler', e
             )
             continue
         if response_text:
@@ -193,7 +262,16 @@ def check_health():
     """
     try:
         connection.ensure_connection()
-        return {'status': 'healthy', 'database': 'connected'}
+        health = {'status': 'healthy', 'database': 'connected'}
+        hot_cache = get_hot_cache()
+        if hot_cache is not None:
+            health['hot_cache'] = hot_cache.stats()
+        if connection_metrics_enabled():
+            health['connections'] = connection_metrics.stats()
+        if replica_configured():
+            # A failing replica only degrades reads to the primary
+            health['replica'] = 'connected' if replica_health.is_healthy() else 'disconnected'
+        return health
     except OperationalError as e:
-        logger.error(f'Health check failed: {e}')
+        logger.error('Health check failed: %s', e)
         return {'status': 'unhealthy', 'database': 'disconnected', 'error': str(e)}
@@ -0,0 +1,280 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+
+from .cache import get_measurement_cache
+from .models import (
+    AliceUser,
+    BloodPressureMeasurement,
+    DailyMeasurementRollup,
+    MeasurementArchive,
+    UserShard,
+)
+
+logger = logging.getLogger(__name__)
+
+SHARD_KEY_PREFIX = 'bp:shard'
+# Models whose rows live on the owning user's shard; everything else,
+# including the other alice_skill models, stays on the default database
+SHARDED_MODELS = {
+    'aliceuser',
+    'bloodpressuremeasurement',
+    'dailymeasurementrollup',
+    'measurementchange',
+    'measurementarchive',
+}
+# Per-user rows copied when a user moves. Change feed entries are not
+# copied: measurement ids change, so clients resync from scratch.
+MOVED_MODELS = (BloodPressureMeasurement, DailyMeasurementRollup, MeasurementArchive)
+
+
+def shard_aliases() -> list[str]:
+    return getattr(settings, 'DATABASE_SHARDS', [DEFAULT_DB_ALIAS])
+
+
+def sharding_enabled() -> bool:
+    return len(shard_aliases()) > 1
+
+
+def is_sharded(model) -> bool:
+    return model._meta.app_label == 'alice_skill' and model._meta.model_name in SHARDED_MODELS
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping & Veach): going from N to N+1 buckets only
+    moves about 1/(N+1) of the keys, all of them to the new bucket.
+    """
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) % 2**64
+        candidate = int((bucket + 1) * (2**31 / ((key >> 33) + 1)))
+    return bucket
+
+
+def placement_shard(alice_user_id: str | None) -> str:
+    """
+    Returns the shard a user belongs on by the stable hash of their ID.
+    """
+    aliases = shard_aliases()
+    if not alice_user_id:
+        return aliases[0]
+    digest = hashlib.blake2b(alice_user_id.encode(), digest_size=8).digest()
+    return aliases[jump_hash(int.from_bytes(digest, 'big'), len(aliases))]
+
+
+def _directory_lookup(field: str, value) -> str | None:
+    cache = get_measurement_cache()
+    key = f'{SHARD_KEY_PREFIX}:{field}:{value}'
+    shard = cache.get(key)
+    if shard is None:
+        shard = (
+            UserShard.objects.filter(**{field: value}).values_list('shard', flat=True).first()
+        )
+        if shard is not None:
+            cache.set(key, shard, getattr(settings, 'SHARD_DIRECTORY_CACHE_SECONDS', 300))
+    return shard
+
+
+def _forget_directory_keys(*entries: tuple[str, object]) -> None:
+    get_measurement_cache().delete_many(
+        [f'{SHARD_KEY_PREFIX}:{field}:{value}' for field, value in entries if value is not None]
+    )
+
+
+def shard_for_alice_user_id(alice_user_id: str | None) -> str:
+    """
+    Returns the shard holding the user, or where a new user is placed.
+    """
+    if alice_user_id:
+        shard = _directory_lookup('alice_user_id', alice_user_id)
+        if shard in shard_aliases():
+            return shard
+    return placement_shard(alice_user_id)
+
+
+def shard_for_telegram_hash(telegram_user_id_hash: str) -> str | None:
+    return _directory_lookup('telegram_user_id_hash', telegram_user_id_hash)
+
+
+def shards_for_telegram_hashes(hashes) -> dict[str | None, list[str]]:
+    """
+    Groups Telegram hashes by the shard holding their users, with one
+    directory query. Without sharding everything is under `None`, which
+    keeps the usual routing.
+    """
+    hashes = list(hashes)
+    if not sharding_enabled():
+        return {None: hashes}
+    groups = {}
+    for telegram_user_id_hash, shard in UserShard.objects.filter(
+        telegram_user_id_hash__in=hashes
+    ).values_list('telegram_user_id_hash', 'shard'):
+        groups.setdefault(shard, []).append(telegram_user_id_hash)
+    return groups
+
+
+def shard_for_instance(instance) -> str | None:
+    """
+    Returns the shard of an AliceUser, a Django user or a per-user row, or
+    None when it cannot be told.
+    """
+    if isinstance(instance, AliceUser):
+        if not instance._state.adding and instance._state.db in shard_aliases():
+            return instance._state.db
+        return shard_for_alice_user_id(instance.alice_user_id)
+    if isinstance(instance, get_user_model()):
+        return _directory_lookup('django_user_id', instance.pk) if instance.pk else None
+    if is_sharded(type(instance)):
+        user = type(instance)._meta.get_field('user').get_cached_value(instance, None)
+        if user is not None:
+            return shard_for_instance(user)
+        if not instance._state.adding:
+            return instance._state.db
+    return None
+
+
+def shard_for_lookups(lookups: dict) -> str | None:
+    """
+    Picks the shard from queryset lookups naming a user (see `ShardedQuerySet`).
+    """
+    if not sharding_enabled():
+        return None
+    for name, value in lookups.items():
+        if value is None:
+            continue
+        if name in ('user', 'user__exact') and hasattr(value, '_state'):
+            return shard_for_instance(value)
+        if name in ('alice_user_id', 'user__alice_user_id'):
+            return shard_for_alice_user_id(value)
+        if name in ('telegram_user_id_hash', 'user__telegram_user_id_hash'):
+            return shard_for_telegram_hash(value)
+    return None
+
+
+def on_each_shard(queryset) -> list:
+    """
+    Returns the queryset once per shard, or as is when it is already bound
+    to one (for example by a filter on `alice_user_id`) or sharding is off.
+    """
+    if not sharding_enabled() or queryset._db is not None:
+        return [queryset]
+    return [queryset.using(alias) for alias in shard_aliases()]
+
+
+def db_for_user(alice_user) -> str:
+    """
+    Returns the database writes of the user's data go to.
+    """
+    return router.db_for_write(AliceUser, instance=alice_user)
+
+
+def update_directory(alice_user, shard: str) -> None:
+    """
+    Records the user's shard and keys in the directory, taking the Telegram
+    hash over from any other entry.
+    """
+    entry = UserShard.objects.filter(alice_user_id=alice_user.alice_user_id).first()
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        if alice_user.telegram_user_id_hash:
+            UserShard.objects.filter(
+                telegram_user_id_hash=alice_user.telegram_user_id_hash
+            ).exclude(alice_user_id=alice_user.alice_user_id).update(telegram_user_id_hash=None)
+        UserShard.objects.update_or_create(
+            alice_user_id=alice_user.alice_user_id,
+            defaults={
+                'telegram_user_id_hash': alice_user.telegram_user_id_hash,
+                'django_user_id': alice_user.user_id,
+                'shard': shard,
+            },
+        )
+    _forget_directory_keys(
+        ('alice_user_id', alice_user.alice_user_id),
+        ('telegram_user_id_hash', alice_user.telegram_user_id_hash),
+        ('django_user_id', alice_user.user_id),
+        ('telegram_user_id_hash', entry and entry.telegram_user_id_hash),
+        ('django_user_id', entry and entry.django_user_id),
+    )
+
+
+def remove_from_directory(alice_user, shard: str) -> None:
+    # A user deleted from its old shard after a move keeps its new entry
+    UserShard.objects.filter(alice_user_id=alice_user.alice_user_id, shard=shard).delete()
+    _forget_directory_keys(
+        ('alice_user_id', alice_user.alice_user_id),
+        ('telegram_user_id_hash', alice_user.telegram_user_id_hash),
+        ('django_user_id', alice_user.user_id),
+    )
+
+
+def move_user(alice_user, target: str) -> AliceUser:
+    """
+    Copies a user and their measurements, rollups and archives to `target`,
+    points the directory there and deletes them from their current shard.
+    The source user row is locked meanwhile, so concurrent writes wait and
+    then fail rather than being lost. Measurements get new IDs on the target.
+    """
+    source = alice_user._state.db
+    with transaction.atomic(using=source), transaction.atomic(using=target):
+        user = AliceUser.objects.using(source).select_for_update().get(pk=alice_user.pk)
+        fields = {
+            field.attname: getattr(user, field.attname)
+            for field in AliceUser._meta.concrete_fields
+            if not field.primary_key
+        }
+        moved = AliceUser(**fields)
+        moved.save(using=target)
+        for model in MOVED_MODELS:
+            rows = [
+                model(
+                    user=moved,
+                    **{
+                        field.attname: getattr(row, field.attname)
+                        for field in model._meta.concrete_fields
+                        if not field.primary_key and field.name != 'user'
+                    },
+                )
+                for row in model.objects.using(source).filter(user=user)
+            ]
+            model.objects.using(target).bulk_create(rows)
+        # Keeps the `auto_now` timestamps of the source rows
+        AliceUser.objects.using(target).filter(pk=moved.pk).update(
+            created_at=user.created_at, updated_at=user.updated_at
+        )
+        user.delete()
+    logger.info('Moved user %s from %s to %s', user.alice_user_id, source, target)
+    return moved
+
+
+class ShardRouter:
+    """
+    Sends per-user models to the shard of the user involved: the user named
+    by the instance hint (related lookups and saves) or picked by
+    `ShardedQuerySet`. Global models always use the default database.
+    """
+
+    def _db_for(self, model, **hints):
+        if not is_sharded(model):
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        return shard_for_instance(instance) if instance is not None else None
+
+    db_for_read = _db_for
+    db_for_write = _db_for
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not (is_sharded(type(obj1)) and is_sharded(type(obj2))):
+            # AliceUser.user points from a shard to the default database
+            return True
+        if obj1._state.adding or obj2._state.adding:
+            return True
+        return obj1._state.db == obj2._state.db
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == 'alice_skill' and model_name == 'usershard':
+            return db == DEFAULT_DB_ALIAS
+        return None
@@ -0,0 +1,275 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .archive import is_archiving
+from .authentication import forget_api_tokens
+from .cache import (
+    alice_user_scope,
+    bump_data_version,
+    bump_data_version_on_commit,
+    django_user_scope,
+    get_data_version,
+    get_scopes_for_alice_user,
+    telegram_scope,
+)
+from .changes import record_change
+from .db_connections import (
+    apply_sqlite_pragmas,
+    connect_duration,
+    connection_metrics,
+    connection_metrics_enabled,
+)
+from .db_router import mark_recent_write
+from .hot_cache import get_hot_cache
+from .models import AliceUser, APIToken, BloodPressureMeasurement, MeasurementChange
+from .rollups import (
+    add_measurement,
+    rebuild_daily_rollups,
+    recompute_measurement_day,
+)
+from .sharding import remove_from_directory, sharding_enabled, update_directory
+
+
+def _is_cascade_delete(kwargs) -> bool:
+    """
+    Deleting an AliceUser (or its Django user) cascades to its measurements.
+    Per-row work is pointless then, since the AliceUser's own signal covers it.
+    """
+    origin = kwargs.get('origin')
+    if origin is None or isinstance(origin, BloodPressureMeasurement):
+        return False
+    return getattr(origin, 'model', None) is not BloodPressureMeasurement
+
+
+def _is_new_reading(instance, created, raw) -> bool:
+    """
+    True for a saved measurement that is appended to the hot cache rather
+    than invalidating it.
+    """
+    return not raw and (created or getattr(instance, '_rollup_previous', None) is None)
+
+
+def _record_created(hot_cache, measurement, scopes) -> None:
+    """
+    Bumps the owner's data version and appends the new reading to the hot
+    cache as one step. The entry only takes over the new version if it was
+    at the version read right before the bump; a bump by another process in
+    between drops it instead.
+    """
+    scope = alice_user_scope(measurement.user)
+    expected_version = get_data_version(scope)
+    versions = bump_data_version(*scopes)
+    hot_cache.record_created(measurement, expected_version, versions[scope])
+
+
+@receiver(post_save, sender=BloodPressureMeasurement)
+@receiver(post_delete, sender=BloodPressureMeasurement)
+def measurement_changed(sender, instance, using=None, **kwargs):
+    """
+    Bumps the owner's data version once every measurement write commits and
+    keeps the owner's reads on the primary for the read-your-writes window.
+    New readings are appended to the hot cache in the same step, if enabled.
+    Archiving does both once for the whole batch instead.
+    """
+    if _is_cascade_delete(kwargs) or is_archiving():
+        return
+    scopes = get_scopes_for_alice_user(instance.user)
+    hot_cache = get_hot_cache()
+    if (
+        hot_cache is not None
+        and 'created' in kwargs
+        and _is_new_reading(instance, kwargs['created'], kwargs.get('raw', False))
+    ):
+        transaction.on_commit(partial(_record_created, hot_cache, instance, scopes), using=using)
+    else:
+        bump_data_version_on_commit(*scopes, using=using)
+    mark_recent_write(*scopes)
+
+
+@receiver(post_save, sender=AliceUser)
+@receiver(post_delete, sender=AliceUser)
+def alice_user_changed(sender, instance, using=None, **kwargs):
+    """
+    Timezone and account changes alter the rendered measurements, so they
+    invalidate cached responses as well. Re-linking to another Django user
+    also invalidates the previous owner's responses.
+    """
+    scopes = get_scopes_for_alice_user(instance)
+    previous_user_id = getattr(instance, '_previous_user_id', None)
+    if previous_user_id is not None and previous_user_id != instance.user_id:
+        scopes.append(django_user_scope(previous_user_id))
+    bump_data_version_on_commit(*scopes, using=using)
+    if instance.telegram_user_id_hash:
+        scopes.append(telegram_scope(instance.telegram_user_id_hash))
+    mark_recent_write(*scopes)
+
+
+@receiver(pre_save, sender=BloodPressureMeasurement)
+def remember_previous_measurement(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Keeps the stored owner and time of an updated measurement, so the day it
+    leaves can be recomputed and a move to another user leaves a tombstone.
+    """
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        instance._rollup_previous = (
+            sender.objects.using(using)
+            .filter(pk=instance.pk)
+            .values_list('user_id', 'measured_at')
+            .first()
+        )
+
+
+@receiver(post_save, sender=BloodPressureMeasurement)
+def update_rollup_on_save(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    if created or previous is None:
+        add_measurement(instance)
+        return
+
+    previous_user_id, previous_measured_at = previous
+    previous_user = (
+        instance.user
+        if previous_user_id == instance.user_id
+        else AliceUser.objects.using(using).get(pk=previous_user_id)
+    )
+    recompute_measurement_day(previous_user, previous_measured_at)
+    recompute_measurement_day(instance.user, instance.measured_at)
+
+
+@receiver(post_delete, sender=BloodPressureMeasurement)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    # Rollups include archived measurements
+    if _is_cascade_delete(kwargs) or is_archiving():
+        return
+    recompute_measurement_day(instance.user, instance.measured_at)
+
+
+@receiver(post_save, sender=BloodPressureMeasurement)
+def record_change_on_save(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is not None and previous[0] != instance.user_id:
+        record_change(previous[0], instance.pk, MeasurementChange.DELETED, using=using)
+    record_change(
+        instance.user_id,
+        instance.pk,
+        MeasurementChange.CREATED if created else MeasurementChange.UPDATED,
+        using=using,
+    )
+
+
+@receiver(post_delete, sender=BloodPressureMeasurement)
+def record_change_on_delete(sender, instance, using=None, **kwargs):
+    # Archived measurements are still served, so clients must not drop them
+    if _is_cascade_delete(kwargs) or is_archiving():
+        return
+    record_change(instance.user_id, instance.pk, MeasurementChange.DELETED, using=using)
+
+
+@receiver(post_save, sender=BloodPressureMeasurement)
+def update_hot_cache_on_save(sender, instance, created, raw=False, using=None, **kwargs):
+    """
+    Edits drop the owner's hot cache entries involved, which are refilled on
+    next access (new readings are appended by `measurement_changed`). Both
+    wait for the commit, so a rolled back or retried write leaves no phantom
+    rows.
+    """
+    hot_cache = get_hot_cache()
+    if hot_cache is None or raw or _is_new_reading(instance, created, raw):
+        return
+    previous = instance._rollup_previous
+    transaction.on_commit(
+        partial(hot_cache.invalidate, previous[0], instance.user_id), using=using
+    )
+
+
+@receiver(post_delete, sender=BloodPressureMeasurement)
+def update_hot_cache_on_delete(sender, instance, using=None, **kwargs):
+    hot_cache = get_hot_cache()
+    if hot_cache is not None and not is_archiving():
+        transaction.on_commit(partial(hot_cache.invalidate, instance.user_id), using=using)
+
+
+@receiver(pre_save, sender=AliceUser)
+def remember_previous_account(
+    sender, instance, raw=False, using=None, update_fields=None, **kwargs
+):
+    """
+    Keeps the stored timezone and Django user, for the rollup rebuild and
+    for invalidating a previous owner's cached responses.
+    """
+    instance._previous_timezone = instance._previous_user_id = None
+    fields = {'timezone', 'user'}
+    if update_fields is not None:
+        fields &= {'user' if field == 'user_id' else field for field in update_fields}
+    if instance.pk and not raw and fields:
+        previous = (
+            sender.objects.using(using)
+            .filter(pk=instance.pk)
+            .values('timezone', 'user_id')
+            .first()
+        )
+        if previous is not None:
+            if 'timezone' in fields:
+                instance._previous_timezone = previous['timezone']
+            if 'user' in fields:
+                instance._previous_user_id = previous['user_id']
+
+
+@receiver(post_save, sender=AliceUser)
+def rebuild_rollups_on_timezone_change(sender, instance, created, raw=False, **kwargs):
+    """
+    Rollups are keyed by local day, so a new timezone regroups the user's history.
+    """
+    previous = getattr(instance, '_previous_timezone', None)
+    if not created and not raw and previous is not None and previous != instance.timezone:
+        rebuild_daily_rollups([instance])
+
+
+@receiver(post_save, sender=AliceUser)
+def update_shard_directory_on_save(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Keeps the global shard directory pointing at the user's shard and keys.
+    """
+    if sharding_enabled() and not raw and instance.alice_user_id:
+        update_directory(instance, using)
+
+
+@receiver(post_delete, sender=AliceUser)
+def update_shard_directory_on_delete(sender, instance, using=None, **kwargs):
+    if sharding_enabled() and instance.alice_user_id:
+        remove_from_directory(instance, using)
+
+
+@receiver(connection_created)
+def record_connection_opened(sender, connection, **kwargs):
+    if connection_metrics_enabled():
+        connection_metrics.record_open(connection.alias, connect_duration(connection))
+
+
+@receiver(connection_created)
+def apply_sqlite_profile(sender, connection, **kwargs):
+    apply_sqlite_pragmas(connection)
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def forget_changed_api_token(sender, instance, **kwargs):
+    forget_api_tokens([instance.token_hash])
+
+
+@receiver(post_save, sender=get_user_model())
+def forget_api_tokens_of_changed_user(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which cached tokens do not depend on
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    forget_api_tokens(instance.api_tokens.values_list('token_hash', flat=True))
@@ -0,0 +1,9 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture(autouse=True, scope='session')
+def in_memory_throttle_store():
+    # Counters in the shared file would carry over between test runs
+    with override_settings(THROTTLE_STORE_PATH=''):
+        yield
@@ -109,20 +109,20 @@ class TestBloodPressureMeasurementAPI:
         now = timezone.now()
         BloodPressureMeasurement.objects.create(
             user=self.alice_user,
-            systolic=1,
-            diastolic=1,
+            systolic=101,
+            diastolic=70,
             measured_at=now - timedelta(days=1),
         )
         BloodPressureMeasurement.objects.create(
             user=self.alice_user,
-            systolic=2,
-            diastolic=2,
+            systolic=102,
+            diastolic=70,
             measured_at=now - timedelta(days=5),
         )
         BloodPressureMeasurement.objects.create(
             user=self.alice_user,
-            systolic=3,
-            diastolic=3,
+            systolic=103,
+            diastolic=70,
             measured_at=now - timedelta(days=10),
         )
 
@@ -141,5 +141,5 @@ class TestBloodPressureMeasurementAPI:
         assert response.status_code == 200
         assert len(response.data['results']) == 3
         assert response.data['results'][0]['systolic'] == 120
-        assert response.data['results'][1]['systolic'] == 1
-        assert response.data['results'][2]['systolic'] == 2
+        assert response.data['results'][1]['systolic'] == 101
+        assert response.data['results'][2]['systolic'] == 102
@@ -0,0 +1,136 @@
+import base64
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..authentication import create_api_token, hash_api_token
+from ..models import AliceUser, APIToken
+from .factories import TestDataFactory
+
+
+class APITokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('measurement-list')
+        self.django_user = DjangoUser.objects.create_user(
+            username='patient', password='secret'
+        )
+        self.alice_user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='alice_patient'
+        )
+        TestDataFactory.create_measurement(user=self.alice_user, systolic=125, diastolic=82)
+
+    def get_list(self, token):
+        return self.client.get(self.list_url, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_token_is_stored_hashed(self):
+        token, plaintext = create_api_token(self.django_user, name='phone')
+        self.assertEqual(token.token_hash, hash_api_token(plaintext))
+        self.assertEqual(token.prefix, plaintext[:8])
+        self.assertFalse(APIToken.objects.filter(token_hash=plaintext).exists())
+
+    def test_valid_token_lists_own_measurements_with_cached_lookup(self):
+        _, plaintext = create_api_token(self.django_user)
+        response = self.get_list(plaintext)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['systolic'] for row in response.data['results']], [125])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_list(plaintext).status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            [query for query in queries if 'alice_skill_apitoken' in query['sql']]
+        )
+
+    def test_rejected_tokens(self):
+        _, expired = create_api_token(
+            self.django_user, expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(self.get_list(expired).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get_list('unknown').status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(self.list_url, HTTP_AUTHORIZATION='Bearer two parts')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_revoked_token_and_inactive_user_are_rejected_despite_cache(self):
+        token, plaintext = create_api_token(self.django_user)
+        self.assertEqual(self.get_list(plaintext).status_code, status.HTTP_200_OK)
+
+        self.django_user.is_active = False
+        self.django_user.save()
+        self.assertEqual(self.get_list(plaintext).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.django_user.is_active = True
+        self.django_user.save()
+        self.assertEqual(self.get_list(plaintext).status_code, status.HTTP_200_OK)
+        token.delete()
+        self.assertEqual(self.get_list(plaintext).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_read_scope_cannot_write(self):
+        _, plaintext = create_api_token(self.django_user, scopes='read')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {plaintext}')
+        self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            self.list_url, {'user': self.alice_user.pk, 'systolic': 130, 'diastolic': 85}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def batch(self, plaintext, operations):
+        return self.client.post(
+            reverse('batch'),
+            {'operations': operations},
+            format='json',
+            HTTP_AUTHORIZATION=f'Bearer {plaintext}',
+        )
+
+    def test_batch_checks_token_scope_per_operation(self):
+        _, write_only = create_api_token(self.django_user, scopes='write')
+        self.assertEqual(self.get_list(write_only).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.batch(write_only, [{'method': 'GET', 'path': '/api/v1/measurements/'}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['status'], status.HTTP_403_FORBIDDEN)
+
+    def test_read_only_token_can_batch_reads_but_not_writes(self):
+        _, read_only = create_api_token(self.django_user, scopes='read')
+        response = self.batch(
+            read_only,
+            [
+                {'method': 'GET', 'path': '/api/v1/measurements/'},
+                {
+                    'method': 'POST',
+                    'path': '/api/v1/measurements/',
+                    'body': {'user': self.alice_user.pk, 'systolic': 130, 'diastolic': 85},
+                },
+            ],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        read, write = response.data['results']
+        self.assertEqual(read['status'], status.HTTP_200_OK)
+        self.assertEqual([row['systolic'] for row in read['body']['results']], [125])
+        self.assertEqual(write['status'], status.HTTP_403_FORBIDDEN)
+
+    def test_basic_authentication_is_not_accepted(self):
+        credentials = base64.b64encode(b'patient:secret').decode()
+        response = self.client.get(self.list_url, HTTP_AUTHORIZATION=f'Basic {credentials}')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_api_token_command(self):
+        out = StringIO()
+        call_command(
+            'create_api_token', 'patient', scopes='read', expires_days=30, stdout=out
+        )
+        plaintext = out.getvalue().splitlines()[0]
+        token = APIToken.objects.get(token_hash=hash_api_token(plaintext))
+        self.assertEqual(token.scopes, 'read')
+        self.assertIsNotNone(token.expires_at)
+        self.assertEqual(self.get_list(plaintext).status_code, status.HTTP_200_OK)
+
+        with self.assertRaisesMessage(CommandError, 'Unknown scope(s): admin'):
+            call_command('create_api_token', 'patient', scopes='admin', stdout=StringIO())
@@ -0,0 +1,231 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..archive import (
+    archive_cutoff,
+    is_archiving,
+    month_start,
+    pack_measurements,
+    unpack_measurements,
+)
+from ..handlers.last_measurement import LastMeasurementHandler
+from ..hot_cache import get_hot_cache, reset_hot_cache
+from ..messages import LastMeasurementMessages
+from ..models import (
+    AliceUser,
+    BloodPressureMeasurement,
+    DailyMeasurementRollup,
+    MeasurementArchive,
+    MeasurementChange,
+)
+from .factories import TestDataFactory
+
+
+def test_pack_round_trip():
+    start = datetime(2023, 3, 1, 8, 30, 15, 250000, tzinfo=dt_timezone.utc)
+    rows = [
+        {
+            'id': 40 - i,
+            'user_id': 7,
+            'systolic': 120 + i,
+            'diastolic': 80,
+            'pulse': None if i % 2 else 65,
+            'measured_at': start + timedelta(hours=i),
+        }
+        for i in range(5)
+    ]
+    assert unpack_measurements(pack_measurements(rows), 7) == rows
+
+
+def test_archive_cutoff_is_month_aligned():
+    now = datetime(2025, 3, 20, 12, 0, tzinfo=dt_timezone.utc)
+    assert archive_cutoff(365, now) == datetime(2024, 3, 1, tzinfo=dt_timezone.utc)
+    assert archive_cutoff(0, now) == datetime(2025, 3, 1, tzinfo=dt_timezone.utc)
+
+
+class MeasurementArchiveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.django_user = DjangoUser.objects.create_user(
+            username='archive_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='archive_user', timezone='Europe/Moscow'
+        )
+        self.client.force_authenticate(user=self.django_user)
+        now = timezone.now()
+        self.old = [
+            self.create(now - timedelta(days=days), systolic)
+            for days, systolic in ((430, 150), (420, 140), (400, 130))
+        ]
+        self.recent = [
+            self.create(now - timedelta(days=days), systolic)
+            for days, systolic in ((3, 125), (1, 120))
+        ]
+
+    def create(self, measured_at, systolic, pulse=70):
+        return BloodPressureMeasurement.objects.create(
+            user=self.user,
+            systolic=systolic,
+            diastolic=80,
+            pulse=pulse,
+            measured_at=measured_at,
+        )
+
+    def archive(self, **options):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                'archive_measurements', older_than_days=365, stdout=StringIO(), **options
+            )
+        self.user.refresh_from_db()
+
+    def snapshot(self):
+        return {
+            'list': self.client.get(reverse('measurement-list')).data,
+            'page': self.client.get(
+                reverse('measurement-list'), {'page_size': 2, 'page': 2, 'ordering': 'systolic'}
+            ).data,
+            'stats': self.client.get(reverse('measurement-stats')).data,
+            'series': self.client.get(reverse('measurement-series')).data,
+            'changes': self.client.get(reverse('measurement-changes')).data,
+        }
+
+    def test_reads_are_unchanged_by_archiving(self):
+        before = self.snapshot()
+        changes_before = MeasurementChange.objects.count()
+        self.archive()
+
+        self.assertEqual(
+            list(BloodPressureMeasurement.objects.values_list('systolic', flat=True)),
+            [120, 125],
+        )
+        self.assertEqual(
+            sum(MeasurementArchive.objects.values_list('count', flat=True)), 3
+        )
+        self.assertEqual(self.user.archived_until, self.old[-1].measured_at)
+        self.assertEqual(MeasurementChange.objects.count(), changes_before)
+        self.assertEqual(self.snapshot(), before)
+
+    @override_settings(MEASUREMENT_HOT_CACHE=True)
+    def test_archiving_invalidates_hot_cache(self):
+        reset_hot_cache()
+        self.addCleanup(reset_hot_cache)
+        since = (timezone.now() - timedelta(days=10)).date().isoformat()
+        self.client.get(reverse('measurement-list'), {'created_at__gte': since})
+        self.assertIn(self.user.pk, get_hot_cache()._entries)
+
+        self.archive()
+        self.assertFalse(is_archiving())
+        self.assertNotIn(self.user.pk, get_hot_cache()._entries)
+
+    def test_recent_range_skips_archive(self):
+        self.archive()
+        since = (timezone.now() - timedelta(days=10)).date().isoformat()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('measurement-list'), {'created_at__gte': since})
+        self.assertEqual(response.data['count'], 2)
+
+        old_day = self.old[0].measured_at.date()
+        response = self.client.get(
+            reverse('measurement-list'),
+            {
+                'created_at__gte': (old_day - timedelta(days=1)).isoformat(),
+                'created_at__lte': (old_day + timedelta(days=1)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['systolic'] for row in response.data['results']], [150])
+
+    def test_archiving_merges_months_and_rollups_include_archive(self):
+        self.archive()
+        late = self.create(self.old[0].measured_at + timedelta(minutes=5), 160, pulse=None)
+        month = MeasurementArchive.objects.get(month=month_start(late.measured_at))
+        archived_count = month.count
+        self.archive()
+        month.refresh_from_db()
+        self.assertEqual(month.count, archived_count + 1)
+        self.assertIn(
+            late.pk, [record['id'] for record in unpack_measurements(month.data, self.user.pk)]
+        )
+
+        self.user.timezone = 'Asia/Tokyo'
+        self.user.save()
+        self.assertEqual(
+            sum(DailyMeasurementRollup.objects.values_list('count', flat=True)), 6
+        )
+
+        # A new reading on an archived day keeps the archived ones in its rollup
+        extra = self.create(self.old[1].measured_at + timedelta(minutes=1), 145)
+        extra.delete()
+        rollup = DailyMeasurementRollup.objects.get(
+            day=self.old[1].measured_at.astimezone(ZoneInfo('Asia/Tokyo')).date()
+        )
+        self.assertEqual((rollup.count, rollup.systolic_max), (1, 140))
+
+    def test_pages_unpack_only_the_months_they_reach(self):
+        for days in (500, 560, 620):
+            self.create(timezone.now() - timedelta(days=days), 135)
+        self.archive()
+        self.assertGreaterEqual(MeasurementArchive.objects.count(), 4)
+
+        with mock.patch(
+            'alice_skill.archive.unpack_measurements', wraps=unpack_measurements
+        ) as unpack:
+            response = self.client.get(reverse('measurement-list'), {'page_size': 3})
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual([row['systolic'] for row in response.data['results']], [120, 125, 130])
+        unpack.assert_called_once()
+
+    def test_listing_across_users_keeps_the_order(self):
+        other = AliceUser.objects.create(alice_user_id='other_archive_user')
+        now = timezone.now()
+        for days, systolic in ((425, 145), (410, 135), (405, 132), (2, 122)):
+            BloodPressureMeasurement.objects.create(
+                user=other, systolic=systolic, diastolic=75, measured_at=now - timedelta(days=days)
+            )
+        admin = DjangoUser.objects.create_superuser(username='archive_admin', password='pw')
+        self.client.force_authenticate(user=admin)
+
+        def listings():
+            return {
+                ordering: self.client.get(
+                    reverse('measurement-list'), {'ordering': ordering, 'page_size': 4}
+                ).data
+                for ordering in ('measured_at', '-measured_at', 'systolic')
+            }
+
+        before = listings()
+        self.archive()
+        self.assertEqual(MeasurementArchive.objects.values('user').distinct().count(), 2)
+        self.assertEqual(listings(), before)
+        self.assertEqual(before['measured_at']['count'], 9)
+
+    def test_latest_reading_from_archive(self):
+        BloodPressureMeasurement.objects.filter(pk__in=[m.pk for m in self.recent]).delete()
+        self.archive()
+        self.assertFalse(BloodPressureMeasurement.objects.exists())
+        reply = LastMeasurementHandler().handle(
+            TestDataFactory.create_validated_request_data(
+                original_utterance='покажи давление', user_id='archive_user'
+            )
+        )
+        self.assertTrue(
+            reply.startswith(LastMeasurementMessages.REPLY.format(systolic=130, diastolic=80))
+        )
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command('archive_measurements', older_than_days=365, dry_run=True, stdout=out)
+        self.assertIn('Would archive 3 measurement(s)', out.getvalue())
+        self.assertFalse(MeasurementArchive.objects.exists())
@@ -0,0 +1,170 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..batch import UnresolvedReference, resolve_references
+from ..helpers import get_hashed_telegram_id
+from ..models import AliceUser, BloodPressureMeasurement
+
+
+def test_resolve_references_keeps_types_and_interpolates():
+    results = {
+        'user': {'status': 200, 'body': {'id': 7, 'alice_user_id': 'abc'}},
+        'list': {'status': 200, 'body': {'results': [{'systolic': 120}]}},
+    }
+    resolved = resolve_references(
+        {
+            'user': '${user.id}',
+            'path': '/api/v1/measurements/?user_id=${user.alice_user_id}',
+            'values': ['${list.results.0.systolic}', 'plain'],
+        },
+        results,
+    )
+    assert resolved == {
+        'user': 7,
+        'path': '/api/v1/measurements/?user_id=abc',
+        'values': [120, 'plain'],
+    }
+
+
+def test_resolve_references_rejects_missing_and_failed_results():
+    results = {'user': {'status': 404, 'body': {'detail': 'nope'}}}
+    for reference in ('${user.alice_user_id}', '${other.id}'):
+        try:
+            resolve_references(reference, results)
+        except UnresolvedReference:
+            continue
+        raise AssertionError(f'{reference} should not resolve')
+
+
+@override_settings(API_TOKEN='test_bot_token')
+class BatchViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('batch')
+        self.user = AliceUser.objects.create(
+            alice_user_id='batch_user', telegram_user_id_hash=get_hashed_telegram_id('555')
+        )
+        BloodPressureMeasurement.objects.create(
+            user=self.user,
+            systolic=125,
+            diastolic=82,
+            measured_at=datetime(2024, 7, 1, 9, 0, tzinfo=dt_timezone.utc),
+        )
+
+    def bot_post(self, operations):
+        return self.client.post(
+            self.url,
+            {'operations': operations},
+            format='json',
+            HTTP_AUTHORIZATION='Token test_bot_token',
+        )
+
+    def test_user_lookup_then_measurements(self):
+        response = self.bot_post(
+            [
+                {'id': 'user', 'method': 'GET', 'path': '/api/v1/users/by-telegram/555/'},
+                {
+                    'id': 'measurements',
+                    'method': 'GET',
+                    'path': '/api/v1/measurements/',
+                    'params': {'user_id': '${user.alice_user_id}', 'page_size': 100},
+                },
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user, measurements = response.data['results']
+        self.assertEqual(user['id'], 'user')
+        self.assertEqual(user['status'], 200)
+        self.assertEqual(user['body']['alice_user_id'], 'batch_user')
+        self.assertEqual(measurements['status'], 200)
+        self.assertEqual(measurements['body']['count'], 1)
+        self.assertEqual(measurements['body']['results'][0]['systolic'], 125)
+
+    def test_failed_dependency(self):
+        response = self.bot_post(
+            [
+                {'id': 'user', 'method': 'GET', 'path': '/api/v1/users/by-telegram/404/'},
+                {
+                    'method': 'GET',
+                    'path': '/api/v1/measurements/',
+                    'params': {'user_id': '${user.alice_user_id}'},
+                },
+            ]
+        )
+        user, measurements = response.data['results']
+        self.assertEqual(user['status'], 404)
+        self.assertEqual(measurements['id'], '1')
+        self.assertEqual(measurements['status'], 424)
+
+    def test_write_then_read(self):
+        response = self.bot_post(
+            [
+                {
+                    'id': 'user',
+                    'method': 'GET',
+                    'path': '/api/v1/users/by-telegram/555/',
+                },
+                {
+                    'id': 'created',
+                    'method': 'POST',
+                    'path': '/api/v1/measurements/',
+                    'body': {'user': '${user.id}', 'systolic': 130, 'diastolic': 85},
+                },
+                {
+                    'method': 'GET',
+                    'path': '/api/v1/measurements/',
+                    'params': {'user_id': 'batch_user'},
+                },
+            ]
+        )
+        _, created, listing = response.data['results']
+        self.assertEqual(created['status'], 201)
+        self.assertEqual(listing['body']['count'], 2)
+
+    def test_rejects_paths_outside_api_and_nested_batches(self):
+        response = self.bot_post(
+            [
+                {'method': 'GET', 'path': '/admin/'},
+                {'method': 'POST', 'path': '/api/v1/batch/', 'body': {'operations': []}},
+                {'method': 'GET', 'path': '/api/v1/unknown/'},
+            ]
+        )
+        self.assertEqual(
+            [result['status'] for result in response.data['results']], [400, 400, 404]
+        )
+
+    def test_subrequests_keep_session_user_scope(self):
+        django_user = DjangoUser.objects.create_user(username='batch_owner', password='pw')
+        self.user.user = django_user
+        self.user.save()
+        self.client.login(username='batch_owner', password='pw')
+        response = self.client.post(
+            self.url,
+            {
+                'operations': [
+                    {'method': 'GET', 'path': '/api/v1/measurements/'},
+                    {'method': 'GET', 'path': '/api/v1/users/by-telegram/555/'},
+                ]
+            },
+            format='json',
+        )
+        measurements, bot_only = response.data['results']
+        self.assertEqual(measurements['body']['count'], 1)
+        self.assertEqual(bot_only['status'], status.HTTP_403_FORBIDDEN)
+
+    def test_validation(self):
+        response = self.bot_post(
+            [
+                {'id': 'a', 'method': 'GET', 'path': '/api/v1/measurements/'},
+                {'id': 'a', 'method': 'GET', 'path': '/api/v1/measurements/'},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.bot_post([{'method': 'TRACE', 'path': '/api/v1/measurements/'}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..helpers import get_hashed_telegram_id, get_hashed_telegram_ids
+from ..models import AliceUser, BloodPressureMeasurement
+
+
+def test_batch_hashes_match_single_hashes(settings):
+    settings.TELEGRAM_ID_HMAC_KEY = 'bulk-key'
+    hashed = get_hashed_telegram_ids(['1', 2, '3'])
+    assert hashed == {get_hashed_telegram_id(i): str(i) for i in (1, 2, 3)}
+
+
+@override_settings(API_TOKEN='test_bot_token')
+class BulkUserLookupTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('user-bulk-lookup')
+        self.client.credentials(HTTP_AUTHORIZATION='Token test_bot_token')
+        self.users = {}
+        for telegram_id, timezone in (('101', 'UTC'), ('102', 'Europe/Moscow'), ('103', 'UTC')):
+            self.users[telegram_id] = AliceUser.objects.create(
+                alice_user_id=f'alice_{telegram_id}',
+                telegram_user_id_hash=get_hashed_telegram_id(telegram_id),
+                timezone=timezone,
+            )
+        start = datetime(2024, 6, 1, 9, 0, tzinfo=dt_timezone.utc)
+        for telegram_id in ('101', '102'):
+            for i in range(3):
+                BloodPressureMeasurement.objects.create(
+                    user=self.users[telegram_id],
+                    systolic=120 + i,
+                    diastolic=80,
+                    pulse=70,
+                    measured_at=start + timedelta(days=i),
+                )
+
+    def test_resolves_users_in_request_order(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                self.url, {'telegram_user_ids': ['103', '999', '101', '101']}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['alice_user_id'] for item in response.data['results']],
+            ['alice_103', 'alice_101'],
+        )
+        self.assertEqual(response.data['not_found'], ['999'])
+        self.assertNotIn('latest_measurement', response.data['results'][0])
+
+    def test_includes_latest_measurement(self):
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                self.url,
+                {'telegram_user_ids': ['101', '102', '103'], 'include_latest': True},
+                format='json',
+            )
+        results = {item['telegram_user_id']: item for item in response.data['results']}
+        self.assertEqual(
+            results['101']['latest_measurement'],
+            {
+                'systolic': 122,
+                'diastolic': 80,
+                'pulse': 70,
+                'measured_at': '2024-06-03T09:00:00+00:00',
+            },
+        )
+        self.assertEqual(
+            results['102']['latest_measurement']['measured_at'], '2024-06-03T12:00:00+03:00'
+        )
+        self.assertIsNone(results['103']['latest_measurement'])
+
+    def test_requires_bot_token(self):
+        self.client.credentials()
+        response = self.client.post(self.url, {'telegram_user_ids': ['101']}, format='json')
+        self.assertIn(
+            response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+        )
+
+    def test_rejects_empty_list(self):
+        response = self.client.post(self.url, {'telegram_user_ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('telegram_user_ids', response.data)
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import AliceUser, BloodPressureMeasurement, MeasurementChange
+
+MEASURED_AT = datetime(2024, 8, 1, 9, 0, tzinfo=dt_timezone.utc)
+
+
+class MeasurementChangeFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('measurement-changes')
+        self.django_user = DjangoUser.objects.create_user(
+            username='feed_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='feed_user', timezone='Europe/Moscow'
+        )
+        self.other_user = AliceUser.objects.create(alice_user_id='other_feed_user')
+        self.client.force_authenticate(user=self.django_user)
+
+    def create(self, user=None, systolic=120):
+        return BloodPressureMeasurement.objects.create(
+            user=user or self.user, systolic=systolic, diastolic=80, measured_at=MEASURED_AT
+        )
+
+    def sync(self, since=0, **params):
+        response = self.client.get(self.url, {'since': since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_feed_returns_changes_after_cursor(self):
+        first = self.create(systolic=120)
+        initial = self.sync()
+        self.assertEqual(
+            initial['changes'],
+            [
+                {
+                    'seq': initial['cursor'],
+                    'action': 'created',
+                    'id': first.pk,
+                    'measurement': {
+                        'user': self.user.pk,
+                        'systolic': 120,
+                        'diastolic': 80,
+                        'pulse': None,
+                        'measured_at': '2024-08-01T12:00:00+03:00',
+                    },
+                }
+            ],
+        )
+        self.assertFalse(initial['has_more'])
+
+        second = self.create(systolic=130)
+        second_pk = second.pk
+        first.systolic = 125
+        first.save()
+        second.delete()
+
+        delta = self.sync(initial['cursor'])
+        self.assertEqual(
+            [(c['action'], c['id']) for c in delta['changes']],
+            [('updated', first.pk), ('deleted', second_pk)],
+        )
+        self.assertEqual(delta['changes'][0]['measurement']['systolic'], 125)
+        self.assertIsNone(delta['changes'][1]['measurement'])
+        self.assertEqual(self.sync(delta['cursor'])['changes'], [])
+
+    def test_feed_keeps_latest_entry_per_measurement(self):
+        measurement = self.create()
+        for systolic in (121, 122, 123):
+            measurement.systolic = systolic
+            measurement.save()
+        self.assertEqual(MeasurementChange.objects.count(), 1)
+        change = self.sync()['changes'][0]
+        self.assertEqual(change['action'], 'updated')
+        self.assertEqual(change['measurement']['systolic'], 123)
+
+    def test_feed_is_scoped_and_paginated(self):
+        self.create(user=self.other_user)
+        for _ in range(3):
+            self.create()
+        page = self.sync(limit=2)
+        self.assertTrue(page['has_more'])
+        self.assertEqual(len(page['changes']), 2)
+        rest = self.sync(page['cursor'], limit=2)
+        self.assertFalse(rest['has_more'])
+        self.assertEqual(len(rest['changes']), 1)
+
+    def test_moving_measurement_leaves_tombstone(self):
+        measurement = self.create()
+        cursor = self.sync()['cursor']
+        measurement.user = self.other_user
+        measurement.save()
+        change = self.sync(cursor)['changes'][0]
+        self.assertEqual((change['action'], change['id']), ('deleted', measurement.pk))
+
+    def test_user_delete_drops_feed(self):
+        self.create()
+        self.user.delete()
+        self.assertFalse(MeasurementChange.objects.exists())
+
+    @override_settings(CHANGE_FEED_SETTLE_SECONDS=5)
+    def test_feed_waits_for_out_of_order_commits(self):
+        settled = timezone.now() - timedelta(seconds=10)
+        first, second, third = (self.create(systolic=s) for s in (120, 130, 140))
+        first_change, second_change, third_change = MeasurementChange.objects.all()
+        MeasurementChange.objects.filter(pk=first_change.pk).update(changed_at=settled)
+        # The second transaction took its id first but has not committed yet,
+        # while the third has just committed
+        MeasurementChange.objects.filter(pk=second_change.pk).delete()
+
+        page = self.sync()
+        self.assertEqual([c['id'] for c in page['changes']], [first.pk])
+        self.assertEqual(page['cursor'], first_change.pk)
+
+        second_change.save(force_insert=True)
+        MeasurementChange.objects.update(changed_at=settled)
+        page = self.sync(page['cursor'])
+        self.assertEqual([c['id'] for c in page['changes']], [second.pk, third.pk])
+        self.assertEqual(page['cursor'], third_change.pk)
+
+    def test_invalid_cursor(self):
+        for params in ({'since': '-1'}, {'since': 'abc'}, {'limit': '0'}, {'limit': '5000'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,125 @@
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..charts import CHART_HEIGHT, CHART_WIDTH, SERIES, render_png, render_svg
+from ..models import AliceUser, BloodPressureMeasurement
+
+START = datetime(2024, 3, 1, 8, 0, tzinfo=dt_timezone.utc)
+
+
+def decode_png(data: bytes) -> tuple[int, int, bytes]:
+    """
+    Decodes the unfiltered RGB PNGs produced by `render_png`.
+    """
+    assert data.startswith(b'\x89PNG\r\n\x1a\n')
+    width, height = struct.unpack('>II', data[16:24])
+    idat_length = struct.unpack('>I', data[33:37])[0]
+    raw = zlib.decompress(data[41 : 41 + idat_length])
+    stride = width * 3 + 1
+    pixels = b''.join(raw[y * stride + 1 : (y + 1) * stride] for y in range(height))
+    return width, height, pixels
+
+
+def chart_rows(count):
+    return [
+        (120 + i % 10, 80 + i % 5, 70 if i % 2 else None, START + timedelta(hours=8 * i))
+        for i in range(count)
+    ]
+
+
+def test_render_png_draws_every_series():
+    width, height, pixels = decode_png(render_png(chart_rows(30), ZoneInfo('UTC')))
+    assert (width, height) == (CHART_WIDTH, CHART_HEIGHT)
+    assert len(pixels) == width * height * 3
+    colors = {pixels[i : i + 3] for i in range(0, len(pixels), 3)}
+    for _, _, color in SERIES:
+        assert bytes(color) in colors
+
+
+def test_render_handles_empty_and_single_row():
+    for rows in ([], chart_rows(1)):
+        decode_png(render_png(rows, ZoneInfo('UTC')))
+        assert render_svg(rows, ZoneInfo('UTC')).startswith(b'<svg')
+
+
+def test_render_svg_labels_local_dates():
+    svg = render_svg(chart_rows(10), ZoneInfo('Asia/Tokyo')).decode()
+    assert svg.count('<polyline') == 3
+    assert '>01.03<' in svg
+    assert '>04.03<' in svg
+
+
+class MeasurementChartTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('measurement-chart')
+        self.user = AliceUser.objects.create(alice_user_id='chart_user', timezone='UTC')
+        BloodPressureMeasurement.objects.bulk_create(
+            BloodPressureMeasurement(
+                user=self.user,
+                systolic=systolic,
+                diastolic=diastolic,
+                pulse=pulse,
+                measured_at=measured_at,
+            )
+            for systolic, diastolic, pulse, measured_at in chart_rows(500)
+        )
+        self.headers = {'HTTP_AUTHORIZATION': 'Token test_bot_token'}
+        self.params = {
+            'user_id': 'chart_user',
+            'created_at__gte': '2024-03-01',
+            'created_at__lte': '2024-03-31',
+        }
+
+    def get(self, params=None, **extra):
+        with self.settings(API_TOKEN='test_bot_token'):
+            return self.client.get(self.url, params or self.params, **self.headers, **extra)
+
+    def test_png_chart(self):
+        response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        width, height, _ = decode_png(response.content)
+        self.assertEqual((width, height), (CHART_WIDTH, CHART_HEIGHT))
+
+    def test_svg_chart(self):
+        response = self.get({**self.params, 'format': 'svg'})
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertTrue(response.content.startswith(b'<svg'))
+
+    def test_repeat_view_served_from_cache(self):
+        first = self.get()
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get()
+        self.assertEqual(second.content, first.content)
+        self.assertFalse(
+            [q for q in queries if 'bloodpressuremeasurement' in q['sql']]
+        )
+        not_modified = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_period_and_data_version_change_chart(self):
+        march = self.get()['ETag']
+        april = self.get({**self.params, 'created_at__gte': '2024-04-01'})['ETag']
+        self.assertNotEqual(march, april)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BloodPressureMeasurement.objects.create(
+                user=self.user, systolic=180, diastolic=110, measured_at=START
+            )
+        self.assertNotEqual(self.get()['ETag'], march)
+
+    def test_invalid_filter_is_reported_as_json(self):
+        response = self.get({**self.params, 'created_at__gte': 'not-a-date'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn(b'created_at__gte', response.content)
@@ -0,0 +1,87 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import skipIf
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import AliceUser, BloodPressureMeasurement
+from ..renderers import msgpack
+
+
+class MeasurementsColumnarFormatTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('measurement-list')
+        self.django_user = DjangoUser.objects.create_user(
+            username='columnar_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='columnar_user', timezone='Europe/Moscow'
+        )
+        self.start = datetime(2024, 5, 1, 8, 0, tzinfo=dt_timezone.utc)
+        BloodPressureMeasurement.objects.bulk_create(
+            BloodPressureMeasurement(
+                user=self.user,
+                systolic=110 + i,
+                diastolic=70 + i,
+                pulse=60 if i % 2 else None,
+                measured_at=self.start + timedelta(hours=i),
+            )
+            for i in range(30)
+        )
+        self.client.force_authenticate(user=self.django_user)
+
+    def test_columnar_json_response(self):
+        response = self.client.get(
+            self.list_url,
+            {'page_size': 3, 'ordering': 'measured_at'},
+            HTTP_ACCEPT='application/vnd.alicebp.columnar+json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 30)
+        self.assertIsNotNone(data['next'])
+        self.assertEqual(data['user'], self.user.pk)
+        self.assertEqual(data['timezone'], 'Europe/Moscow')
+        self.assertEqual(data['fields'], ['systolic', 'diastolic', 'pulse', 'measured_at'])
+        self.assertEqual(data['columns']['systolic'], [110, 111, 112])
+        self.assertEqual(data['columns']['pulse'], [None, 60, None])
+        self.assertEqual(
+            data['columns']['measured_at'][0], int(self.start.timestamp())
+        )
+
+    def test_columnar_respects_sparse_fieldset(self):
+        response = self.client.get(
+            self.list_url, {'format': 'columnar', 'fields': 'systolic,measured_at'}
+        )
+        data = json.loads(response.content)
+        self.assertEqual(data['fields'], ['systolic', 'measured_at'])
+        self.assertNotIn('user', data)
+
+    @skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack_response(self):
+        response = self.client.get(
+            self.list_url,
+            {'page_size': 100},
+            HTTP_ACCEPT='application/vnd.alicebp.columnar+msgpack',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(len(data['columns']['systolic']), 30)
+
+    def test_columnar_payload_is_smaller(self):
+        params = {'page_size': 100}
+        rows = self.client.get(self.list_url, params)
+        columns = self.client.get(self.list_url, {**params, 'format': 'columnar'})
+        self.assertLess(len(columns.content) * 2, len(rows.content))
+
+    def test_default_format_is_unchanged(self):
+        response = self.client.get(self.list_url, {'page_size': 1})
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'user', 'systolic', 'diastolic', 'pulse', 'measured_at'},
+        )
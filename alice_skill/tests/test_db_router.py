@@ -0,0 +1,171 @@
+from unittest import SkipTest, mock
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, router
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .. import db_router
+from ..cache import alice_scope, telegram_scope
+from ..db_router import (
+    REPLICA_ALIAS,
+    ReplicaHealth,
+    ReplicaRouter,
+    has_recent_write,
+    mark_recent_write,
+    reset_replica_reads,
+    use_replica_reads,
+)
+from ..helpers import get_hashed_telegram_id
+from ..models import AliceUser, BloodPressureMeasurement
+from ..services import check_health
+
+
+class RecordingRouter(ReplicaRouter):
+    """
+    Records where reads would go while keeping them on the test database.
+    """
+
+    def __init__(self):
+        self.reads = []
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'alice_skill':
+            self.reads.append(super().db_for_read(model, **hints) or DEFAULT_DB_ALIAS)
+        return None
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        patcher = mock.patch.object(db_router.replica_health, 'is_healthy', return_value=True)
+        self.is_healthy = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_use_replica_only_when_allowed(self):
+        self.assertIsNone(self.router.db_for_read(BloodPressureMeasurement))
+        token = use_replica_reads()
+        try:
+            self.assertEqual(self.router.db_for_read(BloodPressureMeasurement), REPLICA_ALIAS)
+            # Auth and sessions stay on the primary
+            self.assertIsNone(self.router.db_for_read(DjangoUser))
+            self.is_healthy.return_value = False
+            self.assertIsNone(self.router.db_for_read(BloodPressureMeasurement))
+        finally:
+            reset_replica_reads(token)
+
+    def test_writes_and_migrations_use_primary(self):
+        token = use_replica_reads()
+        try:
+            self.assertEqual(self.router.db_for_write(BloodPressureMeasurement), DEFAULT_DB_ALIAS)
+        finally:
+            reset_replica_reads(token)
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, 'alice_skill'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'alice_skill'))
+
+    def test_unreachable_replica_is_unhealthy(self):
+        health = ReplicaHealth('missing')
+        with self.assertLogs('alice_skill.db_router', 'WARNING'):
+            self.assertFalse(health.is_healthy())
+
+    def test_health_check_reuses_cached_replica_state(self):
+        with (
+            mock.patch('alice_skill.services.replica_configured', return_value=True),
+            mock.patch.object(db_router.replica_health, 'check') as check,
+        ):
+            self.assertEqual(check_health()['replica'], 'connected')
+        check.assert_not_called()
+
+    @override_settings(REPLICA_STICKY_SECONDS=60)
+    def test_recent_writes_are_marked_only_with_replica(self):
+        with mock.patch.object(db_router, 'replica_configured', return_value=False):
+            mark_recent_write(alice_scope('a'))
+        self.assertFalse(has_recent_write(alice_scope('a')))
+        with mock.patch.object(db_router, 'replica_configured', return_value=True):
+            mark_recent_write(alice_scope('a'))
+        self.assertTrue(has_recent_write(alice_scope('b'), alice_scope('a')))
+
+
+@override_settings(API_TOKEN='test_bot_token')
+class ReplicaReadViewTests(APITestCase):
+    def setUp(self):
+        self.django_user = DjangoUser.objects.create_user(username='replica', password='pw')
+        self.user = AliceUser.objects.create(
+            user=self.django_user,
+            alice_user_id='replica_user',
+            telegram_user_id_hash=get_hashed_telegram_id('4242'),
+        )
+        # Forget the setup writes
+        cache.clear()
+        self.recording = RecordingRouter()
+        for patcher in (
+            mock.patch.object(router, 'routers', [self.recording]),
+            mock.patch.object(db_router, 'replica_configured', return_value=True),
+            mock.patch('alice_skill.views.replica_configured', return_value=True),
+            mock.patch.object(db_router.replica_health, 'is_healthy', return_value=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def reads_for(self, method, *args, **kwargs):
+        self.recording.reads.clear()
+        response = getattr(self.client, method)(*args, **kwargs)
+        self.assertLess(response.status_code, 400, response.data)
+        return set(self.recording.reads)
+
+    def test_measurement_reads_stick_to_primary_after_write(self):
+        self.client.force_authenticate(user=self.django_user)
+        url = reverse('measurement-list')
+        self.assertEqual(self.reads_for('get', url), {REPLICA_ALIAS})
+
+        data = {
+            'user': self.user.pk,
+            'systolic': 120,
+            'diastolic': 80,
+            'measured_at': timezone.now(),
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(
+                self.reads_for('post', url, data, format='json'), {DEFAULT_DB_ALIAS}
+            )
+        self.assertEqual(self.reads_for('get', url), {DEFAULT_DB_ALIAS})
+
+    def test_bot_lookup_sticks_to_primary_after_linking(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token test_bot_token')
+        url = reverse('user-by-telegram', args=['4242'])
+        self.assertEqual(self.reads_for('get', url), {REPLICA_ALIAS})
+
+        # Saving the user (as linking does) marks its Telegram scope
+        self.user.timezone = 'Europe/Moscow'
+        self.user.save()
+        self.assertTrue(has_recent_write(telegram_scope(self.user.telegram_user_id_hash)))
+        self.assertEqual(self.reads_for('get', url), {DEFAULT_DB_ALIAS})
+
+
+class ReplicaDatabaseTests(TransactionTestCase):
+    """
+    Runs when `DATABASE_REPLICA_URL` is set. In tests the replica mirrors the
+    default database, so committed writes are visible through it.
+    """
+
+    databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+
+    @classmethod
+    def setUpClass(cls):
+        if not db_router.replica_configured():
+            raise SkipTest('DATABASE_REPLICA_URL is not set')
+        super().setUpClass()
+
+    def test_replica_serves_reads(self):
+        db_router.replica_health.reset()
+        AliceUser.objects.create(alice_user_id='mirrored')
+        token = use_replica_reads()
+        try:
+            self.assertEqual(router.db_for_read(AliceUser), REPLICA_ALIAS)
+            self.assertTrue(AliceUser.objects.filter(alice_user_id='mirrored').exists())
+        finally:
+            reset_replica_reads(token)
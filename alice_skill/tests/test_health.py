@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from .. import health
+from ..health import readiness
+
+
+class HealthProbeTests(TestCase):
+    def setUp(self):
+        readiness.reset()
+        self.addCleanup(readiness.reset)
+
+    def test_liveness_does_not_touch_the_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('health-live'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['status'], 'alive')
+        self.assertIn('uptime_seconds', response.json())
+
+    def test_readiness_reports_checks_with_timings(self):
+        response = self.client.get(reverse('health-ready'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['status'], 'ready')
+        self.assertEqual(data['checks']['databases']['default']['status'], 'ok')
+        self.assertEqual(data['checks']['cache']['status'], 'ok')
+        self.assertEqual(data['checks']['migrations']['pending'], 0)
+        self.assertIn('latency_ms', data['checks']['databases']['default'])
+        self.assertIn('duration_ms', data)
+        self.assertEqual(data['age_seconds'], 0.0)
+
+    def test_readiness_is_served_from_cache_within_ttl(self):
+        first = self.client.get(reverse('health-ready')).json()
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('health-ready')).json()
+        self.assertEqual(second['checked_at'], first['checked_at'])
+
+    @override_settings(READINESS_CACHE_SECONDS=0, READINESS_MAX_AGE_SECONDS=60)
+    def test_stale_readiness_is_refreshed_in_background(self):
+        first = self.client.get(reverse('health-ready')).json()
+        with mock.patch.object(readiness, 'refresh_in_background') as refresh:
+            second = self.client.get(reverse('health-ready')).json()
+        refresh.assert_called_once_with()
+        self.assertEqual(second['checked_at'], first['checked_at'])
+        self.assertGreater(second['age_seconds'], 0)
+
+    @override_settings(READINESS_MAX_AGE_SECONDS=0)
+    def test_failing_check_makes_service_not_ready(self):
+        with mock.patch.object(health, 'check_database', side_effect=RuntimeError('down')):
+            response = self.client.get(reverse('health-ready'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        data = response.json()
+        self.assertEqual(data['status'], 'not_ready')
+        self.assertEqual(
+            data['checks']['databases']['default'],
+            {'status': 'error', 'error': 'down', 'latency_ms': mock.ANY},
+        )
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..cache import alice_user_scope, bump_data_version
+from ..handlers.last_measurement import LastMeasurementHandler
+from ..hot_cache import (
+    MeasurementHotCache,
+    UserSeries,
+    from_micros,
+    get_hot_cache,
+    reset_hot_cache,
+    to_micros,
+)
+from ..messages import LastMeasurementMessages
+from ..models import AliceUser, BloodPressureMeasurement
+from .factories import TestDataFactory
+
+
+def test_user_series_keeps_time_order_and_spans():
+    start = datetime(2024, 8, 1, tzinfo=dt_timezone.utc)
+    series = UserSeries(1, 'v', to_micros(start))
+    for hours, systolic in ((5, 130), (1, 110), (3, 120)):
+        assert series.add(to_micros(start + timedelta(hours=hours)), systolic, 80, None)
+    assert not series.add(to_micros(start - timedelta(hours=1)), 150, 90, 70)
+
+    assert list(series.systolic) == [110, 120, 130]
+    assert from_micros(series.times[0]) == start + timedelta(hours=1)
+    indexes = series.span(start + timedelta(hours=2), start + timedelta(hours=5))
+    assert series.rows(indexes, ('systolic', 'pulse')) == [(120, None)]
+    assert series.latest(('user_id', 'systolic')) == (1, 130)
+    assert series.nbytes == 512 + 3 * (8 + 2 + 2 + 2)
+
+
+def test_lru_eviction_respects_memory_cap():
+    hot_cache = MeasurementHotCache(max_bytes=1200, window_days=31)
+    for user_id in (1, 2, 3):
+        hot_cache._store(UserSeries(user_id, 'v', 0))
+    assert list(hot_cache._entries) == [2, 3]
+    assert hot_cache.stats()['evictions'] == 1
+    assert hot_cache.stats()['bytes'] == 1024
+
+
+@override_settings(MEASUREMENT_HOT_CACHE=True)
+class HotCacheApiTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_hot_cache()
+        self.addCleanup(reset_hot_cache)
+        self.django_user = DjangoUser.objects.create_user(
+            username='hot_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='hot_user', timezone='Europe/Moscow'
+        )
+        self.client.force_authenticate(user=self.django_user)
+        now = timezone.now().replace(microsecond=123456)
+        self.measurements = [
+            BloodPressureMeasurement.objects.create(
+                user=self.user,
+                systolic=120 + day,
+                diastolic=80 - day,
+                pulse=None if day % 2 else 60 + day,
+                measured_at=now - timedelta(days=day, hours=1),
+            )
+            for day in range(6)
+        ]
+        self.since = (now - timedelta(days=10)).date().isoformat()
+
+    def get(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_list_and_stats_match_database(self):
+        for ordering in ('', 'measured_at'):
+            params = {'created_at__gte': self.since, 'ordering': ordering}
+            hot = self.get('measurement-list', **params)
+            with override_settings(MEASUREMENT_HOT_CACHE=False):
+                cache.clear()
+                cold = self.get('measurement-list', **params)
+            self.assertEqual(hot, cold)
+
+        hot_stats = self.get('measurement-stats', created_at__gte=self.since)
+        with override_settings(MEASUREMENT_HOT_CACHE=False):
+            cache.clear()
+            cold_stats = self.get('measurement-stats', created_at__gte=self.since)
+        self.assertEqual(hot_stats, cold_stats)
+        self.assertEqual(hot_stats['count'], 6)
+
+    def test_writes_append_or_invalidate(self):
+        hot_cache = get_hot_cache()
+        self.get('measurement-list', created_at__gte=self.since)
+        self.get('measurement-list', created_at__gte=self.since, page_size=2)
+        self.assertEqual((hot_cache.hits, hot_cache.misses), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BloodPressureMeasurement.objects.create(user=self.user, systolic=140, diastolic=90)
+        data = self.get('measurement-list', created_at__gte=self.since)
+        self.assertEqual(data['count'], 7)
+        self.assertEqual(data['results'][0]['systolic'], 140)
+        self.assertEqual((hot_cache.hits, hot_cache.misses), (2, 1))
+
+        self.measurements[0].systolic = 99
+        with self.captureOnCommitCallbacks(execute=True):
+            self.measurements[0].save()
+        data = self.get('measurement-list', created_at__gte=self.since)
+        self.assertEqual(data['results'][1]['systolic'], 99)
+        self.assertEqual(hot_cache.misses, 2)
+
+    def test_write_of_another_process_after_the_bump_is_not_lost(self):
+        self.get('measurement-list', created_at__gte=self.since)
+
+        def bump_then_other_process_writes(*scopes):
+            versions = bump_data_version(*scopes)
+            BloodPressureMeasurement.objects.bulk_create(
+                [BloodPressureMeasurement(user=self.user, systolic=150, diastolic=95)]
+            )
+            bump_data_version(alice_user_scope(self.user))
+            return versions
+
+        with (
+            mock.patch(
+                'alice_skill.signals.bump_data_version', side_effect=bump_then_other_process_writes
+            ),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            BloodPressureMeasurement.objects.create(user=self.user, systolic=140, diastolic=90)
+
+        data = self.get('measurement-list', created_at__gte=self.since)
+        self.assertEqual(data['count'], 8)
+        self.assertEqual({row['systolic'] for row in data['results'][:2]}, {140, 150})
+
+    def test_entry_behind_the_version_is_dropped_on_write(self):
+        hot_cache = get_hot_cache()
+        self.get('measurement-list', created_at__gte=self.since)
+        # Another process wrote since the entry was loaded
+        bump_data_version(alice_user_scope(self.user))
+        with self.captureOnCommitCallbacks(execute=True):
+            BloodPressureMeasurement.objects.create(user=self.user, systolic=140, diastolic=90)
+        self.assertNotIn(self.user.pk, hot_cache._entries)
+
+    def test_rolled_back_write_is_not_appended(self):
+        hot_cache = get_hot_cache()
+        self.get('measurement-list', created_at__gte=self.since)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            BloodPressureMeasurement.objects.create(user=self.user, systolic=140, diastolic=90)
+            raise RuntimeError
+
+        data = self.get('measurement-list', created_at__gte=self.since)
+        self.assertEqual(data['count'], 6)
+        self.assertNotIn(140, [row['systolic'] for row in data['results']])
+        self.assertEqual(len(hot_cache._entries[self.user.pk].times), 6)
+
+    def test_out_of_window_range_uses_database(self):
+        old = timezone.now() - timedelta(days=90)
+        BloodPressureMeasurement.objects.create(
+            user=self.user, systolic=150, diastolic=95, measured_at=old
+        )
+        data = self.get(
+            'measurement-list', created_at__gte=(old - timedelta(days=1)).date().isoformat()
+        )
+        self.assertEqual(data['count'], 7)
+        self.assertEqual(get_hot_cache().hits, 0)
+
+    def test_health_reports_counters(self):
+        self.get('measurement-list', created_at__gte=self.since)
+        data = self.get('health-check')
+        self.assertEqual(data['hot_cache']['users'], 1)
+        self.assertEqual(data['hot_cache']['misses'], 1)
+
+
+@override_settings(MEASUREMENT_HOT_CACHE=True)
+class HotCacheLastMeasurementTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_hot_cache()
+        self.addCleanup(reset_hot_cache)
+        self.handler = LastMeasurementHandler()
+        self.factory = TestDataFactory()
+        self.user = AliceUser.objects.create(alice_user_id='u')
+
+    def test_latest_reading_older_than_window(self):
+        BloodPressureMeasurement.objects.create(
+            user=self.user,
+            systolic=118,
+            diastolic=76,
+            measured_at=timezone.now() - timedelta(days=200),
+        )
+        request = self.factory.create_validated_request_data(
+            original_utterance='покажи давление', user_id='u'
+        )
+        reply = self.handler.handle(request)
+        self.assertTrue(
+            reply.startswith(LastMeasurementMessages.REPLY.format(systolic=118, diastolic=76))
+        )
+        self.handler.handle(request)
+        self.assertEqual(get_hot_cache().hits, 1)
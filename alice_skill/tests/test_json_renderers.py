@@ -0,0 +1,98 @@
+import io
+import json
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
+from uuid import UUID
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from .. import renderers
+from ..messages import ViewMessages
+from ..parsers import FastJSONParser
+from ..renderers import FastJSONRenderer, orjson
+from ..views import AliceWebhookView
+
+BROWSABLE_API = 'rest_framework.renderers.BrowsableAPIRenderer'
+PAYLOAD = {
+    'measured_at': datetime(2024, 5, 1, 8, 0, 0, 123456, tzinfo=dt_timezone.utc),
+    'local': datetime(2024, 5, 1, 11, 0, tzinfo=dt_timezone(timedelta(hours=3))),
+    'naive': datetime(2024, 5, 1, 8, 0),
+    'day': date(2024, 5, 1),
+    'average': Decimal('121.50'),
+    'message': ViewMessages.USER_NOT_FOUND,
+    'lazy': gettext_lazy('Not found.'),
+    'id': UUID('12345678-1234-5678-1234-567812345678'),
+    'interval': timedelta(minutes=5),
+    1: ['Привет', 'line\u2028break\u2029'],
+    'big': 2**70,
+}
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_matches_drf_renderer(self):
+        for payload in (PAYLOAD, [PAYLOAD], {'results': []}, None):
+            self.assertEqual(
+                FastJSONRenderer().render(payload), JSONRenderer().render(payload)
+            )
+
+    def test_non_finite_floats_are_null(self):
+        payload = {'values': [float('nan'), float('inf'), -float('inf'), 1.5]}
+        self.assertEqual(FastJSONRenderer().render(payload), b'{"values":[null,null,null,1.5]}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(payload)
+
+    def test_orjson_encodes_common_payloads(self):
+        payload = {key: value for key, value in PAYLOAD.items() if key != 'big'}
+        with mock.patch.object(JSONRenderer, 'render') as stdlib:
+            FastJSONRenderer().render(payload)
+        stdlib.assert_not_called()
+
+    def test_indented_output_uses_drf_renderer(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_parser(self):
+        body = '{"text": "давление 120 на 80", "value": 1.5}'
+        parse = FastJSONParser().parse
+        self.assertEqual(
+            parse(io.BytesIO(body.encode())), {'text': 'давление 120 на 80', 'value': 1.5}
+        )
+        self.assertEqual(
+            parse(io.BytesIO(body.encode('utf-16')), parser_context={'encoding': 'utf-16'}),
+            json.loads(body),
+        )
+        for invalid in (b'{"value": NaN}', b'{"value": ', b'\xff'):
+            with self.assertRaises(ParseError):
+                parse(io.BytesIO(invalid))
+
+
+class RendererSelectionTests(APITestCase):
+    def test_machine_views_render_json_only(self):
+        self.assertEqual(AliceWebhookView.renderer_classes, [FastJSONRenderer])
+        response = self.client.get(reverse('health-live'), HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 406)
+        response = self.client.get(reverse('health-live'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['status'], 'alive')
+
+    def test_columnar_renderer_is_fast(self):
+        self.assertTrue(issubclass(renderers.ColumnarJSONRenderer, FastJSONRenderer))
+
+    def test_browsable_api_only_with_debug(self):
+        component = settings.BASE_DIR / 'config' / 'components' / 'drf.py'
+        for debug, expected in (('True', True), ('False', False)):
+            namespace = {}
+            with mock.patch.dict('os.environ', {'DEBUG': debug}):
+                exec(component.read_text(), namespace)
+            self.assertEqual(
+                BROWSABLE_API in namespace['REST_FRAMEWORK']['DEFAULT_RENDERER_CLASSES'],
+                expected,
+            )
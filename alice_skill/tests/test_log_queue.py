@@ -0,0 +1,95 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from unittest import mock
+
+from .. import log_queue
+from ..log_queue import (
+    PAYLOAD,
+    BackgroundQueueListener,
+    DeferredQueueHandler,
+    PayloadSampleFilter,
+)
+
+
+class ThreadRecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((self.format(record), threading.current_thread()))
+
+
+def configure(logger_name, target, rate=1.0):
+    # What dictConfig builds from the handler entries in LOGGING
+    handler = DeferredQueueHandler(queue.Queue())
+    handler.listener = BackgroundQueueListener(handler.queue, target)
+    handler.addFilter(PayloadSampleFilter(rate))
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return handler, handler.listener
+
+
+def test_logging_settings_use_queues():
+    for name in ('django', 'alice_skill', 'pyanywhere_bg'):
+        # pytest appends its capture handlers
+        handler = logging.getLogger(name).handlers[0]
+        assert isinstance(handler, DeferredQueueHandler)
+        assert isinstance(handler.listener, BackgroundQueueListener)
+        assert handler.listener._thread.is_alive()
+
+
+def test_payload_sampling():
+    payload = logging.makeLogRecord(PAYLOAD)
+    plain = logging.makeLogRecord({})
+    assert not PayloadSampleFilter(0).filter(payload)
+    assert PayloadSampleFilter(0).filter(plain)
+    assert PayloadSampleFilter(1).filter(payload)
+    with mock.patch.object(log_queue.random, 'random', side_effect=[0.2, 0.7]):
+        sampler = PayloadSampleFilter(0.5)
+        assert [sampler.filter(payload), sampler.filter(payload)] == [True, False]
+
+
+def test_records_are_formatted_by_the_listener_thread():
+    target = ThreadRecordingHandler()
+    handler, listener = configure('log_queue_test.listener', target, rate=0)
+    logger = logging.getLogger('log_queue_test.listener')
+
+    class Payload:
+        formatted_in = None
+
+        def __str__(self):
+            Payload.formatted_in = threading.current_thread()
+            return 'payload'
+
+    logger.info('Saved %s/%s', 120, 80)
+    logger.info('Reading %s', Payload())
+    logger.debug('Request data: %s', Payload(), extra=PAYLOAD)
+    listener.stop()
+
+    assert [message for message, _ in target.records] == ['Saved 120/80', 'Reading payload']
+    assert all(thread is not threading.current_thread() for _, thread in target.records)
+    assert Payload.formatted_in is target.records[1][1]
+
+
+def _log_in_child(logger_name):
+    logging.getLogger(logger_name).warning('from child')
+    for handler in logging.getLogger(logger_name).handlers:
+        handler.listener.stop()
+
+
+def test_listener_restarts_in_forked_workers(tmp_path):
+    path = tmp_path / 'worker.log'
+    handler, listener = configure('log_queue_test.fork', logging.FileHandler(path))
+    process = multiprocessing.get_context('fork').Process(
+        target=_log_in_child, args=('log_queue_test.fork',)
+    )
+    process.start()
+    process.join()
+    listener.stop()
+    assert process.exitcode == 0
+    assert path.read_text() == 'from child\n'
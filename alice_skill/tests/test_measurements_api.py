@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from alice_skill.tests.factories import TestDataFactory
@@ -13,6 +16,7 @@ from ..models import BloodPressureMeasurement, AliceUser
 
 class MeasurementsApiBasicCrudTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.list_url = reverse('measurement-list')
         self.django_user = DjangoUser.objects.create_user(
             username='test_user', password='testpassword'
@@ -94,6 +98,7 @@ class MeasurementsApiBasicCrudTests(APITestCase):
 
 class MeasurementsApiUpdateDeleteOrderingTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.list_url = reverse('measurement-list')
         self.django_user = DjangoUser.objects.create_user(
             username='test_user_ordering', password='testpassword'
@@ -135,6 +140,7 @@ class MeasurementsApiUpdateDeleteOrderingTests(APITestCase):
 
 class MeasurementsApiValidationTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.list_url = reverse('measurement-list')
         self.django_user = DjangoUser.objects.create_user(
             username='validation_user', password='testpassword'
@@ -155,9 +161,23 @@ class MeasurementsApiValidationTests(APITestCase):
         resp = self.client.post(self.list_url, bad_payload, format='json')
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_database_rejects_values_outside_serializer_limits(self):
+        for values in (
+            {'systolic': 20, 'diastolic': 10},
+            {'systolic': 120, 'diastolic': 80, 'pulse': 400},
+            {'systolic': 80, 'diastolic': 90},
+        ):
+            with self.subTest(values=values), self.assertRaises(IntegrityError):
+                with transaction.atomic():
+                    BloodPressureMeasurement.objects.create(user=self.user, **values)
+        BloodPressureMeasurement.objects.create(
+            user=self.user, systolic=300, diastolic=200, pulse=None
+        )
+
 
 class MeasurementsApiTimezoneTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.list_url = reverse('measurement-list')
         self.django_user = DjangoUser.objects.create_user(
             username='test_user_for_tz', password='testpassword'
@@ -267,6 +287,7 @@ class MeasurementsApiTimezoneTests(APITestCase):
 
 class MeasurementsApiFilteringTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.list_url = reverse('measurement-list')
         self.django_user = DjangoUser.objects.create_user(
             username='test_user_filtering', password='testpassword'
@@ -331,3 +352,121 @@ class MeasurementsApiFilteringTests(APITestCase):
         self.assertEqual(response.data['count'], 1)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['systolic'], 121)
+
+
+class MeasurementsApiQueryCountTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('measurement-list')
+        self.django_user = DjangoUser.objects.create_user(
+            username='query_count_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user,
+            alice_user_id='query_count_user',
+            timezone='Europe/Moscow',
+        )
+        for systolic in range(120, 125):
+            TestDataFactory.create_measurement(
+                user=self.user, systolic=systolic, diastolic=80
+            )
+
+    def test_authenticated_list_resolves_alice_user_once(self):
+        self.client.force_authenticate(user=self.django_user)
+        # AliceUser lookup, count and page
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                self.list_url, {'created_at__gte': '2000-01-01'}
+            )
+        self.assertEqual(response.data['count'], 5)
+
+    def test_bot_list_resolves_alice_user_once(self):
+        with self.settings(API_TOKEN='test_bot_token'):
+            with self.assertNumQueries(3):
+                response = self.client.get(
+                    self.list_url,
+                    {'user_id': self.user.alice_user_id, 'created_at__gte': '2000-01-01'},
+                    HTTP_AUTHORIZATION='Token test_bot_token',
+                )
+        self.assertEqual(response.data['count'], 5)
+        self.assertIn('+03:00', response.data['results'][0]['measured_at'])
+
+
+class MeasurementsApiLocalDateFilterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('measurement-list')
+        self.django_user = DjangoUser.objects.create_user(
+            username='local_date_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user,
+            alice_user_id='local_date_user',
+            timezone='Asia/Tokyo',
+        )
+        self.client.force_authenticate(user=self.django_user)
+        # 2024-03-09 22:30 UTC is already 2024-03-10 in Tokyo
+        TestDataFactory.create_measurement(
+            user=self.user,
+            systolic=120,
+            diastolic=80,
+            measured_at=datetime(2024, 3, 9, 22, 30, tzinfo=ZoneInfo('UTC')),
+        )
+
+    def test_date_filters_use_user_local_day(self):
+        response = self.client.get(
+            self.list_url,
+            {'created_at__gte': '2024-03-10', 'created_at__lte': '2024-03-10'},
+        )
+        self.assertEqual(response.data['count'], 1)
+
+        response = self.client.get(self.list_url, {'created_at__lte': '2024-03-09'})
+        self.assertEqual(response.data['count'], 0)
+
+
+class MeasurementsApiSparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('measurement-list')
+        self.django_user = DjangoUser.objects.create_user(
+            username='sparse_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='sparse_user', timezone='Europe/Moscow'
+        )
+        self.measurement = TestDataFactory.create_measurement(
+            user=self.user, systolic=120, diastolic=80, pulse=60
+        )
+        self.client.force_authenticate(user=self.django_user)
+
+    def test_list_returns_only_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'fields': 'systolic,diastolic'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'systolic': 120, 'diastolic': 80}])
+        page_sql = queries[-1]['sql']
+        self.assertNotIn('JOIN', page_sql)
+        self.assertNotIn('"pulse"', page_sql)
+
+    def test_retrieve_defers_unrequested_fields(self):
+        detail_url = reverse('measurement-detail', args=[self.measurement.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(detail_url, {'fields': 'measured_at,pulse'})
+        self.assertEqual(set(response.data), {'measured_at', 'pulse'})
+        self.assertIn('+03:00', response.data['measured_at'])
+        self.assertNotIn('JOIN', queries[-1]['sql'])
+        self.assertNotIn('"systolic"', queries[-1]['sql'])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.list_url, {'fields': 'systolic,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+    def test_fields_ignored_for_writes(self):
+        response = self.client.post(
+            f'{self.list_url}?fields=systolic',
+            {'user': self.user.pk, 'systolic': 130, 'diastolic': 85},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('diastolic', response.data)
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..middleware import is_machine_request
+
+
+def test_machine_requests_are_recognised():
+    factory = RequestFactory()
+    assert is_machine_request(factory.post('/alice_webhook/'))
+    assert is_machine_request(factory.get('/health/ready/'))
+    assert is_machine_request(
+        factory.get('/api/v1/measurements/', HTTP_AUTHORIZATION='Token bot-token')
+    )
+    assert not is_machine_request(factory.get('/api/v1/measurements/'))
+    assert not is_machine_request(
+        factory.get('/api/v1/measurements/', HTTP_AUTHORIZATION='Basic dXNlcjpwYXNz')
+    )
+    assert not is_machine_request(
+        factory.get('/admin/', HTTP_AUTHORIZATION='Token bot-token')
+    )
+
+
+@override_settings(API_TOKEN='test_bot_token')
+class PathDispatchMiddlewareTests(TestCase):
+    def test_machine_endpoints_skip_browser_middleware(self):
+        for response in (
+            self.client.get(reverse('health-live')),
+            self.client.get(
+                reverse('measurement-list'), HTTP_AUTHORIZATION='Token test_bot_token'
+            ),
+        ):
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(hasattr(response.wsgi_request, 'session'))
+            self.assertNotIn('csrftoken', response.cookies)
+
+    def test_browser_requests_keep_sessions_and_auth(self):
+        user = User.objects.create_user(username='patient', password='secret')
+        self.client.force_login(user)
+        response = self.client.get(reverse('measurement-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, user)
+        self.assertTrue(hasattr(response.wsgi_request, '_messages'))
+
+    def test_csrf_is_still_checked_for_browser_forms(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(
+            reverse('admin:login'), {'username': 'patient', 'password': 'secret'}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('csrftoken', client.get(reverse('admin:login')).cookies)
@@ -0,0 +1,110 @@
+import multiprocessing
+import threading
+from unittest import mock
+
+import pytest
+
+from .. import mmap_cache
+from ..mmap_cache import SEQ, MmapCache
+
+
+def make_cache(path, **options):
+    return MmapCache(str(path), {'OPTIONS': {'SLOT_COUNT': 64, 'SLOT_SIZE': 256, **options}})
+
+
+def test_cache_api(tmp_path):
+    cache = make_cache(tmp_path / 'cache.mmap')
+    cache.set('reading', {'systolic': 120})
+    assert cache.get('reading') == {'systolic': 120}
+    assert cache.get('missing', 'default') == 'default'
+    assert not cache.add('reading', 1)
+    assert cache.add('count', 1)
+    assert cache.incr('count', 4) == 5
+    assert cache.touch('count', 100)
+    assert cache.delete('reading')
+    assert not cache.has_key('reading')
+    with pytest.raises(ValueError):
+        cache.incr('reading')
+
+    cache.set('short', 1, timeout=0)
+    assert cache.get('short') is None
+    cache.set_many({'a': 1, 'b': 2})
+    cache.clear()
+    assert cache.get_many(['a', 'b', 'count']) == {}
+
+
+def test_values_larger_than_a_slot_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path / 'cache.mmap')
+    cache.set('chart', 'small')
+    cache.set('chart', 'x' * 1000)
+    assert cache.get('chart') is None
+
+
+def test_full_bucket_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path / 'cache.mmap', SLOT_COUNT=2, BUCKET_SIZE=2)
+    clock = iter(range(1000, 2000))
+    with mock.patch.object(mmap_cache.time, 'time', side_effect=lambda: next(clock)):
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+
+def test_reads_retry_while_a_slot_is_being_written(tmp_path):
+    cache = make_cache(tmp_path / 'cache.mmap', SLOT_COUNT=1, BUCKET_SIZE=1)
+    cache.set('key', 'value')
+    offset = cache._slot_offset(0)
+    seq = SEQ.unpack_from(cache._map, offset)[0]
+    SEQ.pack_into(cache._map, offset, seq + 1)
+    assert cache.get('key') is None
+    SEQ.pack_into(cache._map, offset, seq)
+    assert cache.get('key') == 'value'
+
+
+def test_layout_mismatch_is_rejected(tmp_path):
+    make_cache(tmp_path / 'cache.mmap').set('key', 1)
+    with pytest.raises(ValueError, match='different cache layout'):
+        make_cache(tmp_path / 'cache.mmap', SLOT_SIZE=512).get('key')
+
+
+def test_threads_share_one_mapping(tmp_path):
+    path = tmp_path / 'cache.mmap'
+    make_cache(path).set('hits', 0)
+
+    def count():
+        # Django creates a cache instance per thread
+        cache = make_cache(path)
+        for _ in range(200):
+            cache.incr('hits')
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert make_cache(path).get('hits') == 800
+
+
+def _child_incr(path, times):
+    cache = make_cache(path)
+    for _ in range(times):
+        cache.incr('hits')
+    cache.set('child', 'hello')
+
+
+def test_processes_share_the_cache(tmp_path):
+    path = tmp_path / 'cache.mmap'
+    cache = make_cache(path)
+    cache.set('hits', 0)
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_child_incr, args=(path, 100)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for _ in range(100):
+        cache.incr('hits')
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    assert cache.get('hits') == 400
+    assert cache.get('child') == 'hello'
@@ -0,0 +1,114 @@
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from alice_skill.tests.factories import TestDataFactory
+
+from ..cache import alice_scope, django_user_scope, get_data_version
+from ..models import AliceUser
+
+
+class MeasurementsConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_url = reverse('measurement-list')
+        self.django_user = DjangoUser.objects.create_user(
+            username='etag_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='etag_user'
+        )
+        self.measurement = TestDataFactory.create_measurement(
+            user=self.user, systolic=120, diastolic=80
+        )
+        self.client.force_authenticate(user=self.django_user)
+
+    def test_list_returns_etag(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_cached_body_served_without_measurement_queries(self):
+        first = self.client.get(self.list_url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.list_url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertFalse(
+            [q for q in queries if 'bloodpressuremeasurement' in q['sql']]
+        )
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            TestDataFactory.create_measurement(user=self.user, systolic=130, diastolic=85)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_delete_changes_detail_etag(self):
+        detail_url = reverse('measurement-detail', args=[self.measurement.pk])
+        etag = self.client.get(detail_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.measurement.delete()
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_timezone_change_bumps_version(self):
+        version = get_data_version(alice_scope(self.user.alice_user_id))
+        self.user.timezone = 'Europe/Moscow'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertNotEqual(
+            get_data_version(alice_scope(self.user.alice_user_id)), version
+        )
+
+    def test_version_is_bumped_only_after_commit(self):
+        scope = django_user_scope(self.django_user.pk)
+        version = get_data_version(scope)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            TestDataFactory.create_measurement(user=self.user, systolic=130, diastolic=85)
+            # A concurrent read still sees the committed rows under this version
+            self.assertEqual(get_data_version(scope), version)
+        self.assertTrue(callbacks)
+        self.assertNotEqual(get_data_version(scope), version)
+
+    def test_relinking_bumps_previous_owner(self):
+        previous_owner = django_user_scope(self.django_user.pk)
+        etag = self.client.get(self.list_url)['ETag']
+        version = get_data_version(previous_owner)
+        self.user.user = DjangoUser.objects.create_user(username='new_owner')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertNotEqual(get_data_version(previous_owner), version)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_bot_etag_is_scoped_by_user_id(self):
+        self.client.logout()
+        with self.settings(API_TOKEN='test_bot_token'):
+            headers = {'HTTP_AUTHORIZATION': 'Token test_bot_token'}
+            own = self.client.get(self.list_url, {'user_id': 'etag_user'}, **headers)
+            other = self.client.get(
+                self.list_url,
+                {'user_id': 'other_user'},
+                HTTP_IF_NONE_MATCH=own['ETag'],
+                **headers,
+            )
+        self.assertEqual(own.data['count'], 1)
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+        self.assertEqual(other.data['count'], 0)
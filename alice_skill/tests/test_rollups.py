@@ -0,0 +1,142 @@
+import io
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from alice_skill.tests.factories import TestDataFactory
+
+from ..cache import alice_user_scope, get_data_version
+from ..models import AliceUser, BloodPressureMeasurement, DailyMeasurementRollup
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class DailyRollupMaintenanceTests(TestCase):
+    def setUp(self):
+        self.user = AliceUser.objects.create(alice_user_id='rollup_user', timezone='Asia/Tokyo')
+
+    def rollup(self, day):
+        return DailyMeasurementRollup.objects.get(user=self.user, day=day)
+
+    def test_insert_updates_local_day_rollup(self):
+        # 16:00 UTC is already the next day in Tokyo
+        TestDataFactory.create_measurement(self.user, 120, 80, 60, utc(2024, 5, 1, 16))
+        TestDataFactory.create_measurement(self.user, 140, 90, None, utc(2024, 5, 1, 20))
+
+        rollup = self.rollup(date(2024, 5, 2))
+        self.assertEqual(rollup.count, 2)
+        self.assertEqual(rollup.systolic_sum, 260)
+        self.assertEqual(rollup.systolic_sum_sq, 120**2 + 140**2)
+        self.assertEqual((rollup.systolic_min, rollup.systolic_max), (120, 140))
+        self.assertEqual(rollup.pulse_count, 1)
+        self.assertEqual((rollup.pulse_min, rollup.pulse_max), (60, 60))
+
+    def test_update_moves_measurement_between_days(self):
+        measurement = TestDataFactory.create_measurement(
+            self.user, 120, 80, measured_at=utc(2024, 5, 1, 1)
+        )
+        TestDataFactory.create_measurement(self.user, 150, 95, measured_at=utc(2024, 5, 1, 2))
+
+        measurement.measured_at = utc(2024, 5, 3, 1)
+        measurement.save()
+
+        self.assertEqual(self.rollup(date(2024, 5, 1)).systolic_min, 150)
+        self.assertEqual(self.rollup(date(2024, 5, 3)).count, 1)
+
+    def test_delete_removes_empty_rollup(self):
+        measurement = TestDataFactory.create_measurement(
+            self.user, 120, 80, measured_at=utc(2024, 5, 1, 1)
+        )
+        measurement.delete()
+        self.assertFalse(DailyMeasurementRollup.objects.exists())
+
+    def test_timezone_change_regroups_days(self):
+        TestDataFactory.create_measurement(self.user, 120, 80, measured_at=utc(2024, 5, 1, 16))
+        self.user.timezone = 'UTC'
+        self.user.save(update_fields=['timezone'])
+        self.assertEqual(
+            list(DailyMeasurementRollup.objects.values_list('day', flat=True)),
+            [date(2024, 5, 1)],
+        )
+
+    def test_rebuild_command_restores_bulk_inserted_rows(self):
+        BloodPressureMeasurement.objects.bulk_create(
+            BloodPressureMeasurement(
+                user=self.user, systolic=120 + day, diastolic=80, measured_at=utc(2024, 5, day, 3)
+            )
+            for day in range(1, 11)
+        )
+        self.assertFalse(DailyMeasurementRollup.objects.exists())
+        version = get_data_version(alice_user_scope(self.user))
+
+        out = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                'rebuild_daily_rollups',
+                '--alice-user-id', 'rollup_user',
+                '--start', '2024-05-03',
+                '--end', '2024-05-05',
+                stdout=out,
+            )
+        self.assertIn('rebuilt 3 daily rollup(s)', out.getvalue())
+        self.assertEqual(self.rollup(date(2024, 5, 4)).systolic_sum, 124)
+        # Cached stats of the bulk inserted rows are no longer served
+        self.assertNotEqual(get_data_version(alice_user_scope(self.user)), version)
+
+
+class MeasurementStatsApiTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.stats_url = reverse('measurement-stats')
+        self.django_user = DjangoUser.objects.create_user(
+            username='stats_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(user=self.django_user, alice_user_id='stats_user')
+        TestDataFactory.create_measurement(self.user, 120, 80, 60, utc(2024, 5, 1, 8))
+        TestDataFactory.create_measurement(self.user, 140, 90, 80, utc(2024, 5, 2, 8))
+        TestDataFactory.create_measurement(self.user, 160, 100, None, utc(2024, 5, 10, 8))
+        other = AliceUser.objects.create(alice_user_id='other_stats_user')
+        TestDataFactory.create_measurement(other, 200, 120, measured_at=utc(2024, 5, 1, 8))
+        self.client.force_authenticate(user=self.django_user)
+
+    def test_stats_for_date_range(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.stats_url,
+                {'created_at__gte': '2024-05-01', 'created_at__lte': '2024-05-07'},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['days'], 2)
+        self.assertEqual(
+            response.data['systolic'], {'avg': 130.0, 'stddev': 10.0, 'min': 120, 'max': 140}
+        )
+        self.assertEqual(response.data['pulse']['avg'], 70.0)
+
+    def test_stats_without_pulse(self):
+        response = self.client.get(self.stats_url, {'created_at__gte': '2024-05-10'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertIsNone(response.data['pulse'])
+
+    def test_stats_for_bot_request(self):
+        self.client.force_authenticate(user=None)
+        with self.settings(API_TOKEN='test_bot_token'):
+            response = self.client.get(
+                self.stats_url,
+                {'user_id': 'other_stats_user'},
+                HTTP_AUTHORIZATION='Token test_bot_token',
+            )
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['systolic']['max'], 200)
+
+    def test_invalid_date_is_rejected(self):
+        response = self.client.get(self.stats_url, {'created_at__gte': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
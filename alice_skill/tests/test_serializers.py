@@ -1,6 +1,8 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
 from django.test import TestCase
-from ..models import AliceUser
-from ..serializers import BloodPressureMeasurementSerializer
+from ..models import AliceUser, BloodPressureMeasurement
+from ..serializers import BloodPressureMeasurementSerializer, MeasurementRowSerializer
 
 
 class BloodPressureSerializerValidationTests(TestCase):
@@ -22,3 +24,49 @@ class BloodPressureSerializerValidationTests(TestCase):
             data={'user': self.user.pk, 'systolic': 120, 'diastolic': 80}
         )
         self.assertTrue(ser.is_valid())
+
+
+class MeasurementRowSerializerTests(TestCase):
+    def setUp(self):
+        self.user = AliceUser.objects.create(alice_user_id='row_user')
+        start = datetime(2024, 3, 9, 22, 15, 30, 123456, tzinfo=dt_timezone.utc)
+        # Every 20 minutes for two days, crossing the US and EU DST switches
+        for i in range(150):
+            BloodPressureMeasurement.objects.create(
+                user=self.user,
+                systolic=120,
+                diastolic=80,
+                pulse=60 if i % 2 else None,
+                measured_at=start + timedelta(minutes=20 * i),
+            )
+        BloodPressureMeasurement.objects.create(
+            user=self.user,
+            systolic=125,
+            diastolic=85,
+            measured_at=datetime(2024, 3, 31, 0, 45, tzinfo=dt_timezone.utc),
+        )
+
+    def assert_same_output(self, tz_str):
+        queryset = BloodPressureMeasurement.objects.filter(user=self.user)
+        expected = BloodPressureMeasurementSerializer(
+            queryset, many=True, context={'timezone': tz_str}
+        ).data
+        rows = queryset.values_list(*MeasurementRowSerializer.value_fields)
+        actual = MeasurementRowSerializer(tz_str).many(rows)
+        self.assertEqual([dict(item) for item in expected], actual)
+
+    def test_matches_model_serializer(self):
+        for tz_str in (
+            None,
+            '',
+            'UTC',
+            'Europe/Moscow',
+            'America/New_York',
+            'Europe/Berlin',
+            'Asia/Kolkata',
+            'America/St_Johns',
+            'Australia/Lord_Howe',
+            'Invalid/Zone',
+        ):
+            with self.subTest(tz=tz_str):
+                self.assert_same_output(tz_str)
@@ -0,0 +1,122 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..downsampling import lttb
+from ..models import AliceUser, BloodPressureMeasurement
+
+
+@pytest.mark.parametrize('total', [0, 1, 2, 3, 10, 97, 1000])
+@pytest.mark.parametrize('threshold', [1, 2, 3, 7, 50, 2000])
+def test_lttb_keeps_bounds_and_order(total, threshold):
+    rows = [(i, (i * 37) % 101) for i in range(total)]
+    sampled = list(lttb(iter(rows), total, threshold, x=lambda r: r[0], y=lambda r: r[1]))
+
+    assert len(sampled) == min(total, threshold)
+    assert sampled == sorted(sampled)
+    if total and threshold > 1:
+        assert sampled[0] == rows[0]
+        assert sampled[-1] == rows[-1]
+
+
+def test_lttb_keeps_peak():
+    rows = [(i, 300 if i == 500 else 100) for i in range(1000)]
+    sampled = list(lttb(rows, len(rows), 20, x=lambda r: r[0], y=lambda r: r[1]))
+    assert (500, 300) in sampled
+
+
+def test_lttb_tolerates_shorter_stream():
+    rows = [(i, i % 5) for i in range(50)]
+    sampled = list(lttb(rows, 100, 10, x=lambda r: r[0], y=lambda r: r[1]))
+    assert len(sampled) <= 10
+    assert sampled == sorted(sampled)
+
+
+class MeasurementSeriesTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('measurement-series')
+        self.django_user = DjangoUser.objects.create_user(
+            username='series_user', password='testpassword'
+        )
+        self.user = AliceUser.objects.create(
+            user=self.django_user, alice_user_id='series_user', timezone='UTC'
+        )
+        self.other_user = AliceUser.objects.create(alice_user_id='other_series_user')
+        self.start = datetime(2024, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        BloodPressureMeasurement.objects.bulk_create(
+            BloodPressureMeasurement(
+                user=self.user,
+                systolic=120 + i % 15,
+                diastolic=80,
+                measured_at=self.start + timedelta(hours=12 * i),
+            )
+            for i in range(400)
+        )
+        BloodPressureMeasurement.objects.create(
+            user=self.other_user,
+            systolic=200,
+            diastolic=100,
+            measured_at=self.start,
+        )
+        self.client.force_authenticate(user=self.django_user)
+
+    def test_series_is_downsampled_in_chronological_order(self):
+        response = self.client.get(self.url, {'points': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 400)
+        results = response.data['results']
+        self.assertEqual(len(results), 50)
+        times = [row['measured_at'] for row in results]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(times[0], '2024-01-01T08:00:00+00:00')
+        self.assertNotIn(200, [row['systolic'] for row in results])
+
+    def test_default_points(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 200)
+
+    def test_short_history_is_returned_whole(self):
+        response = self.client.get(self.url, {'points': 1000, 'created_at__lte': '2024-01-05'})
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_date_filters_apply(self):
+        response = self.client.get(
+            self.url,
+            {'points': 10, 'created_at__gte': '2024-02-01', 'created_at__lte': '2024-02-29'},
+        )
+        self.assertEqual(response.data['count'], 58)
+        self.assertEqual(response.data['results'][0]['measured_at'], '2024-02-01T08:00:00+00:00')
+        self.assertEqual(response.data['results'][-1]['measured_at'], '2024-02-29T20:00:00+00:00')
+
+    def test_invalid_points(self):
+        for points in ('1', '5000', 'many'):
+            response = self.client.get(self.url, {'points': points})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('points', response.data)
+
+    def test_columnar_series(self):
+        response = self.client.get(self.url, {'points': 5, 'format': 'columnar'})
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 400)
+        self.assertEqual(data['user'], self.user.pk)
+        self.assertEqual(len(data['columns']['measured_at']), 5)
+        self.assertEqual(data['columns']['measured_at'][0], int(self.start.timestamp()))
+
+    def test_bot_series_is_scoped_by_user_id(self):
+        self.client.logout()
+        with self.settings(API_TOKEN='test_bot_token'):
+            response = self.client.get(
+                self.url,
+                {'user_id': 'other_series_user'},
+                HTTP_AUTHORIZATION='Token test_bot_token',
+            )
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['systolic'], 200)
@@ -0,0 +1,193 @@
+from collections import Counter
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import pre_delete, pre_save
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from ..helpers import get_hashed_telegram_id
+from ..models import (
+    AccountLinkToken,
+    AliceUser,
+    BloodPressureMeasurement,
+    DailyMeasurementRollup,
+    MeasurementChange,
+    UserShard,
+)
+from ..sharding import ShardRouter, jump_hash, placement_shard, shard_for_lookups
+
+SHARDS = ['default', 'shard_1', 'shard_2']
+
+
+def test_jump_hash_only_moves_keys_to_new_bucket():
+    keys = [key * 2654435761 for key in range(3000)]
+    before = [jump_hash(key, 3) for key in keys]
+    after = [jump_hash(key, 4) for key in keys]
+    assert set(before) == {0, 1, 2}
+    moved = [new for old, new in zip(before, after) if old != new]
+    assert set(moved) == {3}
+    assert len(moved) < len(keys) * 0.35
+
+
+@override_settings(DATABASE_SHARDS=SHARDS)
+def test_placement_is_stable_and_spread():
+    placed = Counter(placement_shard(f'alice_{i}') for i in range(3000))
+    assert set(placed) == set(SHARDS)
+    assert min(placed.values()) > 800
+    assert placement_shard('alice_7') == placement_shard('alice_7')
+    assert placement_shard(None) == 'default'
+
+
+class ShardRouterTests(SimpleTestCase):
+    def test_global_models_stay_on_default(self):
+        router = ShardRouter()
+        self.assertEqual(router.db_for_read(AccountLinkToken), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(UserShard), DEFAULT_DB_ALIAS)
+        self.assertIsNone(router.db_for_read(BloodPressureMeasurement))
+        self.assertFalse(router.allow_migrate('shard_1', 'alice_skill', 'usershard'))
+        self.assertIsNone(router.allow_migrate('shard_1', 'alice_skill', 'aliceuser'))
+
+    @override_settings(DATABASE_SHARDS=[DEFAULT_DB_ALIAS])
+    def test_lookups_are_ignored_without_sharding(self):
+        self.assertIsNone(shard_for_lookups({'alice_user_id': 'alice_1'}))
+
+
+def alice_user_id_on(shard: str) -> str:
+    return next(
+        f'alice_{i}' for i in range(1000) if placement_shard(f'alice_{i}') == shard
+    )
+
+
+@skipUnless(len(settings.DATABASE_SHARDS) > 1, 'DATABASE_SHARD_URLS is not set')
+@override_settings(API_TOKEN='test_bot_token')
+class ShardedDataTests(APITransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.shards = settings.DATABASE_SHARDS
+
+    def create_user(self, shard, **fields):
+        user, _ = AliceUser.objects.get_or_create(alice_user_id=alice_user_id_on(shard), **fields)
+        BloodPressureMeasurement.objects.create(
+            user=user, systolic=120, diastolic=80, measured_at=timezone.now()
+        )
+        return user
+
+    def test_user_data_lives_on_its_shard(self):
+        for shard in self.shards:
+            user = self.create_user(shard)
+            self.assertEqual(user._state.db, shard)
+            self.assertEqual(UserShard.objects.get(alice_user_id=user.alice_user_id).shard, shard)
+            for model in (BloodPressureMeasurement, DailyMeasurementRollup, MeasurementChange):
+                self.assertEqual(model.objects.using(shard).filter(user=user).count(), 1)
+            for other in set(self.shards) - {shard}:
+                self.assertFalse(
+                    AliceUser.objects.using(other).filter(alice_user_id=user.alice_user_id).exists()
+                )
+            # Manager-level selection finds the user's data without `using()`
+            self.assertEqual(
+                BloodPressureMeasurement.objects.filter(
+                    user__alice_user_id=user.alice_user_id
+                ).count(),
+                1,
+            )
+
+    def test_api_across_shards(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token test_bot_token')
+        users = {
+            str(100 + i): self.create_user(
+                shard, telegram_user_id_hash=get_hashed_telegram_id(str(100 + i))
+            )
+            for i, shard in enumerate(self.shards)
+        }
+        last_telegram_id, last_user = list(users.items())[-1]
+
+        response = self.client.get(reverse('user-by-telegram', args=[last_telegram_id]))
+        self.assertEqual(response.data['alice_user_id'], last_user.alice_user_id)
+
+        url = reverse('measurement-list')
+        params = f'?user_id={last_user.alice_user_id}'
+        response = self.client.post(
+            url + params,
+            {'user': last_user.pk, 'systolic': 130, 'diastolic': 85},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(url + params)
+        self.assertEqual([row['systolic'] for row in response.data['results']], [130, 120])
+
+        response = self.client.post(
+            reverse('user-bulk-lookup'),
+            {'telegram_user_ids': [*users, '999'], 'include_latest': True},
+            format='json',
+        )
+        self.assertEqual(
+            [item['alice_user_id'] for item in response.data['results']],
+            [user.alice_user_id for user in users.values()],
+        )
+        self.assertEqual(
+            [item['latest_measurement']['systolic'] for item in response.data['results']],
+            [120] * (len(users) - 1) + [130],
+        )
+        self.assertEqual(response.data['not_found'], ['999'])
+
+    def test_api_writes_run_in_a_transaction_on_the_users_shard(self):
+        shard = self.shards[-1]
+        user = self.create_user(shard)
+        atomic = []
+
+        def record(sender, instance, **kwargs):
+            atomic.append(
+                (connections[DEFAULT_DB_ALIAS].in_atomic_block, connections[shard].in_atomic_block)
+            )
+
+        pre_save.connect(record, sender=BloodPressureMeasurement)
+        pre_delete.connect(record, sender=BloodPressureMeasurement)
+        self.addCleanup(pre_save.disconnect, record, sender=BloodPressureMeasurement)
+        self.addCleanup(pre_delete.disconnect, record, sender=BloodPressureMeasurement)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token test_bot_token')
+        url = reverse('measurement-list')
+        params = f'?user_id={user.alice_user_id}'
+        response = self.client.post(
+            url + params, {'user': user.pk, 'systolic': 130, 'diastolic': 85}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = BloodPressureMeasurement.objects.filter(user=user, systolic=130).get()
+        detail = reverse('measurement-detail', args=[created.pk]) + params
+        response = self.client.patch(detail, {'pulse': 70}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.delete(detail)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(atomic, [(False, True)] * 3)
+
+    def test_rebalance_moves_misplaced_users(self):
+        target = self.shards[-1]
+        alice_user_id = alice_user_id_on(target)
+        user = AliceUser(alice_user_id=alice_user_id, timezone='Europe/Moscow')
+        user.save(using=DEFAULT_DB_ALIAS)
+        BloodPressureMeasurement.objects.create(user=user, systolic=125, diastolic=82)
+        self.assertEqual(UserShard.objects.get(alice_user_id=alice_user_id).shard, 'default')
+
+        out = StringIO()
+        call_command('rebalance_shards', dry_run=True, stdout=out)
+        self.assertIn(f'Would move {alice_user_id} from default to {target}', out.getvalue())
+
+        call_command('rebalance_shards', stdout=StringIO())
+        self.assertFalse(AliceUser.objects.using(DEFAULT_DB_ALIAS).exists())
+        self.assertEqual(UserShard.objects.get(alice_user_id=alice_user_id).shard, target)
+        moved = AliceUser.objects.get(alice_user_id=alice_user_id)
+        self.assertEqual((moved._state.db, moved.timezone), (target, 'Europe/Moscow'))
+        self.assertEqual(
+            list(moved.measurements.values_list('systolic', flat=True)), [125]
+        )
+        self.assertEqual(moved.daily_rollups.get().count, 1)
@@ -0,0 +1,97 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from .. import throttling
+from ..throttling import SharedAnonRateThrottle, SlidingWindowStore, get_throttle_store
+
+
+def hits(store, key, limit, duration, count, now):
+    with mock.patch.object(throttling.time, 'time', return_value=now):
+        return [store.hit(key, limit, duration) for _ in range(count)]
+
+
+def test_window_limit_and_wait():
+    store = SlidingWindowStore()
+    results = hits(store, 'anon_1', 3, 60, 4, now=6000.0)
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert results[-1][1] == 60.0
+    # Another key has its own counter
+    assert hits(store, 'anon_2', 3, 60, 1, now=6000.0)[0][0]
+
+
+def test_previous_window_is_weighted_by_overlap():
+    store = SlidingWindowStore()
+    hits(store, 'anon_1', 4, 60, 4, now=6000.0)
+    # Halfway into the next window half of the previous count still applies
+    results = hits(store, 'anon_1', 4, 60, 3, now=6090.0)
+    assert [allowed for allowed, _ in results] == [True, True, False]
+    assert results[-1][1] == 15.0
+    # Two windows later the old counts are gone
+    assert all(allowed for allowed, _ in hits(store, 'anon_1', 4, 60, 4, now=6240.0))
+
+
+def test_expired_counters_are_pruned():
+    store = SlidingWindowStore()
+    hits(store, 'anon_1', 3, 60, 1, now=6000.0)
+    hits(store, 'anon_2', 3, 60, 1, now=6000.0 + throttling.PRUNE_INTERVAL_SECONDS + 120)
+    rows = store._connect().execute('SELECT count(*) FROM throttle').fetchone()[0]
+    assert rows == 1
+
+
+def test_file_store_is_shared_and_atomic(tmp_path):
+    path = str(tmp_path / 'throttle.sqlite3')
+    # Separate stores stand in for worker processes with their own connections
+    workers = [SlidingWindowStore(path) for _ in range(4)]
+    allowed = []
+
+    def run(store):
+        for _ in range(40):
+            allowed.append(store.hit('user_1', 50, 3600)[0])
+
+    threads = [threading.Thread(target=run, args=(store,)) for store in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert allowed.count(True) == 50
+
+
+class ThreeAMinuteThrottle(SharedAnonRateThrottle):
+    rate = '3/min'
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [ThreeAMinuteThrottle]
+
+    def get(self, request):
+        return Response({'ok': True})
+
+
+class SharedThrottleTests(SimpleTestCase):
+    def test_drf_throttle_uses_store(self):
+        with override_settings(THROTTLE_STORE_PATH=''):
+            get_throttle_store().clear()
+            factory = APIRequestFactory()
+            statuses = [
+                ThrottledView.as_view()(factory.get('/', REMOTE_ADDR='10.0.0.1')).status_code
+                for _ in range(4)
+            ]
+            response = ThrottledView.as_view()(factory.get('/', REMOTE_ADDR='10.0.0.1'))
+            other = ThrottledView.as_view()(factory.get('/', REMOTE_ADDR='10.0.0.2'))
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        self.assertIn('Retry-After', response)
+        self.assertEqual(other.status_code, 200)
+
+    def test_unavailable_store_does_not_throttle(self):
+        with mock.patch.object(
+            SlidingWindowStore, 'hit', side_effect=throttling.sqlite3.OperationalError('locked')
+        ):
+            response = ThrottledView.as_view()(APIRequestFactory().get('/'))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# Expired counters are deleted at most this often per process
+PRUNE_INTERVAL_SECONDS = 60
+KEY_DIGEST_SIZE = 12
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS throttle ('
+    'key BLOB PRIMARY KEY, window INTEGER NOT NULL, current INTEGER NOT NULL, '
+    'previous INTEGER NOT NULL, expires INTEGER NOT NULL) WITHOUT ROWID'
+)
+UPSERT = (
+    'INSERT INTO throttle (key, window, current, previous, expires) VALUES (?, ?, ?, ?, ?) '
+    'ON CONFLICT(key) DO UPDATE SET window = excluded.window, current = excluded.current, '
+    'previous = excluded.previous, expires = excluded.expires'
+)
+
+
+def compact_key(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=KEY_DIGEST_SIZE).digest()
+
+
+class SlidingWindowStore:
+    """
+    Sliding-window request counters in a SQLite file shared by every worker
+    process, or in process memory when `path` is empty. Each key keeps the
+    counts of the current and previous fixed window; the previous count is
+    weighted by how much of it the sliding window still covers. The check
+    and the increment run in one IMMEDIATE transaction, so two workers never
+    both take the last request of a window.
+    """
+
+    def __init__(self, path: str = ''):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._pruned_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        # A forked worker must not share its parent's connection
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path or ':memory:',
+                timeout=getattr(settings, 'THROTTLE_STORE_TIMEOUT', 5.0),
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            if self.path:
+                connection.execute('PRAGMA journal_mode = WAL')
+                connection.execute('PRAGMA synchronous = NORMAL')
+            connection.execute(SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def hit(self, key: str, limit: int, duration: int) -> tuple[bool, float]:
+        """
+        Counts a request for `key` if fewer than `limit` requests were made
+        in the last `duration` seconds. Returns whether it was allowed and,
+        if not, the seconds to wait before the next one is.
+        """
+        now = time.time()
+        window, offset = divmod(now, duration)
+        window = int(window)
+        elapsed = offset / duration
+        digest = compact_key(key)
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute(
+                    'SELECT window, current, previous FROM throttle WHERE key = ?', (digest,)
+                ).fetchone()
+                current = previous = 0
+                if row is not None and row[0] == window:
+                    current, previous = row[1], row[2]
+                elif row is not None and row[0] == window - 1:
+                    previous = row[1]
+                allowed = previous * (1 - elapsed) + current + 1 <= limit
+                if allowed:
+                    connection.execute(
+                        UPSERT, (digest, window, current + 1, previous, (window + 2) * duration)
+                    )
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            if now - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+                connection.execute('DELETE FROM throttle WHERE expires < ?', (int(now),))
+                self._pruned_at = now
+        if allowed:
+            return True, 0.0
+        if current + 1 > limit or not previous:
+            # Nothing frees up before the next window starts
+            return False, (1 - elapsed) * duration
+        # The previous window's share shrinks as the sliding window moves on
+        needed = 1 - (limit - 1 - current) / previous
+        return False, max(needed - elapsed, 0.0) * duration
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute('DELETE FROM throttle')
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_throttle_store() -> SlidingWindowStore:
+    path = getattr(settings, 'THROTTLE_STORE_PATH', '')
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SlidingWindowStore(path)
+        return _stores[path]
+
+
+class SharedThrottleMixin:
+    """
+    Counts requests in the shared sliding-window store instead of the
+    Django cache, for `SimpleRateThrottle` subclasses. Requests are let
+    through if the store cannot be reached.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        try:
+            allowed, self._wait = get_throttle_store().hit(
+                self.key, self.num_requests, self.duration
+            )
+        except sqlite3.Error as e:
+            logger.error('Throttle store unavailable, not throttling: %s', e)
+            return True
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class SharedAnonRateThrottle(SharedThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SharedUserRateThrottle(SharedThrottleMixin, UserRateThrottle):
+    pass
@@ -2,12 +2,16 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     AliceWebhookView,
+    BatchView,
     BloodPressureMeasurementViewSet,
     LinkStatusView,
     UnlinkView,
     UserByTelegramView,
+    BulkUserLookupView,
     GenerateLinkTokenView,
     health_check,
+    liveness_check,
+    readiness_check,
 )
 
 router = DefaultRouter()
@@ -15,9 +19,13 @@ router.register(r"api/v1/measurements", BloodPressureMeasurementViewSet, basenam
 
 urlpatterns = [
     path("health/", health_check, name="health-check"),
+    path("health/live/", liveness_check, name="health-live"),
+    path("health/ready/", readiness_check, name="health-ready"),
     path("alice_webhook/", AliceWebhookView.as_view(), name="alice-webhook"),
     path("api/v1/link/status/", LinkStatusView.as_view(), name="link-status"),
     path("api/v1/link/unlink/", UnlinkView.as_view(), name="link-unlink"),
+    path("api/v1/batch/", BatchView.as_view(), name="batch"),
+    path("api/v1/users/bulk-lookup/", BulkUserLookupView.as_view(), name="user-bulk-lookup"),
     path("api/v1/users/by-telegram/<str:telegram_id>/", UserByTelegramView.as_view(), name="user-by-telegram"),
     path("api/v1/link/generate-token/", GenerateLinkTokenView.as_view(), name="link-generate-token"),
     path("", include(router.urls)),
@@ -1,48 +1,120 @@
+import heapq
 import logging
 
+from django.db import router
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+    renderer_classes,
+    throttle_classes,
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.filters import OrderingFilter
 
-from .filters import BloodPressureMeasurementFilter
+from .archive import ArchivedRange, ArchiveMergedRows
+from .batch import run_batch
+from .cache import (
+    alice_scope,
+    build_etag,
+    get_cached_response_data,
+    get_data_version,
+    get_request_cache_scope,
+    set_cached_response_data,
+    telegram_scope,
+)
+from .changes import build_change_feed, change_feed_settle_seconds
+from .charts import CHART_POINTS, CHART_ROW_FIELDS, render_png, render_svg
+from .db_connections import retry_on_locked
+from .db_router import (
+    has_recent_write,
+    mark_recent_write,
+    replica_configured,
+    reset_replica_reads,
+    use_replica_reads,
+)
+from .downsampling import lttb
+from .health import liveness, readiness
+from .filters import BloodPressureMeasurementFilter, DailyMeasurementRollupFilter
 from .messages import (
     GenerateLinkTokenViewMessages,
     UnlinkViewMessages,
     LinkStatusViewMessages,
     ViewMessages,
 )
-from .helpers import build_alice_response_payload, get_user_context, get_hashed_telegram_id
-from .models import BloodPressureMeasurement, AliceUser
-from .permissions import IsBot, IsAliceWebhook
+from .helpers import (
+    build_alice_response_payload,
+    get_hashed_telegram_id,
+    get_request_zoneinfo,
+    get_user_context,
+)
+from .models import (
+    AliceUser,
+    BloodPressureMeasurement,
+    DailyMeasurementRollup,
+    MeasurementArchive,
+    MeasurementChange,
+)
+from .permissions import HasTokenScope, IsBot, IsAliceWebhook
 from .services import (
     generate_link_token,
     TooManyRequests,
     get_alice_user,
+    bulk_lookup_users,
     process_alice_request,
     check_health,
 )
+from .throttling import SharedAnonRateThrottle, SharedUserRateThrottle
+from .sharding import db_for_user
 from .serializers import (
     AliceRequestSerializer,
     AliceResponseSerializer,
     BloodPressureMeasurementSerializer,
+    MeasurementColumnSerializer,
+    MeasurementRowSerializer,
     AliceUserSerializer,
+    BatchRequestSerializer,
+    BulkUserLookupRequestSerializer,
     GenerateLinkTokenRequestSerializer,
 )
 from .handlers.common import StartDialogHandler, UnparsedHandler
 from .handlers.link_account import LinkAccountHandler
 from .handlers.record_pressure import RecordPressureHandler
 from .handlers.last_measurement import LastMeasurementHandler
+from .hot_cache import get_hot_cache
+from .log_queue import PAYLOAD
 from .pagination import CustomPageNumberPagination
+from .parsers import FastJSONParser
+from .renderers import (
+    FastJSONRenderer,
+    PNGChartRenderer,
+    SVGChartRenderer,
+    get_columnar_renderers,
+)
+from .rollups import summarize_rollups
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SERIES_POINTS = 200
+MAX_SERIES_POINTS = 1000
+SERIES_CHUNK_SIZE = 2000
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 1000
+# Orderings the hot cache can serve, newest first unless `measured_at`
+HOT_CACHE_ORDERINGS = (None, '', 'measured_at', '-measured_at')
+
 
 @api_view(['GET'])
+@renderer_classes([FastJSONRenderer])
 @permission_classes([AllowAny])
 def health_check(request):
     """
@@ -55,9 +127,42 @@ def health_check(request):
     return Response(health, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
 
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def liveness_check(request):
+    """
+    Liveness probe: 200 while the process serves requests. Touches neither
+    the database nor the cache.
+    """
+    return Response(liveness())
+
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def readiness_check(request):
+    """
+    Readiness probe: database round trips, cache and migration state with
+    their latencies, served from a short-lived per-process cache.
+    Returns 503 while any check fails.
+    """
+    result = readiness.get()
+    if result['status'] == 'ready':
+        return Response(result, status=status.HTTP_200_OK)
+    return Response(result, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 class AliceWebhookView(APIView):
+    # Machine-to-machine views only speak JSON, without the browsable API
     authentication_classes = []
     permission_classes = [IsAliceWebhook]
+    renderer_classes = [FastJSONRenderer]
+    parser_classes = [FastJSONParser]
     handlers = [
         StartDialogHandler(),
         LinkAccountHandler(),
@@ -67,12 +172,15 @@ class AliceWebhookView(APIView):
     ]
 
     def post(self, request):
-        logger.debug(f'Incoming request: {request.data}')
+        logger.debug('Incoming request: %s', request.data, extra=PAYLOAD)
         request_serializer = AliceRequestSerializer(data=request.data)
         request_serializer.is_valid(raise_exception=True)
         validated_request = request_serializer.validated_data
 
-        response_text = process_alice_request(self.handlers, validated_request)
+        using = db_for_user(AliceUser(alice_user_id=validated_request['session']['user_id']))
+        response_text = retry_on_locked(process_alice_request, using=using)(
+            self.handlers, validated_request
+        )
 
         response_payload = build_alice_response_payload(
             response_text, validated_request
@@ -84,7 +192,82 @@ class AliceWebhookView(APIView):
         return Response(response_serializer.validated_data)
 
 
-class BloodPressureMeasurementViewSet(viewsets.ModelViewSet):
+class ReplicaReadMixin:
+    """
+    Lets a view's reads go to the read replica once the request has passed
+    authentication, unless the data it reads was written within the
+    read-your-writes window (see `db_router.mark_recent_write`).
+    """
+
+    replica_read_methods = SAFE_METHODS
+
+    def get_recent_write_keys(self, request) -> list[str]:
+        """
+        Data scopes whose recent writes keep this request on the primary.
+        """
+        scope = get_request_cache_scope(request)
+        return [scope] if scope else []
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in self.replica_read_methods
+            and replica_configured()
+            and not has_recent_write(*self.get_recent_write_keys(request))
+        ):
+            self._replica_reads_token = use_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_reads_token', None)
+        if token is not None:
+            reset_replica_reads(token)
+            self._replica_reads_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalCacheMixin:
+    """
+    Adds ETag/304 support and a versioned response cache to read actions.
+
+    The ETag is derived from the per-user data version (bumped by model
+    signals on every write), so an unchanged dataset is answered with
+    304 Not Modified or with a cached body, without touching the database.
+    """
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        scope = get_request_cache_scope(request)
+        if scope is None:
+            return handler(request, *args, **kwargs)
+
+        etag = build_etag(
+            scope,
+            get_data_version(scope),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+        )
+        quoted_etag = f'"{etag}"'
+        client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+        if quoted_etag in client_etags or '*' in client_etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = get_cached_response_data(etag)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = handler(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                set_cached_response_data(etag, response.data)
+
+        response['ETag'] = quoted_etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
+
+
+class BloodPressureMeasurementViewSet(
+    ReplicaReadMixin, ConditionalCacheMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows blood pressure measurements to be viewed or edited.
 
@@ -100,6 +283,40 @@ class BloodPressureMeasurementViewSet(viewsets.ModelViewSet):
     Ordering:
     - `measured_at`: Order by measurement time.
     - `systolic`, `diastolic`, `pulse`: Order by measurement values.
+
+    Sparse fieldsets:
+    - `fields`: Comma-separated subset of `user`, `systolic`, `diastolic`,
+      `pulse`, `measured_at` to return and load from the database.
+
+    Formats:
+    - `columnar` (`application/vnd.alicebp.columnar+json`) and `msgpack`:
+      column arrays with epoch seconds for `list`.
+
+    Statistics:
+    - `stats`: count, average, standard deviation, minimum and maximum per
+      metric over the date range, computed from daily rollups.
+
+    Series:
+    - `series`: at most `points` measurements (default 200) picked by LTTB
+      downsampling on systolic pressure, for charting long histories.
+
+    Charts:
+    - `chart`: PNG (default) or SVG (`?format=svg`) trend chart of the
+      downsampled series for the date range.
+
+    Change feed:
+    - `changes`: created, updated and deleted measurements after the `since`
+      cursor, oldest first, with tombstones for deletes.
+
+    Caching:
+    - `list`, `retrieve`, `stats`, `series`, `chart` and `changes` send an
+      ETag and honour `If-None-Match`.
+    - With `MEASUREMENT_HOT_CACHE` on, `list` and `stats` for one user with a
+      `created_at__gte` inside the cached window are served from memory.
+
+    Replica:
+    - With `DATABASE_REPLICA_URL` set, reads go to the replica unless the
+      user's data was written within `REPLICA_STICKY_SECONDS`.
     """
 
     # Use select_related to avoid N+1 queries when accessing the user relationship
@@ -107,32 +324,351 @@ class BloodPressureMeasurementViewSet(viewsets.ModelViewSet):
         '-measured_at'
     )
     serializer_class = BloodPressureMeasurementSerializer
-    permission_classes = [IsBot | IsAuthenticated]
-    throttle_classes = [AnonRateThrottle, UserRateThrottle]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *get_columnar_renderers()]
+    permission_classes = [IsBot | (IsAuthenticated & HasTokenScope)]
+    throttle_classes = [SharedAnonRateThrottle, SharedUserRateThrottle]
     filter_backends = [OrderingFilter, DjangoFilterBackend]
     filterset_class = BloodPressureMeasurementFilter
     search_fields = ['alice_user_id']
     ordering_fields = ['measured_at', 'systolic', 'diastolic', 'pulse']
     pagination_class = CustomPageNumberPagination
 
+    def get_requested_fields(self) -> tuple[str, ...] | None:
+        """
+        Parses the `fields` query parameter of a read request into a sparse fieldset.
+        """
+        if self.request.method not in SAFE_METHODS:
+            return None
+        raw = self.request.query_params.get('fields')
+        if not raw:
+            return None
+        requested = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+        unknown = [f for f in requested if f not in MeasurementRowSerializer.FIELD_SOURCES]
+        if unknown or not requested:
+            raise ValidationError(
+                {
+                    'fields': ViewMessages.INVALID_FIELDS.format(
+                        fields=', '.join(unknown),
+                        allowed=', '.join(MeasurementRowSerializer.FIELD_SOURCES),
+                    )
+                }
+            )
+        return requested
+
     def get_queryset(self):
         """
         Dynamically filters the queryset based on the user.
         Date range filtering is handled by DjangoFilterBackend.
+        A sparse fieldset is pushed down with `.only()`, without the user join
+        unless `user` is requested.
         """
         queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields:
+            if 'user' not in fields:
+                queryset = queryset.select_related(None)
+            queryset = queryset.only(*fields)
         return queryset.for_user(self.request)
 
     def get_serializer_context(self):
         """
-        Adds user and timezone information to the serializer context.
+        Adds user, timezone and sparse fieldset information to the serializer context.
         """
         context = super().get_serializer_context()
         context.update(get_user_context(self.request))
+        fields = self.get_requested_fields()
+        if fields:
+            context['fields'] = fields
         return context
 
+    def is_user_scoped(self, request) -> bool:
+        """
+        Whether `for_user` narrows the request to a single AliceUser.
+        """
+        return not (
+            request.user.is_superuser
+            and not getattr(request, 'is_bot', False)
+            and not request.query_params.get('user_id')
+        )
+
+    def get_date_range(self, request):
+        """
+        Returns the `measured_at` bounds of the date parameters, or None when
+        they are invalid (the filter backend reports the error).
+        """
+        date_filter = BloodPressureMeasurementFilter(
+            request.query_params,
+            queryset=BloodPressureMeasurement.objects.none(),
+            request=request,
+        )
+        if not date_filter.is_valid():
+            return None
+        return date_filter.get_measured_at_range()
+
+    def get_archived_records(self, request) -> ArchivedRange | None:
+        """
+        Archived measurements in the requested date range, or None unless
+        the range reaches back to an archive.
+        """
+        date_range = self.get_date_range(request)
+        if date_range is None:
+            return None
+        start, end = date_range
+        if self.is_user_scoped(request):
+            alice_user = AliceUser.objects.for_request(request)
+            if alice_user is None or alice_user.archived_until is None:
+                return None
+            if start is not None and start > alice_user.archived_until:
+                return None
+            archives = MeasurementArchive.objects.filter(user=alice_user)
+        else:
+            archives = MeasurementArchive.objects.all()
+        archived = ArchivedRange(archives, start, end)
+        return archived if archived.count() else None
+
+    def get_hot_series(self, request, ordered=True):
+        """
+        Returns the hot cache entry and the indexes of the requested date range
+        for a read scoped to one AliceUser, or None to use the database.
+        The range must start inside the cached window and after the archive.
+        """
+        hot_cache = get_hot_cache()
+        if hot_cache is None:
+            return None
+        if ordered and request.query_params.get('ordering') not in HOT_CACHE_ORDERINGS:
+            return None
+        if not self.is_user_scoped(request):
+            return None
+        alice_user = AliceUser.objects.for_request(request)
+        if alice_user is None:
+            return None
+
+        start, end = self.get_date_range(request) or (None, None)
+        if start is None:
+            return None
+        if alice_user.archived_until is not None and start <= alice_user.archived_until:
+            return None
+        entry = hot_cache.get(alice_user)
+        if not entry.covers(start):
+            return None
+        return entry, entry.span(start, end)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.list_rows, *args, **kwargs)
+
+    def list_rows(self, request, *args, **kwargs):
+        """
+        Lists measurements through the hot cache or the `values_list` fast
+        path, merging in archived measurements when the range reaches them.
+        """
+        columnar = getattr(request.accepted_renderer, 'columnar', False)
+        serializer_class = (
+            MeasurementColumnSerializer if columnar else MeasurementRowSerializer
+        )
+        serializer = serializer_class(
+            get_user_context(request).get('timezone'), self.get_requested_fields()
+        )
+        hot = self.get_hot_series(request)
+        if hot is not None:
+            entry, indexes = hot
+            descending = request.query_params.get('ordering') != 'measured_at'
+            rows = entry.rows(indexes, serializer.value_fields, descending)
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+            archived = self.get_archived_records(request)
+            if archived is not None:
+                ordering = OrderingFilter().get_ordering(request, queryset, self)
+                rows = ArchiveMergedRows(
+                    queryset,
+                    archived,
+                    ordering or list(queryset.query.order_by),
+                    serializer.value_fields,
+                )
+            else:
+                rows = queryset.values_list(*serializer.value_fields)
+
+        page = self.paginate_queryset(rows)
+        if not columnar:
+            if page is not None:
+                return self.get_paginated_response(serializer.many(page))
+            return Response(serializer.many(rows))
+
+        if page is None:
+            return Response(serializer.to_columns(list(rows)))
+        return Response(
+            {
+                'count': self.paginator.page.paginator.count,
+                'next': self.paginator.get_next_link(),
+                'previous': self.paginator.get_previous_link(),
+                **serializer.to_columns(page),
+            }
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+    # Writes run in a transaction on the owner's database (its shard, with
+    # sharding) that is retried while SQLite is locked
+    def perform_create(self, serializer):
+        using = db_for_user(serializer.validated_data['user'])
+        retry_on_locked(super().perform_create, using=using)(serializer)
+
+    def perform_update(self, serializer):
+        using = router.db_for_write(BloodPressureMeasurement, instance=serializer.instance)
+        retry_on_locked(super().perform_update, using=using)(serializer)
+
+    def perform_destroy(self, instance):
+        using = router.db_for_write(BloodPressureMeasurement, instance=instance)
+        retry_on_locked(super().perform_destroy, using=using)(instance)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request, *args, **kwargs):
+        """
+        Summary statistics for a local-day range, read from the hot cache or
+        from daily rollups.
+        """
+        return self.conditional_response(request, self.stats_from_rollups)
+
+    def stats_from_rollups(self, request, *args, **kwargs):
+        rollup_filter = DailyMeasurementRollupFilter(
+            request.query_params,
+            queryset=DailyMeasurementRollup.objects.for_user(request),
+            request=request,
+        )
+        if not rollup_filter.is_valid():
+            raise ValidationError(rollup_filter.errors)
+        hot = self.get_hot_series(request, ordered=False)
+        if hot is not None:
+            entry, indexes = hot
+            return Response(entry.summarize(indexes, get_request_zoneinfo(request)))
+        return Response(summarize_rollups(rollup_filter.qs))
+
+    @action(detail=False, methods=['get'])
+    def series(self, request, *args, **kwargs):
+        """
+        Downsampled measurements in chronological order for charts.
+        """
+        return self.conditional_response(request, self.downsampled_series)
+
+    def get_int_param(
+        self, name: str, default: int, minimum: int, maximum: int | None = None
+    ) -> int:
+        """
+        Parses an integer query parameter, rejecting values outside the bounds.
+        """
+        raw = self.request.query_params.get(name)
+        if raw is None:
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            value = None
+        if value is None or value < minimum or (maximum is not None and value > maximum):
+            message = (
+                ViewMessages.INVALID_INTEGER_MIN.format(min=minimum)
+                if maximum is None
+                else ViewMessages.INVALID_INTEGER_RANGE.format(min=minimum, max=maximum)
+            )
+            raise ValidationError({name: message})
+        return value
+
+    def downsample(self, request, fields, points, y_field='systolic'):
+        """
+        Streams the scoped, date-filtered measurements in `measured_at` order
+        through LTTB, holding only two buckets in memory at a time. Archived
+        measurements in the range are merged into the stream.
+        Returns the number of matching measurements and the selected rows.
+        """
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .select_related(None)
+            .order_by('measured_at')
+        )
+        total = queryset.count()
+        x_index = fields.index('measured_at')
+        y_index = fields.index(y_field)
+        stream = queryset.values_list(*fields).iterator(chunk_size=SERIES_CHUNK_SIZE)
+        archived = self.get_archived_records(request)
+        if archived is not None:
+            total += archived.count()
+            stream = heapq.merge(
+                stream,
+                (
+                    tuple(record[field] for field in fields)
+                    for record in archived.records(['measured_at'])
+                ),
+                key=lambda row: row[x_index],
+            )
+        rows = list(
+            lttb(
+                stream,
+                total,
+                points,
+                x=lambda row: row[x_index].timestamp(),
+                y=lambda row: row[y_index],
+            )
+        )
+        return total, rows
+
+    def downsampled_series(self, request, *args, **kwargs):
+        points = self.get_int_param(
+            'points', DEFAULT_SERIES_POINTS, minimum=2, maximum=MAX_SERIES_POINTS
+        )
+        columnar = getattr(request.accepted_renderer, 'columnar', False)
+        serializer_class = (
+            MeasurementColumnSerializer if columnar else MeasurementRowSerializer
+        )
+        serializer = serializer_class(get_user_context(request).get('timezone'))
+        total, rows = self.downsample(request, serializer.value_fields, points)
+
+        if columnar:
+            return Response({'count': total, **serializer.to_columns(rows)})
+        return Response({'count': total, 'results': serializer.many(rows)})
+
+    @action(
+        detail=False,
+        methods=['get'],
+        renderer_classes=[PNGChartRenderer, SVGChartRenderer],
+    )
+    def chart(self, request, *args, **kwargs):
+        """
+        Trend chart image for a local-day range, cached by data version and period.
+        """
+        return self.conditional_response(request, self.render_chart)
+
+    def render_chart(self, request, *args, **kwargs):
+        _, rows = self.downsample(request, CHART_ROW_FIELDS, CHART_POINTS)
+        render = render_svg if request.accepted_renderer.format == 'svg' else render_png
+        return Response(render(rows, get_request_zoneinfo(request)))
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request, *args, **kwargs):
+        """
+        Incremental sync: changes after the `since` cursor, at most `limit` per page.
+        """
+        if change_feed_settle_seconds():
+            # Entries settle without a data version bump, so the cached
+            # response would hide them until the next write
+            return self.change_feed(request, *args, **kwargs)
+        return self.conditional_response(request, self.change_feed)
+
+    def change_feed(self, request, *args, **kwargs):
+        since = self.get_int_param('since', 0, minimum=0)
+        limit = self.get_int_param(
+            'limit', DEFAULT_CHANGES_LIMIT, minimum=1, maximum=MAX_CHANGES_LIMIT
+        )
+        serializer = MeasurementRowSerializer(get_user_context(request).get('timezone'))
+        return Response(
+            build_change_feed(
+                MeasurementChange.objects.for_user(request), since, limit, serializer
+            )
+        )
+
 
 class UserAwareAPIView(APIView):
+    renderer_classes = [FastJSONRenderer]
+    parser_classes = [FastJSONParser]
+
     def get_user_from_request(self, request):
         alice_user_id = request.data.get('session', {}).get('user_id')
         telegram_user_id = request.data.get('telegram_user_id')
@@ -141,7 +677,7 @@ class UserAwareAPIView(APIView):
         )
 
 
-class LinkStatusView(UserAwareAPIView):
+class LinkStatusView(ReplicaReadMixin, UserAwareAPIView):
     """
     Checks the linking status of a user from either platform.
 
@@ -152,7 +688,19 @@ class LinkStatusView(UserAwareAPIView):
     """
 
     permission_classes = [AllowAny]
-    throttle_classes = [AnonRateThrottle]
+    throttle_classes = [SharedAnonRateThrottle]
+    # The status check only reads, so it may use the replica
+    replica_read_methods = ('POST',)
+
+    def get_recent_write_keys(self, request) -> list[str]:
+        keys = []
+        alice_user_id = request.data.get('session', {}).get('user_id')
+        if alice_user_id:
+            keys.append(alice_scope(alice_user_id))
+        telegram_user_id = request.data.get('telegram_user_id')
+        if telegram_user_id:
+            keys.append(telegram_scope(get_hashed_telegram_id(telegram_user_id)))
+        return keys
 
     def post(self, request, *args, **kwargs):
         user = self.get_user_from_request(request)
@@ -189,7 +737,7 @@ class UnlinkView(UserAwareAPIView):
     """
 
     permission_classes = [AllowAny]
-    throttle_classes = [AnonRateThrottle]
+    throttle_classes = [SharedAnonRateThrottle]
 
     def post(self, request, *args, **kwargs):
         try:
@@ -205,6 +753,8 @@ class UnlinkView(UserAwareAPIView):
                 )
 
             if user.telegram_user_id_hash:
+                # The save signal only knows the new (empty) link
+                mark_recent_write(telegram_scope(user.telegram_user_id_hash))
                 user.telegram_user_id_hash = None
                 user.save()
                 return Response(
@@ -224,12 +774,17 @@ class UnlinkView(UserAwareAPIView):
             )
 
 
-class UserByTelegramView(APIView):
+class UserByTelegramView(ReplicaReadMixin, APIView):
     """
     Retrieves a user by their Telegram ID.
     """
 
     permission_classes = [IsBot]
+    renderer_classes = [FastJSONRenderer]
+    parser_classes = [FastJSONParser]
+
+    def get_recent_write_keys(self, request) -> list[str]:
+        return [telegram_scope(get_hashed_telegram_id(self.kwargs['telegram_id']))]
 
     def get(self, request, telegram_id, *args, **kwargs):
         try:
@@ -244,6 +799,59 @@ class UserByTelegramView(APIView):
             )
 
 
+class BulkUserLookupView(APIView):
+    """
+    Resolves many users by their Telegram IDs in one request, for bot fan-out
+    such as reminders, digests and broadcasts.
+
+    Body: `telegram_user_ids` (list) and optional `include_latest` to attach
+    each user's latest measurement.
+    """
+
+    permission_classes = [IsBot]
+    throttle_classes = [SharedUserRateThrottle]
+    renderer_classes = [FastJSONRenderer]
+    parser_classes = [FastJSONParser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BulkUserLookupRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            bulk_lookup_users(
+                serializer.validated_data['telegram_user_ids'],
+                include_latest=serializer.validated_data['include_latest'],
+            ),
+            status=status.HTTP_200_OK,
+        )
+
+
+class BatchView(APIView):
+    """
+    Runs an ordered list of API sub-requests in-process and returns all results,
+    so a client interaction costs a single HTTP round trip.
+
+    Each operation has `method`, `path` and optional `id`, `params` and `body`.
+    Strings may reference earlier results as `${<id>.<field>...}`, e.g.
+    `${user.alice_user_id}`. Sub-requests run with the batch request's
+    credentials and their own permission checks. An operation whose reference
+    cannot be resolved fails with status 424.
+
+    API token scopes are checked per operation, so a read-only token may
+    batch reads.
+    """
+
+    permission_classes = [IsBot | IsAuthenticated]
+    throttle_classes = [SharedUserRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            {'results': run_batch(request, serializer.validated_data['operations'])},
+            status=status.HTTP_200_OK,
+        )
+
+
 class GenerateLinkTokenView(APIView):
     """
     Generates a linking token for a Telegram user.
@@ -252,7 +860,9 @@ class GenerateLinkTokenView(APIView):
     """
 
     permission_classes = [IsBot]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [SharedUserRateThrottle]
+    renderer_classes = [FastJSONRenderer]
+    parser_classes = [FastJSONParser]
 
     def post(self, request, *args, **kwargs):
         serializer = GenerateLinkTokenRequestSerializer(data=request.data)
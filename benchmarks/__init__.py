@@ -0,0 +1,38 @@
+"""
+Standalone performance benchmarks.
+
+Run from the repository root, e.g.:
+    uv run python -m benchmarks.bench_measurement_serializer
+"""
+import os
+import timeit
+
+
+def setup_django():
+    """
+    Configures Django for a benchmark run without requiring a populated .env.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ.setdefault('TELEGRAM_ID_HMAC_KEY', 'benchmark-hmac-key')
+    os.environ.setdefault('LINK_SECRET', 'benchmark-link-secret')
+
+    import django
+
+    django.setup()
+
+
+def best_of(func, number: int, repeat: int = 5) -> float:
+    """
+    Returns the best average seconds per call over `repeat` runs.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(title: str, results: dict[str, float], baseline: str) -> None:
+    """
+    Prints timings in milliseconds with the speedup relative to `baseline`.
+    """
+    print(title)
+    base = results[baseline]
+    for name, seconds in results.items():
+        print(f'  {name:<32} {seconds * 1000:10.3f} ms  x{base / seconds:6.2f}')
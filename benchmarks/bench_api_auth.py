@@ -0,0 +1,64 @@
+"""
+Compares the per-request cost of authenticating an API call with HTTP Basic
+(a full password hash check every time) against a hashed API token (one
+indexed lookup, then the cache).
+
+    uv run python -m benchmarks.bench_api_auth [calls]
+
+Runs against a throwaway test database with the configured password hasher
+(PBKDF2 by default).
+"""
+import base64
+import sys
+
+from benchmarks import best_of, report, setup_django
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.authentication import BasicAuthentication  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+
+from alice_skill.authentication import APITokenAuthentication, create_api_token  # noqa: E402
+
+
+def make_authenticate(authentication, header: str):
+    request = Request(RequestFactory().get('/api/v1/measurements/', HTTP_AUTHORIZATION=header))
+
+    def authenticate():
+        user, _ = authentication.authenticate(request)
+        assert user is not None
+
+    return authenticate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        cache.clear()
+        user = User.objects.create_user(username='bench', password='bench-password')
+        _, plaintext = create_api_token(user)
+        basic = base64.b64encode(b'bench:bench-password').decode()
+        timings = {
+            'Basic (password hash)': best_of(
+                make_authenticate(BasicAuthentication(), f'Basic {basic}'), number=count
+            ),
+            'API token (cached)': best_of(
+                make_authenticate(APITokenAuthentication(), f'Bearer {plaintext}'),
+                number=count * 100,
+            ),
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report('Authentication per request', timings, baseline='Basic (password hash)')
+
+
+if __name__ == '__main__':
+    main()
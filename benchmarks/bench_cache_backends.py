@@ -0,0 +1,62 @@
+"""
+Compares the memory-mapped cache backend with Django's local-memory and
+file-based caches on the operations the API performs most: reading a data
+version or cached response (hit and miss) and writing one.
+
+    uv run python -m benchmarks.bench_cache_backends [operations]
+
+LocMem is fastest but private to each worker process; the file-based cache
+and the mmap cache are shared by every worker on the host. Caches are
+created in a temporary directory.
+"""
+import sys
+import tempfile
+
+from benchmarks import best_of, report, setup_django
+
+setup_django()
+
+from django.core.cache.backends.filebased import FileBasedCache  # noqa: E402
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+
+from alice_skill.mmap_cache import MmapCache  # noqa: E402
+
+RESPONSE = {
+    'count': 10,
+    'results': [
+        {'user': 1, 'systolic': 120 + i, 'diastolic': 80, 'pulse': 70, 'measured_at': '2026-10-19 08:00:00'}
+        for i in range(10)
+    ],
+}
+
+
+def backends(directory: str) -> dict:
+    return {
+        'LocMem (per process)': LocMemCache('bench', {}),
+        'FileBased (shared)': FileBasedCache(f'{directory}/files', {}),
+        'Mmap (shared)': MmapCache(f'{directory}/cache.mmap', {}),
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    operations = {
+        'get hit': lambda cache, i: cache.get(f'bp:response:{i % 100}'),
+        'get miss': lambda cache, i: cache.get(f'bp:missing:{i}'),
+        'set': lambda cache, i: cache.set(f'bp:response:{i % 100}', RESPONSE, 300),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        caches = backends(directory)
+        for cache in caches.values():
+            for i in range(100):
+                cache.set(f'bp:response:{i}', RESPONSE, 300)
+        for operation, run in operations.items():
+            timings = {}
+            for name, cache in caches.items():
+                calls = iter(range(10**9))
+                timings[name] = best_of(lambda: run(cache, next(calls)), number=count)
+            report(f'{operation}, {count} operations per run', timings, baseline=next(iter(timings)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares Alice webhook throughput with a new database connection per request
+(`CONN_MAX_AGE=0`, the old behaviour) against persistent, health-checked
+connections, and reports how many connections each mode opened.
+
+    uv run python -m benchmarks.bench_db_connections [requests]
+
+Requests go through Django's WSGI handler, so connections are opened and
+closed exactly as in production. The benchmark runs against a test copy of
+the configured database (`DATABASE_URL`) that is created and dropped. The
+gap grows with connection cost: small on a local SQLite file, large on a
+managed PostgreSQL reached over TLS. With `DATABASE_POOL=True` the pool
+replaces both modes, so only the pooled run and its pool statistics are
+reported; compare it with a run without the pool.
+"""
+import os
+import sys
+import tempfile
+
+from benchmarks import best_of, report, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from alice_skill.db_connections import connection_metrics  # noqa: E402
+from alice_skill.views import AliceWebhookView  # noqa: E402
+
+UTTERANCES = ('запомни давление 120 на 80', 'покажи давление')
+WEBHOOK_SECRET = 'benchmark-secret'
+
+
+def make_webhook_call():
+    # All requests come from one client, which the anonymous rate limit would stop
+    AliceWebhookView.throttle_classes = []
+    handler = WSGIHandler()
+    factory = RequestFactory()
+    url = f'{reverse("alice-webhook")}?token={WEBHOOK_SECRET}'
+    calls = iter(range(10**9))
+
+    def call():
+        utterance = UTTERANCES[next(calls) % len(UTTERANCES)]
+        environ = factory.post(
+            url,
+            {
+                'meta': {'timezone': 'UTC'},
+                'request': {'original_utterance': utterance, 'type': 'SimpleUtterance'},
+                'session': {'session_id': 'bench', 'user_id': 'bench-user'},
+                'version': '1.0',
+            },
+            content_type='application/json',
+        ).environ
+        response = handler(environ, lambda status, headers: None)
+        assert response.status_code == 200, response.content
+        # Sends request_finished, which closes or keeps the connection
+        response.close()
+
+    return call
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pooled = 'pool' in connection.settings_dict.get('OPTIONS', {})
+    if connection.vendor == 'sqlite':
+        # A file, unlike the in-memory default, is really closed and reopened
+        test_file = os.path.join(tempfile.mkdtemp(), 'bench_connections.sqlite3')
+        connection.settings_dict['TEST']['NAME'] = test_file
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    modes = {'pool': 0} if pooled else {
+        'new connection per request': 0,
+        f'persistent (CONN_MAX_AGE={settings.DATABASE_CONN_MAX_AGE})': settings.DATABASE_CONN_MAX_AGE,
+    }
+    timings = {}
+    try:
+        with override_settings(
+            ALICE_WEBHOOK_SECRET=WEBHOOK_SECRET, DATABASE_CONNECTION_METRICS=True
+        ):
+            call = make_webhook_call()
+            for name, max_age in modes.items():
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                call()
+                connection_metrics.reset()
+                timings[name] = best_of(call, number=count, repeat=3)
+                stats = connection_metrics.stats().get(connection.alias, {})
+                print(
+                    f'{name}: {1 / timings[name]:.0f} requests/s, '
+                    f'{stats.get("opened", 0) / (count * 3):.2f} connection opens per request, '
+                    f'average wait {stats.get("wait_ms_avg")} ms'
+                )
+                if 'pool' in stats:
+                    print(f'  pool: {stats["pool"]}')
+    finally:
+        connection.close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report(
+        f'{connection.vendor}, {count} webhook requests per run',
+        timings,
+        baseline=next(iter(timings)),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Compares DRF's stdlib JSON renderer and parser with the orjson-based
+`FastJSONRenderer` and `FastJSONParser` on a full Alice webhook request and
+response and on measurement list pages.
+
+    uv run python -m benchmarks.bench_json_renderers [rows]
+
+Without `orjson` installed both sides use the stdlib encoder.
+"""
+import io
+import sys
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from benchmarks import best_of, report, setup_django
+
+setup_django()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.utils.serializer_helpers import ReturnDict  # noqa: E402
+
+from alice_skill.messages import RecordPressureMessages  # noqa: E402
+from alice_skill.parsers import FastJSONParser  # noqa: E402
+from alice_skill.renderers import FastJSONRenderer, orjson  # noqa: E402
+
+WEBHOOK_REQUEST = {
+    'meta': {
+        'locale': 'ru-RU',
+        'timezone': 'Europe/Moscow',
+        'client_id': 'ru.yandex.searchplugin/7.16 (none none; android 4.4.2)',
+        'interfaces': {'screen': {}, 'payments': {}, 'account_linking': {}},
+    },
+    'request': {
+        'command': 'запомни давление 130 на 75',
+        'original_utterance': 'запомни давление 130 на 75',
+        'nlu': {
+            'tokens': ['запомни', 'давление', '130', 'на', '75'],
+            'entities': [],
+            'intents': {},
+        },
+        'markup': {'dangerous_context': False},
+        'type': 'SimpleUtterance',
+    },
+    'session': {
+        'message_id': 4,
+        'session_id': '2eac4854-fce721f3-b845abba-20d60',
+        'skill_id': '3ad36498-f5rd-4079-a14b-788652932056',
+        'user_id': 'AC9WC3DF6FCE052E45A4566A48E6B7193774B84814CE49A922E163B8B29881DC',
+        'new': False,
+    },
+    'version': '1.0',
+}
+WEBHOOK_RESPONSE = ReturnDict(
+    {
+        'response': {
+            'text': RecordPressureMessages.SUCCESS.format(systolic=130, diastolic=75),
+            'end_session': False,
+        },
+        'session': {'session_id': '2eac4854-fce721f3-b845abba-20d60', 'new': False},
+        'version': '1.0',
+    },
+    serializer=None,
+)
+
+
+def build_page(rows: int, raw_datetimes: bool) -> dict:
+    """
+    A measurement list page: serializer output has formatted strings,
+    columnar and internal payloads carry datetimes.
+    """
+    start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    results = []
+    for i in range(rows):
+        measured_at = start + timedelta(minutes=37 * i)
+        results.append(
+            {
+                'id': i,
+                'user': 1,
+                'systolic': 110 + i % 40,
+                'diastolic': 70 + i % 20,
+                'pulse': 60 + i % 30 if i % 3 else None,
+                'measured_at': (
+                    measured_at if raw_datetimes else measured_at.strftime('%Y-%m-%d %H:%M:%S')
+                ),
+            }
+        )
+    return {
+        'count': rows * 10,
+        'next': 'http://testserver/api/v1/measurements/?page=2',
+        'previous': None,
+        'results': results,
+    }
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    if orjson is None:
+        print('orjson is not installed; FastJSONRenderer falls back to the stdlib encoder')
+    body = JSONRenderer().render(WEBHOOK_REQUEST)
+
+    def webhook(parser, renderer):
+        parser.parse(io.BytesIO(body))
+        renderer.render(WEBHOOK_RESPONSE)
+
+    timings = {
+        'DRF JSONParser + JSONRenderer': best_of(
+            lambda: webhook(JSONParser(), JSONRenderer()), number=5000
+        ),
+        'FastJSONParser + FastJSONRenderer': best_of(
+            lambda: webhook(FastJSONParser(), FastJSONRenderer()), number=5000
+        ),
+    }
+    report(
+        'Alice webhook: parse request and render response',
+        timings,
+        baseline='DRF JSONParser + JSONRenderer',
+    )
+
+    for raw_datetimes, label in ((False, 'formatted datetimes'), (True, 'datetime objects')):
+        page = build_page(rows, raw_datetimes)
+        timings = {
+            'DRF JSONRenderer': best_of(lambda: JSONRenderer().render(page), number=500),
+            'FastJSONRenderer': best_of(lambda: FastJSONRenderer().render(page), number=500),
+        }
+        report(f'List page of {rows} measurements, {label}', timings, baseline='DRF JSONRenderer')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares the DRF model serializer with the `values_list` fast path used by
+the measurement list.
+
+    uv run python -m benchmarks.bench_measurement_serializer [rows]
+"""
+import sys
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from benchmarks import best_of, report, setup_django
+
+setup_django()
+
+from alice_skill.models import AliceUser, BloodPressureMeasurement  # noqa: E402
+from alice_skill.serializers import (  # noqa: E402
+    BloodPressureMeasurementSerializer,
+    MeasurementRowSerializer,
+)
+
+
+def build_rows(count: int):
+    user = AliceUser(pk=1, alice_user_id='bench', timezone='Europe/Moscow')
+    start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    instances = [
+        BloodPressureMeasurement(
+            pk=i,
+            user=user,
+            systolic=110 + i % 40,
+            diastolic=70 + i % 20,
+            pulse=60 + i % 30 if i % 3 else None,
+            measured_at=start + timedelta(minutes=37 * i),
+        )
+        for i in range(count)
+    ]
+    rows = [
+        (m.user_id, m.systolic, m.diastolic, m.pulse, m.measured_at) for m in instances
+    ]
+    return instances, rows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    instances, rows = build_rows(count)
+
+    for tz_str in ('Europe/Moscow', 'America/New_York', None):
+        context = {'timezone': tz_str}
+
+        def model_serializer():
+            return BloodPressureMeasurementSerializer(
+                instances, many=True, context=context
+            ).data
+
+        def row_serializer():
+            return MeasurementRowSerializer(tz_str).many(rows)
+
+        assert [dict(item) for item in model_serializer()] == row_serializer()
+        report(
+            f'{count} rows, timezone={tz_str}',
+            {
+                'BloodPressureMeasurementSerializer': best_of(model_serializer, 5),
+                'MeasurementRowSerializer': best_of(row_serializer, 5),
+            },
+            baseline='BloodPressureMeasurementSerializer',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Compares the measurement storage layout before and after the compact schema:
+`integer` values with a `(user, measured_at)` index against `smallint` values
+with a covering index, on table and index size and on the latest, list and
+range summary queries.
+
+    uv run python -m benchmarks.bench_measurement_storage [rows] [users]
+
+Runs against the configured database (`DATABASE_URL`) in scratch tables that
+are dropped afterwards. The default is 100000 rows; pass 10000000 for the
+full-size comparison. On SQLite integers are stored by value and Django
+creates the index without `INCLUDE`, so both layouts are expected to match
+there; the difference shows on PostgreSQL.
+"""
+import itertools
+import random
+import sys
+from datetime import timedelta
+
+from benchmarks import best_of, report, setup_django
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.db.utils import DatabaseError  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+LAYOUTS = {
+    'integer, (user, time) index': ('bench_bp_integer', 'integer', False),
+    'smallint, covering index': ('bench_bp_compact', 'smallint', True),
+}
+BATCH_SIZE = 10000
+PAGE_SIZE = 20
+SAMPLE_USERS = 50
+QUERIES = {
+    'latest': (
+        'SELECT systolic, diastolic, pulse, measured_at FROM {table} '
+        'WHERE user_id = %s ORDER BY measured_at DESC LIMIT 1'
+    ),
+    'list': (
+        'SELECT systolic, diastolic, pulse, measured_at FROM {table} '
+        f'WHERE user_id = %s ORDER BY measured_at DESC LIMIT {PAGE_SIZE}'
+    ),
+    'stats (30 days)': (
+        'SELECT COUNT(*), AVG(systolic), MIN(systolic), MAX(systolic), '
+        'AVG(diastolic), MIN(diastolic), MAX(diastolic), AVG(pulse) '
+        'FROM {table} WHERE user_id = %s AND measured_at >= %s'
+    ),
+}
+
+
+def create_table(cursor, table: str, value_type: str) -> None:
+    timestamp = (
+        'timestamp with time zone' if connection.vendor == 'postgresql' else 'datetime'
+    )
+    cursor.execute(f'DROP TABLE IF EXISTS {table}')
+    cursor.execute(
+        f'CREATE TABLE {table} ('
+        'id bigint PRIMARY KEY, user_id bigint NOT NULL, '
+        f'systolic {value_type} NOT NULL, diastolic {value_type} NOT NULL, '
+        f'pulse {value_type} NULL, measured_at {timestamp} NOT NULL)'
+    )
+
+
+def create_index(cursor, table: str, covering: bool) -> None:
+    include = ''
+    if covering and connection.features.supports_covering_indexes:
+        include = ' INCLUDE (systolic, diastolic, pulse)'
+    cursor.execute(
+        f'CREATE INDEX {table}_idx ON {table} (user_id, measured_at DESC){include}'
+    )
+
+
+def generate_rows(count: int, users: int):
+    """
+    Yields measurements spread over the users, one every six hours per user
+    up to now.
+    """
+    now = timezone.now()
+    per_user = -(-count // users)
+    for pk in range(count):
+        user_id, step = divmod(pk, per_user)
+        yield (
+            pk + 1,
+            user_id + 1,
+            110 + pk % 40,
+            70 + pk % 20,
+            60 + pk % 30 if pk % 3 else None,
+            now - timedelta(hours=6 * (per_user - step)),
+        )
+
+
+def load(cursor, table: str, count: int, users: int) -> None:
+    rows = generate_rows(count, users)
+    sql = f'INSERT INTO {table} VALUES (%s, %s, %s, %s, %s, %s)'
+    while batch := list(itertools.islice(rows, BATCH_SIZE)):
+        cursor.executemany(sql, batch)
+
+
+def table_sizes(cursor, table: str) -> tuple[int | None, int | None]:
+    """
+    Returns the table and index size in bytes, None where the backend cannot tell.
+    """
+    if connection.vendor == 'postgresql':
+        cursor.execute('SELECT pg_relation_size(%s), pg_indexes_size(%s)', [table, table])
+        return cursor.fetchone()
+    try:
+        cursor.execute(
+            'SELECT name, SUM(pgsize) FROM dbstat WHERE name IN (%s, %s) GROUP BY name',
+            [table, f'{table}_idx'],
+        )
+    except DatabaseError:
+        return None, None
+    sizes = dict(cursor.fetchall())
+    return sizes.get(table), sizes.get(f'{table}_idx')
+
+
+def vacuum(cursor, table: str) -> None:
+    """
+    Refreshes statistics; on PostgreSQL also the visibility map that
+    index-only scans depend on.
+    """
+    if connection.vendor == 'postgresql':
+        cursor.execute(f'VACUUM ANALYZE {table}')
+    else:
+        cursor.execute(f'ANALYZE {table}')
+
+
+def explain(cursor, sql: str, params) -> str:
+    prefix = 'EXPLAIN' if connection.vendor == 'postgresql' else 'EXPLAIN QUERY PLAN'
+    cursor.execute(f'{prefix} {sql}', params)
+    return ' | '.join(str(row[-1]) for row in cursor.fetchall())
+
+
+def megabytes(value: int | None) -> str:
+    return 'n/a' if value is None else f'{value / 1024 / 1024:.1f} MB'
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else max(count // 2000, 1)
+    sample = random.Random(0).sample(range(1, users + 1), min(SAMPLE_USERS, users))
+    since = timezone.now() - timedelta(days=30)
+    timings = {name: {} for name in QUERIES}
+
+    with connection.cursor() as cursor:
+        for layout, (table, value_type, covering) in LAYOUTS.items():
+            create_table(cursor, table, value_type)
+            load(cursor, table, count, users)
+            create_index(cursor, table, covering)
+            vacuum(cursor, table)
+            table_size, index_size = table_sizes(cursor, table)
+            print(
+                f'{layout}: table {megabytes(table_size)}, index {megabytes(index_size)}'
+            )
+
+            for name, template in QUERIES.items():
+                sql = template.format(table=table)
+                user_ids = itertools.cycle(sample)
+
+                def params():
+                    user_id = next(user_ids)
+                    return [user_id, since] if '%s AND' in sql else [user_id]
+
+                def query():
+                    cursor.execute(sql, params())
+                    cursor.fetchall()
+
+                timings[name][layout] = best_of(query, number=200)
+                print(f'  {name}: {explain(cursor, sql, params())}')
+
+        for table, _, _ in LAYOUTS.values():
+            cursor.execute(f'DROP TABLE {table}')
+
+    baseline = next(iter(LAYOUTS))
+    for name, results in timings.items():
+        report(f'{count} rows, {users} users, {name}', results, baseline=baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Compares concurrent webhook writes on SQLite with the old connection setup
+(rollback journal, deferred transactions, no retries) against the SQLite
+profile (WAL, IMMEDIATE transactions, busy_timeout and retries with jitter).
+
+    uv run python -m benchmarks.bench_sqlite_concurrency [writers] [writes]
+
+Each writer thread records `writes` measurements through the Alice
+handlers, on its own connection, in a temporary SQLite file. A deferred
+transaction reads the user before it writes, and SQLite fails such a
+transaction at once with "database is locked" when another writer got there
+first, whatever the busy timeout. The report shows throughput and how many
+writes were lost in each mode.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks import report, setup_django
+
+setup_django()
+
+from django.db import OperationalError, connection, connections  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from alice_skill.db_connections import retry_on_locked  # noqa: E402
+from alice_skill.serializers import AliceRequestSerializer  # noqa: E402
+from alice_skill.services import process_alice_request  # noqa: E402
+from alice_skill.views import AliceWebhookView  # noqa: E402
+
+MODES = {
+    'rollback journal, deferred': {
+        'pragmas': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+        'transaction_mode': None,
+        'retries': 0,
+    },
+    'WAL profile with retries': {
+        'pragmas': None,
+        'transaction_mode': 'IMMEDIATE',
+        'retries': None,
+    },
+}
+
+
+def alice_request(writer: int) -> dict:
+    serializer = AliceRequestSerializer(
+        data={
+            'meta': {'timezone': 'UTC'},
+            'request': {
+                'original_utterance': 'запомни давление 120 на 80',
+                'type': 'SimpleUtterance',
+            },
+            'session': {'session_id': 'bench', 'user_id': f'bench-user-{writer}'},
+            'version': '1.0',
+        }
+    )
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def run_writers(writers: int, writes: int) -> tuple[float, int]:
+    handlers = AliceWebhookView.handlers
+    failed = []
+    start = threading.Barrier(writers + 1)
+
+    def writer(number):
+        request = alice_request(number)
+        record = retry_on_locked(process_alice_request)
+        errors = 0
+        start.wait()
+        for _ in range(writes):
+            try:
+                record(handlers, request)
+            except OperationalError:
+                errors += 1
+        failed.append(errors)
+        connections.close_all()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - began, sum(failed)
+
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    writes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    if connection.vendor != 'sqlite':
+        sys.exit('This benchmark needs a SQLite DATABASE_URL')
+    # Threads need a shared file, the in-memory test database is per connection
+    connection.settings_dict['TEST']['NAME'] = os.path.join(
+        tempfile.mkdtemp(), 'bench_concurrency.sqlite3'
+    )
+    options = connection.settings_dict.setdefault('OPTIONS', {})
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    timings = {}
+    try:
+        for name, mode in MODES.items():
+            connections.close_all()
+            if mode['transaction_mode']:
+                options['transaction_mode'] = mode['transaction_mode']
+            else:
+                options.pop('transaction_mode', None)
+            overrides = {}
+            if mode['pragmas'] is not None:
+                overrides['SQLITE_PRAGMAS'] = mode['pragmas']
+            if mode['retries'] is not None:
+                overrides['DATABASE_WRITE_RETRIES'] = mode['retries']
+            with override_settings(**overrides):
+                elapsed, failed = run_writers(writers, writes)
+            total = writers * writes
+            timings[name] = elapsed / (total - failed) if failed < total else float('inf')
+            print(
+                f'{name}: {(total - failed) / elapsed:.0f} writes/s, '
+                f'{failed} of {total} writes failed with "database is locked"'
+            )
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report(
+        f'sqlite, {writers} writers x {writes} writes, time per successful write',
+        timings,
+        baseline=next(iter(timings)),
+    )
+
+
+if __name__ == '__main__':
+    main()
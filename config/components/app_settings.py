@@ -6,3 +6,53 @@ SITE_URL = os.environ.get('SITE_URL', "https://pressure.loca.lt")
 STARTUP_PATH = "/background/start"
 STARTUP_INTERVAL = 60 * 30
 ALICE_BOT_USERNAME = os.environ.get('ALICE_BOT_USERNAME', "AliceBPBot") # Placeholder for the bot's username
+
+# Versioned response cache for measurement reads (ETag/304).
+# Use a cache shared by all workers in multi-process deployments.
+MEASUREMENT_CACHE_ALIAS = os.environ.get('MEASUREMENT_CACHE_ALIAS', 'default')
+MEASUREMENT_CACHE_TIMEOUT = int(os.environ.get('MEASUREMENT_CACHE_TIMEOUT', 300))
+
+# Optional default cache in a memory-mapped file shared by every worker on
+# the host (alice_skill.mmap_cache), for deployments without Redis. The file
+# takes CACHE_MMAP_SLOTS * CACHE_MMAP_SLOT_SIZE bytes; larger values are not cached.
+CACHE_MMAP_PATH = os.environ.get('CACHE_MMAP_PATH', '')
+if CACHE_MMAP_PATH:
+    CACHES = {
+        'default': {
+            'BACKEND': 'alice_skill.mmap_cache.MmapCache',
+            'LOCATION': CACHE_MMAP_PATH,
+            'OPTIONS': {
+                'SLOT_COUNT': int(os.environ.get('CACHE_MMAP_SLOTS', 8192)),
+                'SLOT_SIZE': int(os.environ.get('CACHE_MMAP_SLOT_SIZE', 4096)),
+            },
+        }
+    }
+
+# Process-local columnar cache of each active user's recent readings.
+# Answers latest, stats and recent lists without the ORM; off by default.
+MEASUREMENT_HOT_CACHE = os.environ.get('MEASUREMENT_HOT_CACHE', 'False') == 'True'
+MEASUREMENT_HOT_CACHE_DAYS = int(os.environ.get('MEASUREMENT_HOT_CACHE_DAYS', 31))
+MEASUREMENT_HOT_CACHE_MAX_BYTES = int(
+    os.environ.get('MEASUREMENT_HOT_CACHE_MAX_BYTES', 4 * 1024 * 1024)
+)
+
+# Measurements older than this are moved to the compressed archive by the
+# `archive_measurements` command (whole UTC months only).
+MEASUREMENT_ARCHIVE_AFTER_DAYS = int(os.environ.get('MEASUREMENT_ARCHIVE_AFTER_DAYS', 365))
+
+# Readiness probe results (/health/ready/) are reused for this many seconds,
+# then refreshed in the background; results older than the max age are
+# refreshed before answering.
+READINESS_CACHE_SECONDS = int(os.environ.get('READINESS_CACHE_SECONDS', 10))
+READINESS_MAX_AGE_SECONDS = int(os.environ.get('READINESS_MAX_AGE_SECONDS', 60))
+
+# How long a verified (or unknown) API token is cached before the next lookup
+API_TOKEN_CACHE_SECONDS = int(os.environ.get('API_TOKEN_CACHE_SECONDS', 60))
+
+# SQLite file holding DRF throttle counters, shared by all worker processes.
+# Set it to an empty string to keep them in each process's memory instead
+# (as the tests do), which multiplies the limits by the number of workers.
+THROTTLE_STORE_PATH = os.environ.get(
+    'THROTTLE_STORE_PATH', str(BASE_DIR / 'throttle.sqlite3')  # noqa
+)
+THROTTLE_STORE_TIMEOUT = float(os.environ.get('THROTTLE_STORE_TIMEOUT', 5))
@@ -1,8 +1,99 @@
 import dj_database_url
 import os
 
+# Connections are kept for DATABASE_CONN_MAX_AGE seconds instead of being
+# opened per request, and checked before reuse so a dropped connection is
+# replaced rather than failing the request.
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', 60))
+DATABASE_CONN_HEALTH_CHECKS = os.environ.get('DATABASE_CONN_HEALTH_CHECKS', 'True') == 'True'
+# Optional psycopg pool on PostgreSQL (requires psycopg[pool]). It replaces
+# persistent connections: each request borrows a pooled connection, waiting
+# up to DATABASE_POOL_TIMEOUT seconds when all are in use.
+DATABASE_POOL = os.environ.get('DATABASE_POOL', 'False') == 'True'
+DATABASE_POOL_MIN_SIZE = int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10))
+DATABASE_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 10))
+# Count connection opens and connect/pool wait time, reported by /health/
+DATABASE_CONNECTION_METRICS = os.environ.get('DATABASE_CONNECTION_METRICS', 'False') == 'True'
+
+# SQLite profile, applied to every new SQLite connection (see
+# alice_skill.db_connections.apply_sqlite_pragmas). WAL lets readers work
+# alongside the single writer, and IMMEDIATE transactions take the write lock
+# when they begin, so a busy database is waited on for busy_timeout instead
+# of failing mid-transaction with "database is locked". Size mmap_size to
+# cover the database file; cache_size is in KiB.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB', 32 * 1024)),
+    'temp_store': 'MEMORY',
+}
+SQLITE_TRANSACTION_MODE = os.environ.get('SQLITE_TRANSACTION_MODE', 'IMMEDIATE')
+# Write transactions still hitting a lock are retried this many times, with
+# jittered exponential backoff starting at DATABASE_WRITE_RETRY_DELAY seconds.
+DATABASE_WRITE_RETRIES = int(os.environ.get('DATABASE_WRITE_RETRIES', 3))
+DATABASE_WRITE_RETRY_DELAY = float(os.environ.get('DATABASE_WRITE_RETRY_DELAY', 0.05))
+
+
+def _database(url: str) -> dict:
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        conn_health_checks=DATABASE_CONN_HEALTH_CHECKS,
+    )
+    if DATABASE_POOL and config['ENGINE'] == 'django.db.backends.postgresql':
+        # Django refuses persistent connections together with a pool
+        config['CONN_MAX_AGE'] = 0
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DATABASE_POOL_MIN_SIZE,
+            'max_size': DATABASE_POOL_MAX_SIZE,
+            'timeout': DATABASE_POOL_TIMEOUT,
+        }
+    if config['ENGINE'] == 'django.db.backends.sqlite3' and SQLITE_TRANSACTION_MODE:
+        config.setdefault('OPTIONS', {})['transaction_mode'] = SQLITE_TRANSACTION_MODE
+    return config
+
+
 DATABASES = {
-    'default': dj_database_url.config(
-        default=os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')
+    'default': _database(os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')),
+}
+# Change feed entries are served once they are this old, so an entry whose
+# transaction commits after a newer one is not skipped by client cursors
+# (see alice_skill.changes.change_feed_settle_seconds). Keep it above the
+# longest write transaction. SQLite commits in id order and needs none.
+CHANGE_FEED_SETTLE_SECONDS = float(
+    os.environ.get(
+        'CHANGE_FEED_SETTLE_SECONDS',
+        0 if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' else 5,
     )
-}
\ No newline at end of file
+)
+
+# Optional horizontal sharding of per-user data. The default database is the
+# first shard and also keeps the global tables (auth, sessions, link tokens
+# and the shard directory); DATABASE_SHARD_URLS adds the others, in order.
+DATABASE_SHARDS = ['default']
+for url in filter(None, os.environ.get('DATABASE_SHARD_URLS', '').split(',')):
+    alias = f'shard_{len(DATABASE_SHARDS)}'
+    DATABASES[alias] = _database(url.strip())
+    DATABASE_SHARDS.append(alias)
+# How long shard directory lookups are cached
+SHARD_DIRECTORY_CACHE_SECONDS = int(os.environ.get('SHARD_DIRECTORY_CACHE_SECONDS', 300))
+
+if len(DATABASE_SHARDS) > 1:
+    DATABASE_ROUTERS = ['alice_skill.sharding.ShardRouter']
+# Optional read replica for safe API reads, not combined with sharding. Tests
+# mirror it to the primary test database.
+elif os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = {
+        **_database(os.environ['DATABASE_REPLICA_URL']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['alice_skill.db_router.ReplicaRouter']
+
+# Reads of data written within this window stay on the primary (read-your-writes).
+# Keep it above REPLICA_MAX_LAG_SECONDS, the lag at which the replica is skipped.
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 15))
+REPLICA_MAX_LAG_SECONDS = int(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+REPLICA_HEALTH_CHECK_INTERVAL = int(os.environ.get('REPLICA_HEALTH_CHECK_INTERVAL', 30))
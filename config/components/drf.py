@@ -1,23 +1,27 @@
+import os
+
+# The browsable API is a debugging aid; production clients only get JSON
+API_RENDERER_CLASSES = ["alice_skill.renderers.FastJSONRenderer"]
+if os.environ.get("DEBUG", "True") == "True":
+    API_RENDERER_CLASSES.append("rest_framework.renderers.BrowsableAPIRenderer")
+
 REST_FRAMEWORK = {
-    "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
-    ],
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES,
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "alice_skill.parsers.FastJSONParser",
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
+        "alice_skill.authentication.APITokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "alice_skill.throttling.SharedAnonRateThrottle",
+        "alice_skill.throttling.SharedUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",
@@ -55,7 +59,7 @@ REST_FRAMEWORK = {
         "%H:%M",
     ],
     "UNICODE_JSON": True,
-    "COMPACT_JSON": False,
+    "COMPACT_JSON": True,
     "STRICT_JSON": True,
     "COERCE_DECIMAL_TO_STRING": True,
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
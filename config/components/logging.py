@@ -1,6 +1,22 @@
+import os
+
+# Application loggers default to INFO outside DEBUG, which also skips the
+# payload dumps logged at DEBUG level
+APP_LOG_LEVEL = os.environ.get(
+    "APP_LOG_LEVEL", "DEBUG" if os.environ.get("DEBUG", "True") == "True" else "INFO"
+)
+# Share of full request/response dumps that are logged (0 to 1)
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "payload_sample": {
+            "()": "alice_skill.log_queue.PayloadSampleFilter",
+            "rate": LOG_PAYLOAD_SAMPLE_RATE,
+        },
+    },
     "handlers": {
         "file": {
             "level": "DEBUG",
@@ -15,6 +31,22 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
+        # Loggers write through queues; a listener thread per queue formats
+        # the records and does the file and console I/O
+        "queue_file_console": {
+            "class": "alice_skill.log_queue.DeferredQueueHandler",
+            "handlers": ["file", "console"],
+            "listener": "alice_skill.log_queue.BackgroundQueueListener",
+            "respect_handler_level": True,
+            "filters": ["payload_sample"],
+        },
+        "queue_console": {
+            "class": "alice_skill.log_queue.DeferredQueueHandler",
+            "handlers": ["console"],
+            "listener": "alice_skill.log_queue.BackgroundQueueListener",
+            "respect_handler_level": True,
+            "filters": ["payload_sample"],
+        },
     },
     "formatters": {
         "verbose": {
@@ -24,19 +56,19 @@ LOGGING = {
     },
     "loggers": {
         "django": {
-            "handlers": ["file", "console"],
+            "handlers": ["queue_file_console"],
             "level": "INFO",
             "propagate": True,
         },
         "alice_skill": {
-            "handlers": ["console"],
-            "level": "DEBUG",
+            "handlers": ["queue_console"],
+            "level": APP_LOG_LEVEL,
             "propagate": False,
         },
         "pyanywhere_bg": {
-            "handlers": ["console"],
-            "level": "DEBUG",
+            "handlers": ["queue_console"],
+            "level": APP_LOG_LEVEL,
             "propagate": False,
         },
     },
-}
\ No newline at end of file
+}
@@ -1 +1,32 @@
-MIDDLEWARE += []  # noqa
+import os
+
+# Browser-facing layers, run by PathDispatchMiddleware for everything except
+# machine endpoints: the webhooks, health probes and bot token API calls.
+BROWSER_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+MACHINE_ENDPOINT_PATHS = [
+    '/alice_webhook/',
+    '/health/',
+    '/webhook',  # pyanywhere_bg's default WEBHOOK_PATH
+]
+MACHINE_API_PATHS = ['/api/']
+MACHINE_AUTH_SCHEMES = ['Token', 'Bearer']
+
+MIDDLEWARE = [m for m in MIDDLEWARE if m not in BROWSER_MIDDLEWARE]  # noqa
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.common.CommonMiddleware') + 1,
+    'alice_skill.middleware.PathDispatchMiddleware',
+)
+# The admin checks look for these in MIDDLEWARE; the dispatcher runs them for it
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+# INCLUDE on bp_user_time_cover_idx only matters on PostgreSQL; other backends
+# build the index without it
+SILENCED_SYSTEM_CHECKS += ['models.W040']
+
+# Optional gzip for API responses (clients opt in with Accept-Encoding: gzip)
+if os.environ.get('API_GZIP', 'False') == 'True':
+    MIDDLEWARE.insert(0, 'django.middleware.gzip.GZipMiddleware')  # noqa
@@ -114,7 +114,8 @@ def webhook_handler(request):
         webapp_host = getattr(settings, "WEBAPP_HOST", "localhost")
         webapp_port = getattr(settings, "WEBAPP_PORT", 8080)
         local_url = f"http://{webapp_host}:{webapp_port}{webhook_path}"
-        logger.debug(f"Incoming headers: {request.headers}")
+        # Sampled by the logging config's payload filter, like other full dumps
+        logger.debug("Incoming headers: %s", request.headers, extra={"payload": True})
         query = request.META.get("QUERY_STRING", "")
         if query:
             local_url = f"{local_url}?{query}"
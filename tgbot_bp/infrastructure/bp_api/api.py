@@ -64,6 +64,65 @@ class BloodPressureApi(BaseClient):
             self.log.error("Failed to fetch measurements: %s", e)
             return [], None, None
 
+    async def batch(self, operations: list[dict]) -> Optional[list[dict]]:
+        """
+        Run several API requests in one round trip.
+
+        Operations may reference earlier results as `${<id>.<field>}`.
+        Returns one `{"id", "status", "body"}` result per operation.
+        """
+        try:
+            status_code, data = await self._make_request(
+                method="POST",
+                url="/api/v1/batch/",
+                json={"operations": operations},
+                headers=self._auth_headers(),
+            )
+            if status_code == 200:
+                return data["results"]
+            self.log.error(
+                "Batch request failed. Status: %s, Response: %r", status_code, data
+            )
+            return None
+        except ClientError as e:
+            self.log.error("Batch request failed: %s", e)
+            return None
+
+    async def get_user_with_stats(
+        self, telegram_user_id: str, start_date: str, end_date: str
+    ) -> tuple[Optional[dict], Optional[dict]]:
+        """
+        Resolve a user by telegram ID and fetch their measurement statistics
+        within a date range in a single batch request.
+
+        Statistics have `count` and, per metric, `avg`, `stddev`, `min` and
+        `max` (None when there are no readings of it).
+        """
+        results = await self.batch(
+            [
+                {
+                    "id": "user",
+                    "method": "GET",
+                    "path": f"/api/v1/users/by-telegram/{telegram_user_id}/",
+                },
+                {
+                    "id": "stats",
+                    "method": "GET",
+                    "path": "/api/v1/measurements/stats/",
+                    "params": {
+                        "user_id": "${user.alice_user_id}",
+                        "created_at__gte": start_date,
+                        "created_at__lte": end_date,
+                    },
+                },
+            ]
+        )
+        if not results:
+            return None, None
+        user, stats = results
+        user_data = user["body"] if user["status"] == 200 else None
+        return user_data, stats["body"] if stats["status"] == 200 else None
+
     async def get_last_measurement(self, user_id: str) -> Optional[dict]:
         """Fetch latest measurement for a user."""
         try:
@@ -79,6 +138,47 @@ class BloodPressureApi(BaseClient):
             self.log.error("Failed to fetch last measurement: %s", e)
             return None
 
+    async def get_measurements_chart(
+        self,
+        user_id: str,
+        start_date: str,
+        end_date: str,
+        etag: str | None = None,
+    ) -> Optional[tuple[bytes | None, str | None]]:
+        """
+        Fetch a PNG trend chart for a user within a date range.
+
+        Returns the image and its ETag, `(None, etag)` when the chart for `etag`
+        is still current, or None on failure.
+        """
+        headers = {**self._auth_headers(), "Accept": "image/png"}
+        if etag:
+            headers["If-None-Match"] = etag
+        try:
+            status_code, body, response_headers = await self._make_raw_request(
+                method="GET",
+                url="/api/v1/measurements/chart/",
+                params={
+                    "user_id": user_id,
+                    "created_at__gte": start_date,
+                    "created_at__lte": end_date,
+                },
+                headers=headers,
+            )
+        except ClientError as e:
+            self.log.error("Failed to fetch measurements chart: %s", e)
+            return None
+        if status_code == 304:
+            return None, etag
+        if status_code == 200:
+            return body, response_headers.get("ETag")
+        self.log.error(
+            "Failed to fetch measurements chart. Status: %s, Response: %r",
+            status_code,
+            body[:200],
+        )
+        return None
+
     async def get_user_by_telegram_id(self, telegram_user_id: int) -> Optional[dict]:
         """Fetch user data by their telegram ID."""
         try:
@@ -102,6 +202,38 @@ class BloodPressureApi(BaseClient):
             )
             return None
 
+    async def bulk_lookup_users(
+        self, telegram_user_ids: list[str], include_latest: bool = False
+    ) -> Optional[dict]:
+        """
+        Resolve many users by telegram ID in one request.
+
+        Returns `{"results": [...], "not_found": [...]}`; with `include_latest`
+        every result carries its `latest_measurement`.
+        """
+        try:
+            status_code, data = await self._make_request(
+                method="POST",
+                url="/api/v1/users/bulk-lookup/",
+                json={
+                    "telegram_user_ids": [str(i) for i in telegram_user_ids],
+                    "include_latest": include_latest,
+                },
+                headers=self._auth_headers(),
+            )
+            if status_code == 200:
+                return data
+            self.log.error(
+                "Failed to look up %d users. Status: %s, Response: %r",
+                len(telegram_user_ids),
+                status_code,
+                data,
+            )
+            return None
+        except ClientError as e:
+            self.log.error("Failed to look up users: %s", e)
+            return None
+
     async def initiate_link(self, telegram_user_id: str) -> Optional[dict]:
         """Initiate the linking process by requesting a code."""
         try:
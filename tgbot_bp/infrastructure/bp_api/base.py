@@ -9,6 +9,9 @@ import backoff
 from aiohttp import ClientError, ClientSession, TCPConnector, FormData
 from ujson import dumps, loads
 
+# `extra` marking full request/response dumps, sampled by the bot's logging setup
+PAYLOAD = {"payload": True}
+
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
@@ -61,6 +64,7 @@ class BaseClient:
             url,
             json,
             params,
+            extra=PAYLOAD,
         )
         try:
             async with session.request(
@@ -80,7 +84,8 @@ class BaseClient:
                     result = await response.json(loads=loads)
                 except Exception as e:
                     self.log.exception(e)
-                    self.log.info(f"{await response.text()}")
+                    if self.log.isEnabledFor(logging.INFO):
+                        self.log.info("%s", await response.text())
                     result = {}
         except Exception as e:
             self.log.exception("Request %r %r failed: %r", method, url, e)
@@ -92,9 +97,53 @@ class BaseClient:
             url,
             status,
             result,
+            extra=PAYLOAD,
         )
         return status, result
 
+    @backoff.on_exception(
+        backoff.expo,
+        ClientError,
+        max_time=30,
+    )
+    async def _make_raw_request(
+        self,
+        method: str,
+        url: str | URL,
+        params: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> tuple[int, bytes, Mapping[str, str]]:
+        """Make request and return the undecoded body with response headers."""
+        session = await self._get_session()
+
+        self.log.debug("Making raw request %r %r with params %r", method, url, params)
+        try:
+            async with session.request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                proxy=self._proxy,
+            ) as response:
+                status = response.status
+                if status >= 500:
+                    s = await response.text()
+                    raise ClientError(f"Got status {status} for {method} {url}: {s}")
+                body = await response.read()
+                response_headers = dict(response.headers)
+        except Exception as e:
+            self.log.exception("Request %r %r failed: %r", method, url, e)
+            raise
+
+        self.log.debug(
+            "Got raw response %r %r with status %r and %d bytes",
+            method,
+            url,
+            status,
+            len(body),
+        )
+        return status, body, response_headers
+
     async def close(self) -> None:
         """Graceful session close."""
         if not self._session:
@@ -144,3 +144,93 @@ async def test_get_last_measurement():
             headers=api_client._auth_headers(),
         )
         assert last_measurement == mock_response_data["results"][0]
+
+
+@pytest.mark.asyncio
+async def test_get_measurements_chart_revalidates_with_etag():
+    api_client = BloodPressureApi(base_url="http://fake-api.com", api_token="t")
+
+    with patch(
+        "infrastructure.bp_api.base.BaseClient._make_raw_request",
+        new_callable=AsyncMock,
+    ) as mock_make_raw_request:
+        mock_make_raw_request.return_value = (200, b"\x89PNG", {"ETag": '"abc"'})
+        image, etag = await api_client.get_measurements_chart(
+            user_id="u", start_date="2023-01-01", end_date="2023-01-31"
+        )
+        assert image == b"\x89PNG"
+        assert etag == '"abc"'
+        headers = mock_make_raw_request.call_args.kwargs["headers"]
+        assert headers["Accept"] == "image/png"
+        assert "If-None-Match" not in headers
+
+        mock_make_raw_request.return_value = (304, b"", {})
+        result = await api_client.get_measurements_chart(
+            user_id="u", start_date="2023-01-01", end_date="2023-01-31", etag='"abc"'
+        )
+        assert result == (None, '"abc"')
+        headers = mock_make_raw_request.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+
+        mock_make_raw_request.return_value = (400, b"{}", {})
+        assert (
+            await api_client.get_measurements_chart(
+                user_id="u", start_date="2023-01-01", end_date="2023-01-31"
+            )
+            is None
+        )
+
+
+@pytest.mark.asyncio
+async def test_bulk_lookup_users():
+    api_client = BloodPressureApi(base_url="http://fake-api.com")
+    response_data = {"results": [{"telegram_user_id": "1"}], "not_found": ["2"]}
+
+    with patch(
+        "infrastructure.bp_api.base.BaseClient._make_request", new_callable=AsyncMock
+    ) as mock_make_request:
+        mock_make_request.return_value = (200, response_data)
+        result = await api_client.bulk_lookup_users([1, "2"], include_latest=True)
+
+        mock_make_request.assert_called_once_with(
+            method="POST",
+            url="/api/v1/users/bulk-lookup/",
+            json={"telegram_user_ids": ["1", "2"], "include_latest": True},
+            headers=api_client._auth_headers(),
+        )
+        assert result == response_data
+
+        mock_make_request.return_value = (400, {"telegram_user_ids": ["error"]})
+        assert await api_client.bulk_lookup_users([]) is None
+
+
+@pytest.mark.asyncio
+async def test_get_user_with_stats_uses_one_batch():
+    api_client = BloodPressureApi(base_url="http://fake-api.com")
+    stats = {"count": 2, "days": 2, "systolic": {"avg": 125.0}, "pulse": None}
+    batch_results = [
+        {"id": "user", "status": 200, "body": {"alice_user_id": "alice"}},
+        {"id": "stats", "status": 200, "body": stats},
+    ]
+
+    with patch(
+        "infrastructure.bp_api.base.BaseClient._make_request", new_callable=AsyncMock
+    ) as mock_make_request:
+        mock_make_request.return_value = (200, {"results": batch_results})
+        result = await api_client.get_user_with_stats("12345", "2023-01-01", "2023-01-31")
+
+        assert result == ({"alice_user_id": "alice"}, stats)
+        mock_make_request.assert_called_once()
+        operations = mock_make_request.call_args.kwargs["json"]["operations"]
+        assert operations[0]["path"] == "/api/v1/users/by-telegram/12345/"
+        assert operations[1]["path"] == "/api/v1/measurements/stats/"
+        assert operations[1]["params"] == {
+            "user_id": "${user.alice_user_id}",
+            "created_at__gte": "2023-01-01",
+            "created_at__lte": "2023-01-31",
+        }
+
+        batch_results[0] = {"id": "user", "status": 404, "body": {}}
+        batch_results[1] = {"id": "stats", "status": 424, "body": {}}
+        result = await api_client.get_user_with_stats("12345", "2023-01-01", "2023-01-31")
+        assert result == (None, None)
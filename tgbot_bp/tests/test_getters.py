@@ -1,12 +1,25 @@
 import pytest
-from datetime import datetime, timezone
+from collections import OrderedDict
 from unittest.mock import MagicMock, AsyncMock
 
-from tgbot.dialogs.getters import get_measurements_data, PressureMeasurement
+from aiogram.types import BufferedInputFile
+from tgbot.dialogs.getters import get_measurements_chart, get_measurements_data
+from tgbot.services import charts
+from tgbot.services.charts import ChartMessageManager
 from tgbot.dialogs.callbacks import selected_interval
 from aiogram.types import CallbackQuery
 from aiogram_dialog.widgets.kbd import Select
 
+LINKED_USER = {"id": 1, "alice_user_id": "test_alice_id", "telegram_user_id": "12345"}
+STATS = {
+    "count": 2,
+    "days": 2,
+    "systolic": {"avg": 125.0, "stddev": 5.0, "min": 120, "max": 130},
+    "diastolic": {"avg": 82.5, "stddev": 2.5, "min": 80, "max": 85},
+    "pulse": {"avg": 70.0, "stddev": 0.0, "min": 70, "max": 70},
+}
+NO_STATS = {"count": 0, "days": 0, "systolic": None, "diastolic": None, "pulse": None}
+
 
 @pytest.fixture
 def mock_dialog_manager():
@@ -17,180 +30,97 @@ def mock_dialog_manager():
     return dm
 
 
+@pytest.fixture(autouse=True)
+def chart_cache(monkeypatch):
+    monkeypatch.setattr(charts, "_charts", OrderedDict())
+
+
 @pytest.mark.asyncio
 async def test_get_measurements_data_success(bp_api_mock, mock_dialog_manager):
-    bp_api_mock.get_user_by_telegram_id.return_value = {
-        "id": 1,
-        "alice_user_id": "test_alice_id",
-        "telegram_user_id": "12345",
-    }
-
-    # Mock measurements data from API
-    mock_measurements = [
-        {
-            "user_id": "test_alice_id",
-            "systolic": 120,
-            "diastolic": 80,
-            "pulse": 70,
-            "measured_at": "2025-10-20T10:00:00Z",
-        },
-        {
-            "user_id": "test_alice_id",
-            "systolic": 130,
-            "diastolic": 85,
-            "pulse": None,
-            "measured_at": "2025-10-21T11:00:00Z",
-        },
-    ]
-    bp_api_mock.get_measurements.side_effect = [
-        (mock_measurements, len(mock_measurements), None)
-    ]
-
-    # Call the getter function
+    bp_api_mock.get_user_with_stats.return_value = (LINKED_USER, STATS)
+
     result = await get_measurements_data(mock_dialog_manager, bp_api_mock)
 
-    # Assertions
     assert result["has_data"] is True
-    assert result["total_count"] == len(mock_measurements)
+    assert result["total_count"] == 2
     assert result["avg_systolic"] == 125.0
     assert result["avg_diastolic"] == 82.5
     assert result["avg_pulse"] == 70.0
-    assert len(result["measurements"]) == 2
-
-    # Check individual measurement parsing
-    assert isinstance(result["measurements"][0], PressureMeasurement)
-    assert result["measurements"][0].systolic == 120
-    assert result["measurements"][0].formatted_date == datetime(
-        2025, 10, 20, 10, 0, tzinfo=timezone.utc
-    ).strftime("%d.%m.%Y %H:%M")
-    assert result["measurements"][0].pulse_text == ", пульс 70"
-    assert result["measurements"][1].pulse_text == ""
-
-    bp_api_mock.get_user_by_telegram_id.assert_called_once_with("12345")
-    bp_api_mock.get_measurements.assert_called_once_with(
-        user_id="test_alice_id",
+    assert result["alice_user_id"] == "test_alice_id"
+    # Only the statistics are requested, never the readings themselves
+    bp_api_mock.get_user_with_stats.assert_called_once_with(
+        telegram_user_id="12345",
         start_date=result["start_date"],
         end_date=result["end_date"],
-        page=1,
-        page_size=100,
     )
+    bp_api_mock.get_measurements.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_measurements_data_without_pulse(bp_api_mock, mock_dialog_manager):
+    bp_api_mock.get_user_with_stats.return_value = (LINKED_USER, {**STATS, "pulse": None})
+
+    result = await get_measurements_data(mock_dialog_manager, bp_api_mock)
+
+    assert result["has_data"] is True
+    assert result["avg_pulse"] is None
 
 
 @pytest.mark.asyncio
 async def test_get_measurements_data_no_user_linked(bp_api_mock, mock_dialog_manager):
-    bp_api_mock.get_user_by_telegram_id.return_value = None
+    bp_api_mock.get_user_with_stats.return_value = (None, None)
 
     result = await get_measurements_data(mock_dialog_manager, bp_api_mock)
 
     assert result["has_data"] is False
     assert "Ваш аккаунт Telegram не связан" in result["error"]
-    bp_api_mock.get_user_by_telegram_id.assert_called_once_with("12345")
-    bp_api_mock.get_measurements.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_get_measurements_data_no_measurements(bp_api_mock, mock_dialog_manager):
-    bp_api_mock.get_user_by_telegram_id.return_value = {
-        "id": 1,
-        "alice_user_id": "test_alice_id",
-        "telegram_user_id": "12345",
-    }
-    bp_api_mock.get_measurements.side_effect = [([], 0, None)]
+    bp_api_mock.get_user_with_stats.return_value = (LINKED_USER, NO_STATS)
 
     result = await get_measurements_data(mock_dialog_manager, bp_api_mock)
 
     assert result["has_data"] is False
     assert result["total_count"] == 0
-    assert result["measurements"] == []
-    bp_api_mock.get_measurements.assert_called_once()
+    assert "error" not in result
+    assert result["start_date"]
 
 
 @pytest.mark.asyncio
-async def test_get_measurements_data_malformed_measurement(
-    bp_api_mock, mock_dialog_manager
-):
-    bp_api_mock.get_user_by_telegram_id.return_value = {
-        "id": 1,
-        "alice_user_id": "test_alice_id",
-        "telegram_user_id": "12345",
-    }
-    mock_measurements = [
-        {
-            "user_id": "test_alice_id",
-            "systolic": 120,
-            "diastolic": 80,
-            "pulse": 70,
-            "measured_at": "invalid-date",  # Malformed date
-        },
-    ]
-    bp_api_mock.get_measurements.side_effect = [
-        (mock_measurements, len(mock_measurements), None)
-    ]
+async def test_get_measurements_data_stats_unavailable(bp_api_mock, mock_dialog_manager):
+    bp_api_mock.get_user_with_stats.return_value = (LINKED_USER, None)
 
     result = await get_measurements_data(mock_dialog_manager, bp_api_mock)
 
-    assert result["has_data"] is False  # Should not have valid data if parsing fails
-    assert result["total_count"] == 0
-    assert result["measurements"] == []
-    assert "Ошибка при обработке данных" in result["error"]
-    # (This requires configuring logging capture in pytest, which is beyond this scope)
+    assert result["has_data"] is False
+    assert result["error"] == "❌ Ошибка при получении данных о давлении."
 
 
 @pytest.mark.asyncio
 async def test_get_measurements_data_api_error(bp_api_mock, mock_dialog_manager):
-    bp_api_mock.get_user_by_telegram_id.return_value = {
-        "id": 1,
-        "alice_user_id": "test_alice_id",
-        "telegram_user_id": "12345",
-    }
-    bp_api_mock.get_measurements.side_effect = Exception("API is down")
+    bp_api_mock.get_user_with_stats.side_effect = Exception("API is down")
 
     result = await get_measurements_data(mock_dialog_manager, bp_api_mock)
 
     assert result["has_data"] is False
     assert "API is down" in result["error"]
-    bp_api_mock.get_measurements.assert_called_once()
 
 
 @pytest.mark.asyncio
 async def test_get_measurements_data_caching(bp_api_mock, mock_dialog_manager):
-    bp_api_mock.get_user_by_telegram_id.return_value = {
-        "id": 1,
-        "alice_user_id": "test_alice_id",
-        "telegram_user_id": "12345",
-    }
-
-    mock_measurements = [
-        {
-            "user_id": "test_alice_id",
-            "systolic": 120,
-            "diastolic": 80,
-            "pulse": 70,
-            "measured_at": "2025-10-20T10:00:00Z",
-        },
-    ]
-    bp_api_mock.get_measurements.side_effect = [
-        (mock_measurements, len(mock_measurements), None)
-    ]
+    bp_api_mock.get_user_with_stats.return_value = (LINKED_USER, STATS)
 
     # First call - should hit the API
     result1 = await get_measurements_data(mock_dialog_manager, bp_api_mock)
-
-    bp_api_mock.get_user_by_telegram_id.assert_called_once_with("12345")
-    bp_api_mock.get_measurements.assert_called_once()
+    bp_api_mock.get_user_with_stats.assert_called_once()
     assert result1["has_data"] is True
 
-    # Reset mock call count for get_measurements to check if it's called again
-    bp_api_mock.get_measurements.reset_mock()
-    bp_api_mock.get_user_by_telegram_id.reset_mock()
-
     # Second call with the same dialog_manager and interval - should use cache
+    bp_api_mock.get_user_with_stats.reset_mock()
     result2 = await get_measurements_data(mock_dialog_manager, bp_api_mock)
-
-    # Assert that API was NOT called again
-    bp_api_mock.get_user_by_telegram_id.assert_not_called()
-    bp_api_mock.get_measurements.assert_not_called()
-    assert result2["has_data"] is True
+    bp_api_mock.get_user_with_stats.assert_not_called()
     assert result1 == result2  # Ensure cached data is identical
 
     # Test with a different interval - should hit the API again
@@ -198,42 +128,87 @@ async def test_get_measurements_data_caching(bp_api_mock, mock_dialog_manager):
     mock_widget = MagicMock(spec=Select)
     await selected_interval(mock_callback_query, mock_widget, mock_dialog_manager, "1")
 
-    bp_api_mock.get_measurements.side_effect = [
-        (
-            [
-                {
-                    "user_id": "test_alice_id",
-                    "systolic": 140,
-                    "diastolic": 90,
-                    "pulse": 80,
-                    "measured_at": "2025-10-15T10:00:00Z",
-                }
-            ],
-            1,
-            None,
-        )
-    ]
-
+    bp_api_mock.get_user_with_stats.return_value = (
+        LINKED_USER,
+        {**STATS, "count": 1, "systolic": {"avg": 140.0}, "diastolic": {"avg": 90.0}},
+    )
     result3 = await get_measurements_data(mock_dialog_manager, bp_api_mock)
-    bp_api_mock.get_user_by_telegram_id.assert_called_once()
-    bp_api_mock.get_measurements.assert_called_once()
+    bp_api_mock.get_user_with_stats.assert_called_once()
     assert result3["has_data"] is True
     assert result3 != result1
 
     # Test that error is cached
-    mock_callback_query = MagicMock(spec=CallbackQuery)
-    mock_widget = MagicMock(spec=Select)
     await selected_interval(mock_callback_query, mock_widget, mock_dialog_manager, "2")
-
-    bp_api_mock.get_user_by_telegram_id.reset_mock()
-    bp_api_mock.get_measurements.reset_mock()
-    bp_api_mock.get_user_by_telegram_id.return_value = None  # Simulate no user linked
+    bp_api_mock.get_user_with_stats.reset_mock()
+    bp_api_mock.get_user_with_stats.return_value = (None, None)  # Simulate no user linked
 
     error_result1 = await get_measurements_data(mock_dialog_manager, bp_api_mock)
-    bp_api_mock.get_user_by_telegram_id.assert_called_once()
+    bp_api_mock.get_user_with_stats.assert_called_once()
     assert "Ваш аккаунт Telegram не связан" in error_result1["error"]
 
-    bp_api_mock.get_user_by_telegram_id.reset_mock()
+    bp_api_mock.get_user_with_stats.reset_mock()
     error_result2 = await get_measurements_data(mock_dialog_manager, bp_api_mock)
-    bp_api_mock.get_user_by_telegram_id.assert_not_called()
+    bp_api_mock.get_user_with_stats.assert_not_called()
     assert error_result1 == error_result2
+
+
+@pytest.mark.asyncio
+async def test_get_measurements_chart_is_revalidated_by_etag(
+    bp_api_mock, mock_dialog_manager
+):
+    bp_api_mock.get_user_with_stats.return_value = (LINKED_USER, STATS)
+    bp_api_mock.get_measurements_chart.return_value = (b"png-bytes", '"v1"')
+
+    result = await get_measurements_chart(mock_dialog_manager, bp_api_mock)
+
+    chart = result["chart"]
+    assert chart.image == b"png-bytes"
+    data = mock_dialog_manager.dialog_data["measurements_data_12345"]
+    bp_api_mock.get_measurements_chart.assert_called_once_with(
+        user_id="test_alice_id",
+        start_date=data["start_date"],
+        end_date=data["end_date"],
+        etag=None,
+    )
+
+    # A not-modified answer reuses the cached image under the same name,
+    # so the uploaded photo is reused as well
+    bp_api_mock.get_measurements_chart.return_value = (None, '"v1"')
+    result = await get_measurements_chart(mock_dialog_manager, bp_api_mock)
+    assert result["chart"] == chart
+    assert result["chart"].image == b"png-bytes"
+    assert bp_api_mock.get_measurements_chart.call_args.kwargs["etag"] == '"v1"'
+
+    bp_api_mock.get_measurements_chart.return_value = (b"new-png-bytes", '"v2"')
+    result = await get_measurements_chart(mock_dialog_manager, bp_api_mock)
+    assert result["chart"].path != chart.path
+
+
+@pytest.mark.asyncio
+async def test_get_measurements_chart_without_data(bp_api_mock, mock_dialog_manager):
+    bp_api_mock.get_user_with_stats.return_value = (None, None)
+
+    result = await get_measurements_chart(mock_dialog_manager, bp_api_mock)
+
+    assert result == {"chart": None}
+    bp_api_mock.get_measurements_chart.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chart_cache_is_bounded(bp_api_mock, monkeypatch):
+    monkeypatch.setattr(charts, "CHART_CACHE_SIZE", 2)
+    bp_api_mock.get_measurements_chart.return_value = (b"png-bytes", '"v1"')
+    for user_id in ("a", "b", "c"):
+        await charts.get_chart(bp_api_mock, user_id, "2025-10-01", "2025-10-07")
+    assert [key[0] for key in charts._charts] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_chart_is_uploaded_from_memory(bp_api_mock):
+    bp_api_mock.get_measurements_chart.return_value = (b"png-bytes", '"v1"')
+    chart = await charts.get_chart(bp_api_mock, "a", "2025-10-01", "2025-10-07")
+
+    source = await ChartMessageManager().get_media_source(chart, MagicMock())
+
+    assert isinstance(source, BufferedInputFile)
+    assert source.data == b"png-bytes"
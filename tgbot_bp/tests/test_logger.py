@@ -0,0 +1,34 @@
+import logging
+import threading
+
+from tgbot.core.logger import PAYLOAD, DeferredQueueHandler, setup_logging
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.getMessage(), threading.current_thread()))
+
+
+def test_setup_logging_queues_records_and_samples_payloads():
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    target = RecordingHandler()
+    root.handlers = [target]
+    root.setLevel(logging.INFO)
+    try:
+        listener = setup_logging("INFO", payload_sample_rate=0)
+        assert [type(handler) for handler in root.handlers] == [DeferredQueueHandler]
+        logger = logging.getLogger("tests.logger")
+        logger.info("Got response %r", {"id": 1})
+        logger.info("Got response %r", {"id": 2}, extra=PAYLOAD)
+        listener.stop()
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    messages = [message for message, _ in target.records]
+    assert messages[-1] == "Got response {'id': 1}"
+    assert all(thread is not threading.current_thread() for _, thread in target.records)
@@ -22,6 +22,7 @@ class TgBot:
     webapp_host: str | None = None
     webapp_port: int | None = None
     webhook_secret: str | None = None
+    log_payload_sample_rate: float = 1.0
 
     @staticmethod
     def from_env(env: Env):
@@ -43,6 +44,8 @@ class TgBot:
         webapp_host = env.str("WEBAPP_HOST", default=None)
         webapp_port = env.int("WEBAPP_PORT", default=None)
         webhook_secret = env.str("BOT_WEBHOOK_SECRET", default=None)
+        # Share of API request/response dumps that are logged at DEBUG level
+        log_payload_sample_rate = env.float("LOG_PAYLOAD_SAMPLE_RATE", default=0.1)
         return TgBot(
             token=token,
             admin_ids=admin_ids,
@@ -53,6 +56,7 @@ class TgBot:
             webapp_host=webapp_host,
             webapp_port=webapp_port,
             webhook_secret=webhook_secret,
+            log_payload_sample_rate=log_payload_sample_rate,
         )
 
 
@@ -1,9 +1,43 @@
+import atexit
+import copy
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
 import betterlogging as bl
 from betterlogging.colorized import logging as bl_logging
 from betterlogging import logging as std_logging
 
+# `extra` for records that dump a full request or response payload
+PAYLOAD = {'payload': True}
+
+
+class PayloadSampleFilter(std_logging.Filter):
+    """
+    Passes every record but only a `rate` share (0 to 1) of payload dumps.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record) -> bool:
+        if not getattr(record, 'payload', False):
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
 
-def setup_logging(log_level: str):
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queues records without formatting them, so the listener thread renders
+    the message instead of the event loop.
+    """
+
+    def prepare(self, record):
+        return copy.copy(record)
+
+
+def setup_logging(log_level: str, payload_sample_rate: float = 1.0):
     """
     Set up logging configuration for the application.
 
@@ -12,11 +46,15 @@ def setup_logging(log_level: str):
     output. The log format includes the filename, line number, log level,
     timestamp, logger name, and log message.
 
+    The configured handlers run on a listener thread behind a queue, so
+    handlers never block the event loop on console I/O. Only a
+    `payload_sample_rate` share of payload dumps (`extra=PAYLOAD`) is logged.
+
     Returns:
-        None
+        The started `QueueListener`; it is stopped at exit.
 
     Example usage:
-        setup_logging()
+        setup_logging('INFO', payload_sample_rate=0.1)
     """
     if log_level.lower() == 'debug':
         logging = bl_logging
@@ -28,6 +66,17 @@ def setup_logging(log_level: str):
         level=log_level,
         format='%(filename)s:%(lineno)d #%(levelname)-8s [%(asctime)s] - %(name)s - %(message)s',
     )
+
+    root = std_logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(PayloadSampleFilter(payload_sample_rate))
+    root.handlers = [handler]
+    listener.start()
+    atexit.register(listener.stop)
+
     logger = logging.getLogger(__name__)
-    logger.info(f'Logger level: {log_level}')
+    logger.info('Logger level: %s', log_level)
     logger.info('Starting bot')
+    return listener
@@ -43,16 +43,6 @@ async def selected_interval(
     await dialog_manager.switch_to(MainMenu.pressure_results)
 
 
-async def selected_measurement(
-    callback_query: CallbackQuery,
-    widget: Select,
-    dialog_manager: DialogManager,
-    item_id: str,
-):
-    """Get pressure measurement options."""
-    logger.error("Options are not implemented for now")
-
-
 async def action_done(
     callback_query: CallbackQuery,
     widget: Button,
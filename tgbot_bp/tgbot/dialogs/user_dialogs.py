@@ -6,14 +6,18 @@ from aiogram_dialog.widgets.kbd import (
     Select,
     Start,
 )
+from aiogram_dialog.widgets.media import DynamicMedia
 from aiogram_dialog.widgets.text import Const, Format, Multi
 
 from tgbot.dialogs.callbacks import (
     selected_interval,
-    selected_measurement,
     set_prev_message,
 )
-from tgbot.dialogs.getters import get_time_interval, get_measurements_data
+from tgbot.dialogs.getters import (
+    get_time_interval,
+    get_measurements_chart,
+    get_measurements_data,
+)
 from tgbot.dialogs.states import (
     MainMenu,
 )
@@ -68,34 +72,18 @@ user_menu_dialog = Dialog(
         getter=get_time_interval,
     ),
     Window(
+        DynamicMedia("chart", when="chart"),
         Multi(
             Format(UserDialogMessages.PRESSURE_REPORT_TITLE),
             Const(""),
             Format(UserDialogMessages.PRESSURE_STATISTICS),
             Format(UserDialogMessages.PRESSURE_AVERAGE_WITH_PULSE),
             Format(UserDialogMessages.PRESSURE_MEASUREMENTS_COUNT),
-            Const(""),
-            Const(UserDialogMessages.LAST_MEASUREMENTS_TITLE),
             sep="\n",
         ),
-        ScrollingGroup(
-            Select(
-                id="measurement_select",
-                items="measurements",
-                item_id_getter=lambda item: item.created_at,
-                text=Format(
-                    "{item.systolic}/{item.diastolic}{item.pulse_text} - {item.formatted_date}"
-                ),
-                on_click=selected_measurement,
-            ),
-            id="measurement_group",
-            height=5,
-            width=1,
-            hide_on_single_page=True,
-        ),
         Back(Const(NavButtons.BTN_BACK)),
         state=MainMenu.pressure_results,
-        getter=get_measurements_data,
+        getter=[get_measurements_data, get_measurements_chart],
     ),
     on_process_result=close_dialog,
 )
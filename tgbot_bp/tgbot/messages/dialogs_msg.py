@@ -13,6 +13,4 @@ class UserDialogMessages(StrEnum):
     PRESSURE_AVERAGE_WITHOUT_PULSE = "Среднее давление: {avg_systolic}/{avg_diastolic}"
     PRESSURE_MEASUREMENTS_COUNT = "Всего измерений: {total_count}"
     PRESSURE_ERROR = "❌ Ошибка при получении данных о давлении."
-    LAST_MEASUREMENTS_TITLE = "📋 Последние измерения:"
     ACCOUNT_NOT_LINKED_ERROR = "Ваш аккаунт Telegram не связан с аккаунтом Алисы. Пожалуйста, используйте команду /link."
-    MEASUREMENT_PROCESSING_ERROR = "Ошибка при обработке данных измерений."
@@ -0,0 +1,73 @@
+import hashlib
+import logging
+from collections import OrderedDict
+
+from aiogram import Bot
+from aiogram.enums import ContentType
+from aiogram.types import BufferedInputFile, InputFile
+from aiogram_dialog.api.entities import MediaAttachment
+from aiogram_dialog.manager.message_manager import MessageManager
+
+from infrastructure.bp_api.api import BloodPressureApi
+
+logger = logging.getLogger(__name__)
+
+# Charts kept in memory per user and period, least recently used dropped first
+CHART_CACHE_SIZE = 256
+
+_charts: OrderedDict[tuple[str, str, str], tuple[bytes, str | None]] = OrderedDict()
+
+
+class ChartAttachment(MediaAttachment):
+    """
+    A PNG chart sent from memory.
+
+    `path` only names the image by its content, so aiogram-dialog reuses the
+    Telegram file id of an unchanged chart instead of uploading it again.
+    """
+
+    def __init__(self, image: bytes):
+        digest = hashlib.sha256(image).hexdigest()[:32]
+        super().__init__(ContentType.PHOTO, path=f"chart-{digest}.png")
+        self.image = image
+
+
+class ChartMessageManager(MessageManager):
+    """Message manager that uploads `ChartAttachment` images without a file."""
+
+    async def get_media_source(self, media: MediaAttachment, bot: Bot) -> InputFile | str:
+        if isinstance(media, ChartAttachment) and not media.file_id:
+            return BufferedInputFile(media.image, filename=str(media.path))
+        return await super().get_media_source(media, bot)
+
+
+async def get_chart(
+    bp_api: BloodPressureApi, alice_user_id: str, start_date: str, end_date: str
+) -> ChartAttachment | None:
+    """
+    Return the PNG chart for the period, revalidated against the API.
+
+    The ETag of the cached chart is sent as `If-None-Match`, so an unchanged
+    chart costs a 304 response and the cached image is sent again.
+    """
+    key = (alice_user_id, start_date, end_date)
+    cached = _charts.get(key)
+    result = await bp_api.get_measurements_chart(
+        user_id=alice_user_id,
+        start_date=start_date,
+        end_date=end_date,
+        etag=cached[1] if cached else None,
+    )
+    if result is None:
+        return ChartAttachment(cached[0]) if cached else None
+
+    image, etag = result
+    if image is None:
+        logger.debug("Chart for user %s is not modified", alice_user_id)
+        image, etag = cached
+
+    _charts[key] = (image, etag)
+    _charts.move_to_end(key)
+    while len(_charts) > CHART_CACHE_SIZE:
+        _charts.popitem(last=False)
+    return ChartAttachment(image)